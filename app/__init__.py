@@ -1,8 +1,17 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from config import config
-from app.routes.database import create_tables
-from app.routes import router
+from app.startup import startup_timings, mount_groups, start_groups, stop_groups
+from contextlib import asynccontextmanager
+with startup_timings.phase("import fastapi"):
+    from fastapi import FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
+with startup_timings.phase("import config"):
+    from config import config
+with startup_timings.phase("import app.routes"):
+    from app.logs import configure_logging, start_logging, stop_logging
+    from app.middleware import RequestMetricsMiddleware
+    from app.multiprocess import mark_worker_dead
+    from app.routes import router, route_groups
+
+configure_logging()
 
 # Define tags with descriptions for OpenAPI docs
 tags_metadata = [
@@ -29,18 +38,38 @@ tags_metadata = [
     {
         "name": "ToDo", 
         "description": "ToDo app simulator. Create, read, update, and delete tasks.",
+    },
+    {
+        "name": "Stress",
+        "description": "Resource stress. Generate controlled CPU load and memory pressure, and benchmark disks, to test autoscaling, eviction, OOMKill and storage classes.",
     }
 ]
 
-def create_app():
-    app = FastAPI(
-        title=config.app_title,
-        description=config.app_description,
-        version=config.version,
-        docs_url=config.docs_url,
-        redoc_url=config.redoc_url,
-        openapi_tags=tags_metadata
-    )
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background services on startup and stop them on shutdown."""
+    start_logging()
+    await start_groups(app)
+    startup_timings.mark_ready()
+    yield
+    await stop_groups(app)
+    mark_worker_dead()
+    stop_logging()
+
+def create_app():
+    with startup_timings.phase("create_app"):
+        return _create_app()
+
+def _create_app():
+    app = FastAPI(
+        title=config.app_title,
+        description=config.app_description,
+        version=config.version,
+        docs_url=config.docs_url,
+        redoc_url=config.redoc_url,
+        openapi_tags=tags_metadata,
+        lifespan=lifespan
+    )
     
     # Add CORS middleware
     app.add_middleware(
@@ -51,13 +80,12 @@ def create_app():
         allow_headers=["*"],
     )
     
-    # Create database tables
-    try:
-        create_tables()
-    except Exception as e:
-        print(f"Database initialization error: {e}")
+    # Per-route request metrics
+    if config.request_metrics:
+        app.add_middleware(RequestMetricsMiddleware)
     
-    # Include router
+    # Include routers; route groups also create the database tables
     app.include_router(router)
+    mount_groups(app, route_groups, lazy=config.fast_startup, enabled=config.enabled_route_groups)
     
-    return app
+    return app
@@ -0,0 +1,318 @@
+import sys
+import copy
+import json
+import time
+import queue
+import logging
+import datetime
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Optional
+from prometheus_client import Counter, Gauge
+from app.multiprocess import multiprocess_dir
+from config import config
+
+LOG_FORMAT = '%(asctime)s %(levelname)s: %(message)s'
+LOG_DATE_FORMAT = '%Y/%m/%d %H:%M:%S'
+
+# uvicorn loggers write to their own handlers; they go through the pipeline while it runs
+SERVER_LOGGERS = ("uvicorn", "uvicorn.access")
+
+# Maximum records the writer formats into a single write
+WRITE_BATCH_SIZE = 1000
+
+# Registered in the app registry by app.routes.app, which this module cannot import
+log_records_enqueued = Counter(
+    'app_log_records_enqueued', 'Log records queued for the log writer thread', registry=None
+)
+log_records_dropped = Counter(
+    'app_log_records_dropped', 'Log records dropped because the log queue was full', registry=None
+)
+log_records_blocked = Counter(
+    'app_log_records_blocked', 'Log records that had to wait for room in the log queue', registry=None
+)
+log_blocked_seconds = Counter(
+    'app_log_blocked_seconds', 'Time spent waiting for room in the log queue', registry=None
+)
+log_records_written = Counter(
+    'app_log_records_written', 'Log records written by the log writer thread', registry=None
+)
+log_queue_depth = Gauge(
+    'app_log_queue_depth', 'Log records waiting to be written', registry=None, multiprocess_mode='livesum'
+)
+LOG_METRICS = (
+    log_records_enqueued, log_records_dropped, log_records_blocked,
+    log_blocked_seconds, log_records_written, log_queue_depth,
+)
+
+
+def _access_fields(record: logging.LogRecord) -> Optional[Dict[str, Any]]:
+    """Request fields of a uvicorn access log record."""
+    if record.name == "uvicorn.access" and isinstance(record.args, tuple) and len(record.args) == 5:
+        client, method, path, http_version, status_code = record.args
+        return {"client": client, "method": method, "path": path,
+                "http_version": http_version, "status": status_code}
+    return None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc)
+                    .isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        access = getattr(record, "access", None) or _access_fields(record)
+        if access:
+            data.update(access)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exception"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False)
+
+
+def make_formatter(log_format: str) -> logging.Formatter:
+    if log_format == "json":
+        return JsonFormatter()
+    return logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
+
+
+class LogQueueHandler(QueueHandler):
+    """Queue log records for the writer thread without blocking the caller on stdout.
+
+    When the queue is full the record waits up to ``block_timeout`` seconds
+    for room and is dropped after that, so a slow log shipper shows up as
+    dropped and blocked counts instead of stalled requests.
+    """
+
+    def __init__(self, log_queue: queue.Queue, block_timeout: float = 0.0):
+        super().__init__(log_queue)
+        self.block_timeout = block_timeout
+        self._stats_lock = threading.Lock()
+        self.dropped = 0
+        self.blocked = 0
+        self.blocked_seconds = 0.0
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # The queue is thread-safe, so records skip the handler lock
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge the message and traceback into the record so the writer only formats it."""
+        record = copy.copy(record)
+        access = _access_fields(record)
+        if access:
+            record.access = access
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if not self._wait_for_room(record):
+                with self._stats_lock:
+                    self.dropped += 1
+                log_records_dropped.inc()
+                return
+        log_records_enqueued.inc()
+
+    def _wait_for_room(self, record: logging.LogRecord) -> bool:
+        if self.block_timeout <= 0:
+            return False
+        started = time.perf_counter()
+        try:
+            self.queue.put(record, timeout=self.block_timeout)
+            return True
+        except queue.Full:
+            return False
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self.blocked += 1
+                self.blocked_seconds += waited
+            log_records_blocked.inc()
+            log_blocked_seconds.inc(waited)
+
+
+class LogWriter(QueueListener):
+    """Drain the log queue in a background thread, writing queued records in batches.
+
+    Every record already waiting in the queue is formatted and written to the
+    stream with a single write and flush.
+    """
+
+    def __init__(self, log_queue: queue.Queue, handler: logging.StreamHandler):
+        super().__init__(log_queue, handler)
+        self.handler = handler
+        self.written = 0
+
+    def enqueue_sentinel(self) -> None:
+        # Wait for room so stop() never fails on a full queue
+        self.queue.put(self._sentinel)
+
+    def _next_batch(self) -> List[Any]:
+        batch = [self.queue.get()]
+        try:
+            while len(batch) < WRITE_BATCH_SIZE and batch[-1] is not self._sentinel:
+                batch.append(self.queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def write(self, records: List[logging.LogRecord]) -> None:
+        if not records:
+            return
+        handler = self.handler
+        try:
+            lines = [handler.format(record) for record in records]
+            handler.stream.write(handler.terminator.join(lines) + handler.terminator)
+            handler.flush()
+            self.written += len(records)
+            log_records_written.inc(len(records))
+        except Exception:
+            handler.handleError(records[-1])
+
+    def _monitor(self) -> None:
+        while True:
+            batch = self._next_batch()
+            stopping = batch[-1] is self._sentinel
+            self.write(batch[:-1] if stopping else batch)
+            # Multi-worker mode reads the last value set instead of the depth function
+            log_queue_depth.set(self.queue.qsize())
+            if stopping:
+                break
+
+
+class LogPipeline:
+    """The handlers of the root logger.
+
+    Records are written to stdout by the calling thread until ``start()`` puts
+    a queue in between, drained by a ``LogWriter`` thread.
+    """
+
+    def __init__(self):
+        self.log_format = "text"
+        self.stream_handler: Optional[logging.StreamHandler] = None
+        self.queue_handler: Optional[LogQueueHandler] = None
+        self.writer: Optional[LogWriter] = None
+        self.running = False
+        self._server_handlers: Dict[str, Any] = {}
+
+    @property
+    def depth(self) -> int:
+        return self.queue_handler.queue.qsize() if self.running else 0
+
+    def configure(self, log_format: str = "text", level: int = logging.INFO) -> None:
+        """Write records synchronously to stdout in the given format."""
+        self.stop()
+        root = logging.getLogger()
+        if self.stream_handler is not None:
+            root.removeHandler(self.stream_handler)
+        self.log_format = log_format
+        self.stream_handler = logging.StreamHandler(sys.stdout)
+        self.stream_handler.setFormatter(make_formatter(log_format))
+        root.addHandler(self.stream_handler)
+        root.setLevel(level)
+
+    def start(self, queue_size: int = 10000, block_timeout: float = 0.0, queued: bool = True) -> None:
+        """Route server logs through the root logger and, if ``queued``, start the writer thread."""
+        if self.stream_handler is None:
+            self.configure()
+        self._route_server_loggers()
+        if not queued or self.running:
+            return
+        log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.queue_handler = LogQueueHandler(log_queue, block_timeout=block_timeout)
+        self.writer = LogWriter(log_queue, self.stream_handler)
+        self.writer.start()
+        self.running = True
+        root = logging.getLogger()
+        root.addHandler(self.queue_handler)
+        root.removeHandler(self.stream_handler)
+
+    def stop(self) -> None:
+        """Write every queued record and go back to writing records synchronously."""
+        self._restore_server_loggers()
+        if not self.running:
+            return
+        root = logging.getLogger()
+        root.addHandler(self.stream_handler)
+        root.removeHandler(self.queue_handler)
+        self.writer.stop()
+        self.running = False
+
+    def _route_server_loggers(self) -> None:
+        for name in SERVER_LOGGERS:
+            server_logger = logging.getLogger(name)
+            if name in self._server_handlers or not server_logger.handlers:
+                continue
+            self._server_handlers[name] = (server_logger.handlers[:], server_logger.propagate)
+            server_logger.handlers = []
+            server_logger.propagate = True
+
+    def _restore_server_loggers(self) -> None:
+        for name, (handlers, propagate) in self._server_handlers.items():
+            server_logger = logging.getLogger(name)
+            server_logger.handlers = handlers
+            server_logger.propagate = propagate
+        self._server_handlers = {}
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue settings and counters of the current, or last, asynchronous run."""
+        handler = self.queue_handler
+        return {
+            "format": self.log_format,
+            "async": self.running,
+            "queue_size": handler.queue.maxsize if handler is not None else 0,
+            "queue_depth": self.depth,
+            "block_ms": handler.block_timeout * 1000 if handler is not None else 0,
+            "written": self.writer.written if self.writer is not None else 0,
+            "dropped": handler.dropped if handler is not None else 0,
+            "blocked": handler.blocked if handler is not None else 0,
+            "blocked_seconds": round(handler.blocked_seconds, 6) if handler is not None else 0.0,
+        }
+
+
+# Process-wide pipeline behind the root logger
+log_pipeline = LogPipeline()
+
+if multiprocess_dir() is None:
+    log_queue_depth.set_function(lambda: log_pipeline.depth)
+
+
+def configure_logging() -> None:
+    """Set up the root logger in the configured format."""
+    log_pipeline.configure(config.log_format)
+
+
+def start_logging() -> None:
+    """Start the asynchronous pipeline if enabled in the configuration.
+
+    JSON output also routes the uvicorn access and error logs through the
+    root logger so every line has the same structure.
+    """
+    if config.log_async or config.log_format == "json":
+        log_pipeline.start(
+            queue_size=config.log_queue_size,
+            block_timeout=config.log_block_ms / 1000,
+            queued=config.log_async
+        )
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the asynchronous pipeline."""
+    log_pipeline.stop()
@@ -0,0 +1,103 @@
+import os
+import time
+from typing import Dict, Tuple
+from prometheus_client import Counter, Gauge, Histogram
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.routes.app import registry
+
+# Label used for requests that did not match any route (e.g. 404s)
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Methods labelled as themselves; any other token is labelled OTHER_METHOD to bound cardinality
+STANDARD_METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "DELETE", "CONNECT", "OPTIONS", "TRACE", "PATCH"))
+OTHER_METHOD = "OTHER"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (100, 1000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000, 1_000_000_000)
+
+http_requests = Counter(
+    'app_http_requests', 'HTTP requests served by App22',
+    ['method', 'route', 'status'], registry=registry
+)
+http_requests_in_progress = Gauge(
+    'app_http_requests_in_progress', 'HTTP requests currently being served',
+    ['method'], registry=registry, multiprocess_mode='livesum'
+)
+http_request_duration = Histogram(
+    'app_http_request_duration_seconds', 'Time from receiving a request to sending the last response byte',
+    ['method', 'route'], buckets=LATENCY_BUCKETS, registry=registry
+)
+http_response_size = Histogram(
+    'app_http_response_size_bytes', 'HTTP response body size',
+    ['method', 'route'], buckets=SIZE_BUCKETS, registry=registry
+)
+
+
+def _route_template(scope: Scope) -> str:
+    """Return the path template of the matched route, bounding label cardinality."""
+    route = scope.get("route")
+    if route is not None:
+        return route.path_format
+    # Plain Starlette routes (docs, redirects) have static paths
+    if "endpoint" in scope:
+        return scope["path"]
+    return UNMATCHED_ROUTE
+
+
+def _zerocopy_size(message: Message) -> int:
+    """Bytes a http.response.zerocopysend message hands to the server."""
+    if message.get("count") is not None:
+        return message["count"]
+    # Without a count the server sends from the offset to the end of the file
+    file = message["file"]
+    offset = message.get("offset")
+    if offset is None:
+        offset = file.tell()
+    return max(0, os.fstat(file.fileno()).st_size - offset)
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware recording request count, latency, response size and
+    in-flight requests per route template in the application registry.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        # Labelled children resolved once per (method, route)
+        self._histograms: Dict[Tuple[str, str], Tuple[Histogram, Histogram]] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"] if scope["method"] in STANDARD_METHODS else OTHER_METHOD
+        status_code = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            elif message["type"] == "http.response.zerocopysend":
+                size += _zerocopy_size(message)
+            await send(message)
+
+        in_progress = http_requests_in_progress.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_progress.dec()
+            route = _route_template(scope)
+            histograms = self._histograms.get((method, route))
+            if histograms is None:
+                histograms = (http_request_duration.labels(method, route), http_response_size.labels(method, route))
+                self._histograms[(method, route)] = histograms
+            histograms[0].observe(elapsed)
+            histograms[1].observe(size)
+            http_requests.labels(method, route, str(status_code)).inc()
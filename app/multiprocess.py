@@ -0,0 +1,101 @@
+import os
+import glob
+import mmap
+import fcntl
+import struct
+import threading
+import contextlib
+from typing import Any, Iterator, Optional, Tuple
+
+# Set by run.py before any worker imports prometheus_client
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+
+def multiprocess_dir() -> Optional[str]:
+    """Directory shared by the workers, or None when running a single process."""
+    return os.environ.get(MULTIPROC_DIR_ENV) or None
+
+
+def cleanup_dead_workers() -> None:
+    """Remove the live gauge files of worker processes that no longer exist."""
+    path = multiprocess_dir()
+    if path is None:
+        return
+    import psutil
+    from prometheus_client import multiprocess
+    pids = set()
+    for filename in glob.glob(os.path.join(path, "gauge_live*_*.db")):
+        pid = os.path.basename(filename).rsplit("_", 1)[1][:-len(".db")]
+        if pid.isdigit():
+            pids.add(int(pid))
+    for pid in pids:
+        if not psutil.pid_exists(pid):
+            multiprocess.mark_process_dead(pid, path)
+
+
+def mark_worker_dead() -> None:
+    """Remove this worker's live gauge files on shutdown."""
+    if multiprocess_dir() is not None:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(os.getpid(), multiprocess_dir())
+
+
+class SharedState:
+    """A small fixed-size byte buffer shared by all workers.
+
+    In multi-worker mode the buffer is an mmap of a file in the multiprocess
+    directory, so a write in one worker is seen by every other worker;
+    otherwise it lives in process memory. Read-modify-write sequences must
+    hold lock(), which uses flock across processes.
+    """
+
+    def __init__(self, name: str, initial: bytes):
+        self.size = len(initial)
+        self._thread_lock = threading.Lock()
+        self._fd: Optional[int] = None
+        path = multiprocess_dir()
+        if path is None:
+            self.buffer = bytearray(initial)
+            return
+        filename = os.path.join(path, f"app22_{name}.state")
+        if not os.path.exists(filename):
+            # Publish the initialised file atomically so no worker maps a partial one
+            tmp = f"{filename}.{os.getpid()}"
+            with open(tmp, "wb") as f:
+                f.write(initial)
+            try:
+                os.link(tmp, filename)
+            except FileExistsError:
+                pass
+            finally:
+                os.unlink(tmp)
+        self._fd = os.open(filename, os.O_RDWR)
+        self.buffer = mmap.mmap(self._fd, self.size)
+
+    @property
+    def shared(self) -> bool:
+        return self._fd is not None
+
+    @contextlib.contextmanager
+    def lock(self) -> Iterator[None]:
+        with self._thread_lock:
+            if self._fd is None:
+                yield
+                return
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def get_bool(self, offset: int) -> bool:
+        return self.buffer[offset] != 0
+
+    def set_bool(self, offset: int, value: bool) -> None:
+        self.buffer[offset] = 1 if value else 0
+
+    def unpack(self, fmt: str, offset: int) -> Tuple[Any, ...]:
+        return struct.unpack_from(fmt, self.buffer, offset)
+
+    def pack(self, fmt: str, offset: int, *values: Any) -> None:
+        struct.pack_into(fmt, self.buffer, offset, *values)
@@ -1,28 +1,62 @@
 # Routes package
-from .app import router as app_router
-from .system import router as system_router
-from .http import router as http_router
-from .filesystem import router as filesystem_router
-from .database import router as database_router
-from .todo import router as todo_router
-from .mongodb import router as mongodb_router
+from fastapi import APIRouter
+from fastapi.responses import RedirectResponse
+from app.startup import RouteGroup
+from config import config
 
-from fastapi import APIRouter
-from fastapi.responses import RedirectResponse
-from config import config
-
-# Main router that includes all sub-routers
+# Main router with the routes that do not belong to a group
 router = APIRouter()
 
-@router.get("/", include_in_schema=False)
-def index():
-    return RedirectResponse(url=config.docs_url)
+@router.get("/", include_in_schema=False)
+def index():
+    return RedirectResponse(url=config.docs_url)
 
-# Include all route modules
-router.include_router(system_router)
-router.include_router(app_router)
-router.include_router(http_router)
-router.include_router(filesystem_router)
-router.include_router(database_router)
-router.include_router(todo_router) 
-router.include_router(mongodb_router)
+# Route modules, referenced by name so they are only imported when mounted.
+# Lazy groups pull in psutil or database drivers; with fast_startup they are
+# imported by the first request under one of their prefixes.
+_database_router = "async_router" if config.db_async else "router"
+route_groups = [
+    RouteGroup(
+        "system", ["app.routes.system:router"], prefixes=["/sys", "/env", "/crash"],
+        on_startup=["app.routes.system:start_sampler"],
+        on_shutdown=["app.routes.system:stop_sampler"],
+        lazy=True,
+    ),
+    RouteGroup("app", ["app.routes.app:router"]),
+    RouteGroup(
+        "synthetic", ["app.routes.synthetic:router"],
+        on_startup=["app.routes.synthetic:start_synthetic"],
+        on_shutdown=["app.routes.synthetic:stop_synthetic"],
+    ),
+    RouteGroup("http", ["app.routes.http:router"]),
+    RouteGroup(
+        "filesystem", ["app.routes.filesystem:router"],
+        on_startup=["app.routes.filesystem:start_data_index"],
+        on_shutdown=["app.routes.filesystem:stop_data_index"],
+    ),
+    RouteGroup(
+        "database", [f"app.routes.database:{_database_router}"], prefixes=["/sql"],
+        on_load=["app.routes.database:create_tables"],
+        on_startup=["app.routes.database:start_request_buffer"],
+        on_shutdown=["app.routes.database:stop_request_buffer", "app.routes.database:dispose_async_engine"],
+        lazy=True,
+    ),
+    RouteGroup(
+        "todo", [f"app.routes.todo:{_database_router}"], prefixes=["/tasks"],
+        on_load=["app.routes.database:create_tables"],
+        on_shutdown=["app.routes.database:dispose_async_engine"],
+        lazy=True,
+    ),
+    RouteGroup(
+        "mongodb", ["app.routes.mongodb:router"], prefixes=["/mongodb"],
+        on_shutdown=["app.routes.mongodb:close_mongo_client"],
+        lazy=True,
+    ),
+    RouteGroup(
+        "stress", ["app.routes.stress:router"], prefixes=["/stress"],
+        # /stress/memory/status reads the system sampler
+        on_startup=["app.routes.system:start_sampler"],
+        on_shutdown=["app.routes.stress:stop_stress", "app.routes.system:stop_sampler"],
+        lazy=True,
+    ),
+]
@@ -1,19 +1,23 @@
-import sys
+import gzip
+import json
+import time
+import struct
 import logging
-from typing import Optional, Dict, Any
-from pydantic import BaseModel
-from fastapi import APIRouter, HTTPException, Query, status
+import threading
+from enum import Enum
+from typing import Optional, Dict, Any, Iterable, List, Literal, Tuple, Union
+from pydantic import BaseModel, Field
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse, PlainTextResponse
 from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.exposition import choose_encoder
+from prometheus_client.multiprocess import MultiProcessCollector
+from app.multiprocess import SharedState, cleanup_dead_workers, multiprocess_dir
+from app.startup import startup_timings
+from app.logs import LOG_METRICS, log_pipeline
 from config import config
 
-# Configure logging
-logging.basicConfig(
-    format='%(asctime)s %(levelname)s: %(message)s',
-    stream=sys.stdout, 
-    level=logging.INFO, 
-    datefmt='%Y/%m/%d %H:%M:%S'
-)
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
@@ -34,14 +38,273 @@ class LogResponse(BaseModel):
     message: str
     logged_message: Optional[str] = None
 
-# Global health status
-healthy = True
+class LogBulkResponse(BaseModel):
+    """Model for bulk log response."""
+    emitted: int
+    size: int
+    level: str
+    elapsed_seconds: float
+    messages_per_second: float
+    mb_per_second: float
+    dropped: int
+    blocked: int
+
+class LogLevel(str, Enum):
+    debug = "debug"
+    info = "info"
+    warning = "warning"
+    error = "error"
+
+class MetricFamilyCreate(BaseModel):
+    """Model for registering a metric family at runtime."""
+    name: str = Field(..., max_length=128, pattern=r'^[a-zA-Z_:][a-zA-Z0-9_:]*$')
+    type: Literal['counter', 'gauge', 'histogram']
+    documentation: str = Field('Runtime metric', max_length=256)
+    buckets: Optional[List[float]] = Field(None, min_length=1, max_length=64)
+
+class Probe(str, Enum):
+    """Kubernetes probes simulated by App22."""
+    liveness = "liveness"
+    readiness = "readiness"
+    startup = "startup"
+
+# Each probe has a slot in the shared health state: an on/off flag and a
+# scheduled failure window (start and end as Unix timestamps)
+PROBE_SLOT_FORMAT = '<B7xdd'
+PROBE_SLOT_SIZE = struct.calcsize(PROBE_SLOT_FORMAT)
+_probe_offsets = {probe: index * PROBE_SLOT_SIZE for index, probe in enumerate(Probe)}
+
+# Global health status, shared by all workers
+health_state = SharedState(
+    "health",
+    initial=b''.join(struct.pack(PROBE_SLOT_FORMAT, 1, 0.0, 0.0) for _ in Probe)
+)
+
+def probe_state(probe: Probe) -> Tuple[bool, float, float]:
+    """Return the flag and scheduled failure window of a probe (lock-free read)."""
+    flag, fail_from, fail_until = health_state.unpack(PROBE_SLOT_FORMAT, _probe_offsets[probe])
+    return bool(flag), fail_from, fail_until
+
+def probe_healthy(probe: Probe) -> bool:
+    """A probe passes when its flag is on and no scheduled failure is in progress."""
+    flag, fail_from, fail_until = probe_state(probe)
+    return flag and not (fail_from <= time.time() < fail_until)
+
+def is_healthy() -> bool:
+    return probe_healthy(Probe.liveness)
 
 # Metrics registry and metrics under App tag
 registry = CollectorRegistry()
+# Across workers a gauge exports the value last set by any live worker; such
+# gauges cannot be incremented, so inc and dec are refused in that mode
+GAUGE_MODE = 'livemostrecent' if multiprocess_dir() is not None else 'livesum'
 app_counter = Counter('app_counter', 'A test counter', ['name'], registry=registry)
-app_gauge = Gauge('app_gauge', 'A test gauge', ['name'], registry=registry)
+app_gauge = Gauge('app_gauge', 'A test gauge', ['name'], registry=registry, multiprocess_mode=GAUGE_MODE)
 app_histogram = Histogram('app_histogram', 'A test histogram', ['name'], registry=registry)
+app_metrics_series_overflow = Counter(
+    'app_metrics_series_overflow', 'Observations folded into the overflow series because a metric reached APP22_METRICS_MAX_SERIES',
+    ['metric'], registry=registry
+)
+# The logging pipeline is set up before this module is imported
+for _log_metric in LOG_METRICS:
+    registry.register(_log_metric)
+
+# In multi-worker mode metrics are aggregated from the workers' files at scrape
+# time; process-local collectors are added to the exposition registry as well
+if multiprocess_dir() is not None:
+    exposition_registry = CollectorRegistry()
+    MultiProcessCollector(exposition_registry)
+else:
+    exposition_registry = registry
+
+def register_collector(collector) -> None:
+    """Register a custom collector so that it is exposed in every server mode."""
+    registry.register(collector)
+    if exposition_registry is not registry:
+        exposition_registry.register(collector)
+
+def reject_in_multi_worker_mode(what: str) -> None:
+    """Refuse to change state that only the worker serving the request would see.
+
+    Raises:
+        HTTPException: If several workers are running.
+    """
+    if multiprocess_dir() is not None:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"{what} is kept per worker and cannot be changed at runtime when APP22_WORKERS is above 1"
+        )
+
+def _check_gauge_change(inc: Optional[float], dec: Optional[float]) -> None:
+    if GAUGE_MODE == 'livemostrecent' and (inc is not None or dec is not None):
+        raise ValueError("gauges only support set_value when APP22_WORKERS is above 1")
+
+# Label value receiving observations for new names once a metric is at its series cap
+OVERFLOW_LABEL = "__overflow__"
+
+_series_names: Dict[str, set] = {}
+_series_lock = threading.Lock()
+
+def _bounded_label(metric: str, name: str) -> str:
+    """Return the label value to use for name, folding new names into the
+    overflow series once the metric has APP22_METRICS_MAX_SERIES series."""
+    limit = config.metrics_max_series
+    if not limit:
+        return name
+    with _series_lock:
+        names = _series_names.setdefault(metric, set())
+        if name in names:
+            return name
+        if len(names) < limit:
+            names.add(name)
+            return name
+    app_metrics_series_overflow.labels(metric=metric).inc()
+    return OVERFLOW_LABEL
+
+class MetricsCache:
+    """Rendered /metrics expositions kept for a short TTL.
+
+    Entries are keyed by content type and encoding. Rendering happens under a
+    lock, so concurrent scrapes of an expired entry render it only once.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, bool], Tuple[float, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, bool], render) -> bytes:
+        if self.ttl <= 0:
+            return render()
+        with self._lock:
+            entry = self._entries.get(key)
+            now = time.monotonic()
+            if entry is None or now - entry[0] >= self.ttl:
+                entry = (now, render())
+                self._entries[key] = entry
+            return entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+metrics_cache = MetricsCache(config.metrics_cache_ttl)
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip, honouring q-values and ``*``."""
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+    if 'gzip' in weights:
+        return weights['gzip'] > 0
+    return weights.get('*', 0.0) > 0
+
+# Metric families accepted by /metrics/batch, by name; runtime families are added by /metrics/families
+MAX_RUNTIME_FAMILIES = 100
+_families: Dict[str, Tuple[str, Any]] = {
+    'app_counter': ('counter', app_counter),
+    'app_gauge': ('gauge', app_gauge),
+    'app_histogram': ('histogram', app_histogram),
+}
+_families_lock = threading.Lock()
+
+# Number of failed operations echoed back by /metrics/batch
+MAX_BATCH_ERRORS = 10
+
+# Longest line accepted in an NDJSON /metrics/batch body
+MAX_NDJSON_LINE_BYTES = 64 * 1024
+
+# Characters a bulk /log run may write in total (count * size)
+MAX_LOG_BULK_BYTES = 1024 * 1024 * 1024
+
+def _apply_operation(operation: Dict[str, Any], children: Dict[Tuple[str, str], Any]) -> None:
+    """Apply one /metrics/batch operation.
+
+    Args:
+        operation: Mapping with "name", and "family" and/or "type", plus the
+            value fields of the matching single-metric endpoint ("inc";
+            "set_value", "inc", "dec"; "observe")
+        children: Labelled metrics resolved earlier in the batch
+
+    Raises:
+        ValueError: If the operation is malformed.
+    """
+    if not isinstance(operation, dict):
+        raise ValueError("operation must be an object")
+    family_name = operation.get('family') or f"app_{operation.get('type')}"
+    family = _families.get(family_name)
+    if family is None:
+        raise ValueError(f"unknown metric family: {family_name}")
+    metric_type, metric = family
+    if operation.get('type', metric_type) != metric_type:
+        raise ValueError(f"{family_name} is a {metric_type}")
+    name = operation.get('name')
+    if not isinstance(name, str) or not 0 < len(name) <= 64:
+        raise ValueError("name must be a string of 1 to 64 characters")
+
+    child = children.get((family_name, name))
+    if child is None:
+        child = metric.labels(name=_bounded_label(family_name, name))
+        children[(family_name, name)] = child
+
+    if metric_type == 'counter':
+        child.inc(float(operation.get('inc', 1.0)))
+    elif metric_type == 'gauge':
+        _check_gauge_change(operation.get('inc'), operation.get('dec'))
+        if operation.get('set_value') is not None:
+            child.set(float(operation['set_value']))
+        if operation.get('inc') is not None:
+            child.inc(float(operation['inc']))
+        if operation.get('dec') is not None:
+            child.dec(float(operation['dec']))
+    else:
+        if operation.get('observe') is None:
+            raise ValueError("histogram operations require observe")
+        child.observe(float(operation['observe']))
+
+def _apply_operations(operations: Iterable[Any], result: Dict[str, Any]) -> None:
+    """Apply operations in one pass, counting successes and recording the first errors."""
+    children: Dict[Tuple[str, str], Any] = {}
+    for operation in operations:
+        index = result['applied'] + result['failed']
+        try:
+            _apply_operation(operation, children)
+            result['applied'] += 1
+        except (ValueError, TypeError) as e:
+            result['failed'] += 1
+            if len(result['errors']) < MAX_BATCH_ERRORS:
+                result['errors'].append({'index': index, 'error': str(e)})
+
+def _check_ndjson_lines(lines: Iterable[Union[bytes, bytearray]]) -> None:
+    if any(len(line) > MAX_NDJSON_LINE_BYTES for line in lines):
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"NDJSON lines must not exceed {MAX_NDJSON_LINE_BYTES} bytes"
+        )
+
+def _parse_ndjson_lines(lines: List[bytes]) -> List[Any]:
+    operations = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            operations.append(json.loads(line))
+        except ValueError:
+            # Counted as a failed operation by _apply_operations
+            operations.append(None)
+    return operations
 
 @router.get("/version", response_model=VersionResponse, tags=["App"])
 def version() -> VersionResponse:
@@ -62,20 +325,27 @@ def version() -> VersionResponse:
         )
 
 @router.get("/healthz/toggle", response_model=HealthResponse, tags=["App"])
-def healthz_toggle() -> HealthResponse:
+def healthz_toggle(
+    probe: Probe = Query(Probe.liveness, description="Probe to toggle")
+) -> HealthResponse:
     """Toggle the health status.
     
     This endpoint allows you to simulate application health issues
-    for testing purposes.
+    for testing purposes. The state is shared by all workers.
+    
+    Args:
+        probe: Probe to toggle (liveness, readiness, startup)
     
     Returns:
         HealthResponse with the new health status
     """
-    global healthy
     try:
-        old_status = healthy
-        healthy = not healthy
-        logger.info(f"Health status toggled from {old_status} to {healthy}")
+        offset = _probe_offsets[probe]
+        with health_state.lock():
+            old_status, fail_from, fail_until = probe_state(probe)
+            healthy = not old_status
+            health_state.pack(PROBE_SLOT_FORMAT, offset, healthy, fail_from, fail_until)
+        logger.info(f"{probe.value.capitalize()} status toggled from {old_status} to {healthy}")
         
         return HealthResponse(
             healthy=healthy,
@@ -88,24 +358,62 @@ def healthz_toggle() -> HealthResponse:
             detail="Error toggling health status"
         )
 
-@router.get("/healthz", response_model=HealthResponse, tags=["App"])
-def healthz() -> HealthResponse:
-    """Retrieve the health status.
+@router.get("/healthz/fail", tags=["App"])
+def healthz_fail(
+    probe: Probe = Query(Probe.liveness, description="Probe to fail"),
+    seconds: float = Query(..., ge=0, le=86400, description="How long the probe fails (0 cancels a scheduled failure)"),
+    delay: float = Query(0, ge=0, le=86400, description="Seconds to wait before the probe starts failing")
+) -> Dict[str, Any]:
+    """Schedule a probe to fail for a number of seconds, then recover.
+    
+    Useful to test probe periods, failure thresholds and timing precisely.
+    The schedule is shared by all workers.
+    
+    Args:
+        probe: Probe to fail (liveness, readiness, startup)
+        seconds: Duration of the failure
+        delay: Delay before the failure starts
     
     Returns:
-        HealthResponse with current health status
-        
-    Raises:
-        HTTPException: With 500 status if application is unhealthy
+        The probe and its failure window as Unix timestamps
     """
+    offset = _probe_offsets[probe]
+    if seconds > 0:
+        fail_from = time.time() + delay
+        fail_until = fail_from + seconds
+    else:
+        fail_from = fail_until = 0.0
+    with health_state.lock():
+        flag, _, _ = probe_state(probe)
+        health_state.pack(PROBE_SLOT_FORMAT, offset, flag, fail_from, fail_until)
+    logger.info(f"{probe.value.capitalize()} scheduled to fail for {seconds}s after {delay}s")
+    return {"probe": probe.value, "fail_from": fail_from, "fail_until": fail_until}
+
+@router.get("/healthz/status", tags=["App"])
+def healthz_status() -> Dict[str, Any]:
+    """Get the flag, scheduled failure window and result of every probe."""
+    data = {}
+    for probe in Probe:
+        flag, fail_from, fail_until = probe_state(probe)
+        data[probe.value] = {
+            "healthy": probe_healthy(probe),
+            "enabled": flag,
+            "fail_from": fail_from or None,
+            "fail_until": fail_until or None,
+        }
+    return data
+
+def _check_probe(probe: Probe) -> HealthResponse:
+    """Answer a probe endpoint, raising a 500 when the probe fails."""
     try:
-        logger.debug(f"Health check requested, current status: {healthy}")
+        healthy = probe_healthy(probe)
+        logger.debug(f"{probe.value.capitalize()} check requested, current status: {healthy}")
         
         if healthy:
             return HealthResponse(healthy=healthy)
         else:
             # Return 500 status when unhealthy
-            logger.warning("Health check failed - application is unhealthy")
+            logger.warning(f"{probe.value.capitalize()} check failed - application is unhealthy")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail={"healthy": healthy}
@@ -120,25 +428,142 @@ def healthz() -> HealthResponse:
             detail="Error performing health check"
         )
 
-@router.get("/log", response_model=LogResponse, tags=["App"])
+@router.get("/startup", tags=["App"])
+def startup(request: Request) -> Dict[str, Any]:
+    """Get the startup-time breakdown of this process.
+    
+    Phases are timed from the moment the app package started importing.
+    Groups report whether their routes are mounted yet, which with
+    fast_startup happens on the first request under their paths.
+    """
+    data = startup_timings.snapshot()
+    route_groups = getattr(request.app.state, "route_groups", {})
+    data["fast_startup"] = config.fast_startup
+    data["groups"] = {
+        name: {"loaded": True, "load_seconds": round(loaded.load_seconds, 6)}
+        for name, loaded in route_groups.items()
+    }
+    for route in request.app.router.routes:
+        group = getattr(route, "group", None)
+        if group is not None and group.name not in route_groups:
+            data["groups"][group.name] = {"loaded": False, "load_seconds": None}
+    data["disabled_groups"] = getattr(request.app.state, "disabled_groups", [])
+    return data
+
+@router.get("/healthz", response_model=HealthResponse, tags=["App"])
+def healthz() -> HealthResponse:
+    """Retrieve the health status (liveness probe).
+    
+    Returns:
+        HealthResponse with current health status
+        
+    Raises:
+        HTTPException: With 500 status if application is unhealthy
+    """
+    return _check_probe(Probe.liveness)
+
+@router.get("/readyz", response_model=HealthResponse, tags=["App"])
+def readyz() -> HealthResponse:
+    """Retrieve the readiness status.
+    
+    Raises:
+        HTTPException: With 500 status if the application is not ready
+    """
+    return _check_probe(Probe.readiness)
+
+@router.get("/startupz", response_model=HealthResponse, tags=["App"])
+def startupz() -> HealthResponse:
+    """Retrieve the startup status.
+    
+    Raises:
+        HTTPException: With 500 status if the application has not started
+    """
+    return _check_probe(Probe.startup)
+
+def _log_bulk(message: Optional[str], count: int, size: int, rate: float, level: LogLevel) -> LogBulkResponse:
+    """Log ``count`` messages of ``size`` characters, paced to ``rate`` messages per second.
+
+    Stops early once APP22_STRESS_MAX_SECONDS have passed.
+    """
+    log_level = getattr(logging, level.value.upper())
+    filler = (message or "x") * (size // len(message or "x") + 1)
+    before = log_pipeline.stats()
+    sent = 0
+    start = time.perf_counter()
+    deadline = start + config.stress_max_seconds
+    for i in range(count):
+        # A sequence number at the start of every line lets the shipper's losses be counted
+        logger.log(log_level, (f"{i:010d} " + filler)[:size])
+        sent += 1
+        now = time.perf_counter()
+        if now >= deadline:
+            break
+        if rate > 0:
+            delay = start + (i + 1) / rate - now
+            if delay > 0:
+                time.sleep(delay)
+    elapsed = time.perf_counter() - start
+    emitted = sent if logger.isEnabledFor(log_level) else 0
+    after = log_pipeline.stats()
+    return LogBulkResponse(
+        emitted=emitted,
+        size=size,
+        level=level.value,
+        elapsed_seconds=round(elapsed, 6),
+        messages_per_second=round(emitted / elapsed, 2) if elapsed > 0 else 0.0,
+        mb_per_second=round(emitted * size / elapsed / 1_000_000, 3) if elapsed > 0 else 0.0,
+        # Counts since the request started, including records logged by other requests
+        dropped=after["dropped"] - before["dropped"],
+        blocked=after["blocked"] - before["blocked"],
+    )
+
+@router.get("/log", response_model=Union[LogResponse, LogBulkResponse], tags=["App"])
 def log(
     message: Optional[str] = Query(
         None, 
         description="Message to log at different log levels",
         max_length=1000  # Prevent extremely long log messages
-    )
-) -> LogResponse:
+    ),
+    count: Optional[int] = Query(
+        None, ge=1, le=10_000_000,
+        description="Log this many messages at one level instead of the message once per level"
+    ),
+    size: int = Query(100, ge=1, le=1024 * 1024, description="Characters per bulk message"),
+    rate: float = Query(0, ge=0, description="Target bulk messages per second (0 for as fast as possible)"),
+    level: LogLevel = Query(LogLevel.info, description="Level of the bulk messages")
+) -> Union[LogResponse, LogBulkResponse]:
     """Log a message at different log levels.
     
     This endpoint logs the provided message at DEBUG, INFO, WARNING, and ERROR levels.
     Useful for testing log aggregation and monitoring systems.
     
+    With ``count``, it instead logs ``count`` messages of ``size`` characters
+    at ``level``, paced to ``rate`` messages per second, each starting with a
+    sequence number and filled with the message. The response reports the
+    achieved rate and how many records the logging pipeline dropped. A bulk
+    run logs at most MAX_LOG_BULK_BYTES and stops after
+    APP22_STRESS_MAX_SECONDS.
+    
     Args:
         message: The message to log (max 1000 characters)
         
     Returns:
-        LogResponse confirming the logging operation
+        LogResponse confirming the logging operation, or LogBulkResponse in bulk mode
+    
+    Raises:
+        HTTPException: If a bulk run exceeds MAX_LOG_BULK_BYTES or would take
+            longer than APP22_STRESS_MAX_SECONDS at the requested rate.
     """
+    if count is not None and count * size > MAX_LOG_BULK_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"count * size must not exceed {MAX_LOG_BULK_BYTES} characters"
+        )
+    if count is not None and rate > 0 and count / rate > config.stress_max_seconds:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"count / rate must not exceed {config.stress_max_seconds} seconds (APP22_STRESS_MAX_SECONDS)"
+        )
     try:
         # Sanitize message for logging (prevent log injection)
         safe_message = message
@@ -149,6 +574,9 @@ def log(
             if len(safe_message) > 1000:
                 safe_message = safe_message[:997] + "..."
         
+        if count is not None:
+            return _log_bulk(safe_message, count, size, rate, level)
+        
         # Log at different levels
         logger.debug(safe_message)
         logger.info(safe_message)
@@ -168,11 +596,41 @@ def log(
             detail="Error processing log request"
         ) 
 
+@router.get("/log/stats", tags=["App"])
+def log_stats() -> Dict[str, Any]:
+    """Get the state of the logging pipeline.
+    
+    Reports the queue depth and the records written, dropped and blocked by
+    the asynchronous pipeline (all zero when logs are written synchronously).
+    """
+    return log_pipeline.stats()
+
 
 @router.get('/metrics', response_class=PlainTextResponse, tags=["App"])
-def metrics():
-    """Expose custom Prometheus metrics for App."""
-    return generate_latest(registry)
+def metrics(request: Request):
+    """Expose custom Prometheus metrics for App.
+    
+    Serves the OpenMetrics format when requested in the Accept header and
+    gzip when accepted by the client. With APP22_METRICS_CACHE_TTL set, the
+    rendered exposition is reused between scrapes for that many seconds.
+    """
+    encoder, content_type = choose_encoder(request.headers.get('accept'))
+    use_gzip = accepts_gzip(request.headers.get('accept-encoding', ''))
+    
+    def render() -> bytes:
+        cleanup_dead_workers()
+        output = encoder(exposition_registry)
+        return gzip.compress(output, compresslevel=1) if use_gzip else output
+    
+    headers = {'Vary': 'Accept, Accept-Encoding'}
+    if use_gzip:
+        headers['Content-Encoding'] = 'gzip'
+    media_type = 'text/plain'
+    if encoder is not generate_latest:
+        # OpenMetrics content type already carries its version and charset
+        headers['Content-Type'] = content_type
+        media_type = None
+    return Response(metrics_cache.get((content_type, use_gzip), render), media_type=media_type, headers=headers)
 
 
 @router.post('/metrics/counter', tags=["App"])
@@ -181,7 +639,7 @@ def metrics_counter(
     inc: float = Query(1.0, ge=0.0, description='Increment value')
 ):
     try:
-        app_counter.labels(name=name).inc(inc)
+        app_counter.labels(name=_bounded_label('app_counter', name)).inc(inc)
         return {"ok": True, "type": "counter", "name": name, "inc": inc}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -195,7 +653,8 @@ def metrics_gauge(
     dec: Optional[float] = Query(None, description='Decrement gauge by this value'),
 ):
     try:
-        gauge = app_gauge.labels(name=name)
+        _check_gauge_change(inc, dec)
+        gauge = app_gauge.labels(name=_bounded_label('app_gauge', name))
         if set_value is not None:
             gauge.set(set_value)
         if inc is not None:
@@ -213,7 +672,85 @@ def metrics_histogram(
     observe: float = Query(..., description='Observation value')
 ):
     try:
-        app_histogram.labels(name=name).observe(observe)
+        app_histogram.labels(name=_bounded_label('app_histogram', name)).observe(observe)
         return {"ok": True, "type": "histogram", "name": name, "observe": observe}
     except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post('/metrics/families', status_code=status.HTTP_201_CREATED, tags=["App"])
+def metrics_register_family(family: MetricFamilyCreate):
+    """Register a counter, gauge or histogram family with a single "name" label.
+    
+    The family can then be targeted by /metrics/batch operations. Histograms
+    accept custom buckets. Not available with several workers, where the
+    family would only exist in the worker serving the request.
+    """
+    reject_in_multi_worker_mode("The metric family registry")
+    with _families_lock:
+        if family.name in _families:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Metric family already exists: {family.name}")
+        if len(_families) >= MAX_RUNTIME_FAMILIES + 3:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"At most {MAX_RUNTIME_FAMILIES} metric families can be registered at runtime"
+            )
+        try:
+            if family.type == 'counter':
+                metric = Counter(family.name, family.documentation, ['name'], registry=registry)
+            elif family.type == 'gauge':
+                metric = Gauge(family.name, family.documentation, ['name'], registry=registry, multiprocess_mode=GAUGE_MODE)
+            else:
+                kwargs = {'buckets': sorted(family.buckets)} if family.buckets else {}
+                metric = Histogram(family.name, family.documentation, ['name'], registry=registry, **kwargs)
+        except ValueError as e:
+            # Name clashes with a series already in the registry
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+        _families[family.name] = (family.type, metric)
+    logger.info(f"Registered {family.type} metric family {family.name}")
+    return {"ok": True, **family.model_dump()}
+
+
+@router.post('/metrics/batch', tags=["App"])
+async def metrics_batch(request: Request):
+    """Apply many counter, gauge and histogram operations in one request.
+    
+    The body is a JSON array of operations, or an NDJSON stream of them
+    (Content-Type: application/x-ndjson) which is applied as it arrives.
+    Each operation names its metric by "family" (any registered family) or
+    "type" (counter, gauge, histogram for the built-in app_* metrics), its
+    "name" label, and the fields of the single-metric endpoints, e.g.
+    {"type": "counter", "name": "reqs", "inc": 3},
+    {"type": "gauge", "name": "load", "set_value": 5} or
+    {"family": "latency", "name": "api", "observe": 0.2}.
+    
+    Returns:
+        Number of applied and failed operations, with the first errors
+    
+    Raises:
+        HTTPException: If an NDJSON line is longer than MAX_NDJSON_LINE_BYTES;
+            the lines before it have already been applied.
+    """
+    result: Dict[str, Any] = {'applied': 0, 'failed': 0, 'errors': []}
+    if 'ndjson' in request.headers.get('content-type', ''):
+        pending = bytearray()
+        async for chunk in request.stream():
+            pending += chunk
+            end = pending.rfind(b'\n')
+            if end >= 0:
+                lines = bytes(pending[:end]).split(b'\n')
+                del pending[:end + 1]
+                _check_ndjson_lines(lines)
+                await run_in_threadpool(_apply_operations, _parse_ndjson_lines(lines), result)
+            _check_ndjson_lines([pending])
+        if pending:
+            await run_in_threadpool(_apply_operations, _parse_ndjson_lines([bytes(pending)]), result)
+    else:
+        try:
+            operations = json.loads(await request.body())
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Body must be a JSON array of operations")
+        if not isinstance(operations, list):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Body must be a JSON array of operations")
+        await run_in_threadpool(_apply_operations, operations, result)
+    return {"ok": result['failed'] == 0, **result}
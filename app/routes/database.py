@@ -1,12 +1,19 @@
+import time
+import queue
 import datetime
 import logging
+import threading
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel, Field
 from fastapi import APIRouter, Depends, Query, Request, HTTPException, status
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime
+from sqlalchemy import create_engine, make_url, insert, Column, Index, Integer, String, Boolean, DateTime
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from prometheus_client import Counter, Gauge, Histogram
+from app.routes.app import registry
+from app.multiprocess import multiprocess_dir
 from config import config
 
 # Configure logging
@@ -23,6 +30,33 @@ engine = create_engine(
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async drivers used when APP22_DB_ASYNC is enabled
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+def get_async_database_uri(database_uri: str) -> str:
+    """Translate a sync database URI into the equivalent async driver URI."""
+    url = make_url(database_uri)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"Async database mode is not supported for '{backend}' databases")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+# Async engine and session factory (only created in async mode)
+async_engine = None
+AsyncSessionLocal = None
+
+if config.db_async:
+    async_engine = create_async_engine(
+        get_async_database_uri(config.database_uri),
+        echo=config.database_echo,
+        **config.database_options
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Create Base class
 Base = declarative_base()
 
@@ -34,6 +68,18 @@ def get_db() -> Session:
     finally:
         db.close()
 
+# Dependency to get async DB session
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database mode is disabled, set APP22_DB_ASYNC=1 to enable it")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def dispose_async_engine():
+    """Close all connections held by the async engine."""
+    if async_engine is not None:
+        await async_engine.dispose()
+
 class Requests(Base):
     __tablename__ = "Requests"
     id = Column(Integer, primary_key=True)
@@ -46,6 +92,11 @@ class Requests(Base):
 
 class Tasks(Base):
     __tablename__ = "Tasks"
+    # Indexes matching the keyset pagination order of GET /tasks
+    __table_args__ = (
+        Index("ix_tasks_updated_at_id", "updated_at", "id"),
+        Index("ix_tasks_done_updated_at_id", "done", "updated_at", "id"),
+    )
     id = Column(String, primary_key=True)
     title = Column(String(48))
     description = Column(String(254))
@@ -82,37 +133,200 @@ def create_tables():
     """Create all database tables."""
     try:
         Base.metadata.create_all(bind=engine)
+        # create_all() skips existing tables, so add indexes introduced later explicitly
+        for index in Tasks.__table__.indexes:
+            index.create(bind=engine, checkfirst=True)
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Error creating database tables: {e}")
         raise
 
-# Router for database endpoints
-router = APIRouter()
+# Write-behind buffer metrics
+write_buffer_depth = Gauge(
+    'app_db_write_buffer_depth',
+    'Request records waiting in the write-behind buffer',
+    registry=registry,
+    multiprocess_mode='livesum'
+)
+write_buffer_flush_seconds = Histogram(
+    'app_db_write_buffer_flush_seconds',
+    'Time spent flushing a batch of request records',
+    registry=registry
+)
+write_buffer_rows_flushed = Counter(
+    'app_db_write_buffer_rows_flushed',
+    'Request records written by the write-behind buffer',
+    registry=registry
+)
+write_buffer_rows_dropped = Counter(
+    'app_db_write_buffer_rows_dropped',
+    'Request records dropped because the buffer was full or the flush failed',
+    ['reason'],
+    registry=registry
+)
 
-@router.get("/sql", response_model=DatabaseStatusResponse, tags=["Database"])
-def add_request(
-    limit: int = Query(
-        5, 
-        description="Number of recent requests to retrieve",
-        ge=0,
-        le=1000  # Increased limit to 1000 for large queries
-    ),
-    request: Request = None,
-    db: Session = Depends(get_db)
-) -> DatabaseStatusResponse:
-    """Insert current request and retrieve last N requests from the database along with database status.
+class WriteBufferFull(Exception):
+    """Raised when the write-behind buffer has no room for a new record."""
+
+class RequestWriteBuffer:
+    """Write-behind buffer for Requests rows.
+    
+    Rows are queued in memory and written by a background thread with a
+    single bulk insert every ``batch_size`` rows or ``flush_interval`` seconds,
+    whichever comes first. When the queue is full, ``submit()`` waits up to
+    ``block_timeout`` seconds for room before dropping the row.
+    """
+    
+    def __init__(self, session_factory, batch_size: int = 500, flush_interval: float = 0.1,
+                 max_queue: int = 10000, block_timeout: float = 0.0):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.block_timeout = block_timeout
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+    
+    def submit(self, timestamp: datetime.datetime, source: str, block: bool = True) -> None:
+        """Queue a request record, applying backpressure when the buffer is full.
+        
+        With ``block`` unset the record is dropped at once instead of waiting,
+        for callers running on the event loop.
+        
+        Raises:
+            WriteBufferFull: If no room became available within block_timeout
+        """
+        row = {"timestamp": timestamp, "source": source}
+        try:
+            if block and self.block_timeout > 0:
+                self._queue.put(row, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(row)
+        except queue.Full:
+            write_buffer_rows_dropped.labels(reason="full").inc()
+            raise WriteBufferFull("write-behind buffer is full")
+    
+    def start(self) -> None:
+        """Start the background flush thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="request-write-buffer", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"Request write-behind buffer started (batch_size={self.batch_size}, "
+            f"flush_interval={self.flush_interval}s, max_queue={self._queue.maxsize})"
+        )
+    
+    def stop(self) -> None:
+        """Stop the flush thread after writing every queued row."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        logger.info("Request write-behind buffer stopped")
+    
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and not self._stop.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                # Wake up regularly so stop() does not wait for a long flush interval
+                batch.append(self._queue.get(timeout=min(remaining, 0.1)))
+            except queue.Empty:
+                continue
+        return batch
+    
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.flush(self._next_batch())
+        # Flush everything left on shutdown
+        while not self._queue.empty():
+            batch = []
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            self.flush(batch)
+    
+    def flush(self, batch: List[Dict[str, Any]]) -> None:
+        """Write a batch of rows with a single bulk insert."""
+        if not batch:
+            return
+        start = time.perf_counter()
+        db = self.session_factory()
+        try:
+            db.execute(insert(Requests), batch)
+            db.commit()
+            write_buffer_rows_flushed.inc(len(batch))
+        except Exception as e:
+            logger.error(f"Error flushing {len(batch)} request records: {e}")
+            write_buffer_rows_dropped.labels(reason="error").inc(len(batch))
+            try:
+                db.rollback()
+            except Exception:
+                pass
+        finally:
+            db.close()
+            write_buffer_flush_seconds.observe(time.perf_counter() - start)
+            # Multi-worker mode reads the last value set instead of the depth function
+            write_buffer_depth.set(self.depth)
+
+# Process-wide write-behind buffer (only created when APP22_DB_WRITE_BEHIND is enabled)
+request_buffer: Optional[RequestWriteBuffer] = None
+
+if multiprocess_dir() is None:
+    write_buffer_depth.set_function(lambda: request_buffer.depth if request_buffer is not None else 0)
+
+def start_request_buffer() -> None:
+    """Start the write-behind buffer if enabled in the configuration."""
+    global request_buffer
+    if not config.db_write_behind or request_buffer is not None:
+        return
+    request_buffer = RequestWriteBuffer(
+        SessionLocal,
+        batch_size=config.db_write_behind_batch_size,
+        flush_interval=config.db_write_behind_flush_ms / 1000,
+        max_queue=config.db_write_behind_max_queue,
+        block_timeout=config.db_write_behind_block_ms / 1000
+    )
+    request_buffer.start()
+
+def stop_request_buffer() -> None:
+    """Flush pending rows and stop the write-behind buffer."""
+    global request_buffer
+    if request_buffer is not None:
+        request_buffer.stop()
+        request_buffer = None
+
+def _client_ip(request: Optional[Request]) -> str:
+    """Get client IP address safely."""
+    if request and hasattr(request, 'client') and request.client:
+        return request.client.host or "unknown"
+    return "unknown"
+
+def add_request_logic(db: Session, limit: int, client_ip: str, block: bool = True) -> Dict[str, Any]:
+    """Insert a request record and retrieve the last N records.
+    
+    Works on a sync Session, so it can also be run on an AsyncSession via run_sync().
     
     Args:
-        limit: Number of recent requests to retrieve (0-1000)
-        request: FastAPI request object for client info
-        db: Database session dependency
+        db: Database session
+        limit: Number of recent requests to retrieve
+        client_ip: Source address recorded with the request
+        block: Wait for room in a full write-behind buffer (must be False on the event loop)
         
     Returns:
-        DatabaseStatusResponse with connection status and recent requests
+        Dictionary matching DatabaseStatusResponse
         
     Raises:
-        HTTPException: If there are critical database errors
+        HTTPException: If both database reads and writes failed
     """
     response_data = {
         'db': '',
@@ -122,18 +336,21 @@ def add_request(
         'exception': None
     }
     
-    # Get client IP address safely
-    client_ip = "unknown"
-    if request and hasattr(request, 'client') and request.client:
-        client_ip = request.client.host or "unknown"
-    
     # Try to insert a new request record
     try:
         logger.debug(f"Inserting request record for client: {client_ip}")
-        record = Requests(datetime.datetime.now(), client_ip)
-        db.add(record)
-        db.commit()
-        logger.debug("Request record inserted successfully")
+        if request_buffer is not None:
+            request_buffer.submit(datetime.datetime.now(), client_ip, block=block)
+            logger.debug("Request record queued for write-behind")
+        else:
+            record = Requests(datetime.datetime.now(), client_ip)
+            db.add(record)
+            db.commit()
+            logger.debug("Request record inserted successfully")
+    except WriteBufferFull as e:
+        logger.warning(f"Database write dropped: {e}")
+        response_data['writable'] = False
+        response_data['exception'] = f"Write error: {str(e)}"
     except SQLAlchemyError as e:
         logger.error(f"Database write error: {e}")
         response_data['writable'] = False
@@ -155,7 +372,7 @@ def add_request(
     try:
         logger.debug(f"Retrieving last {limit} request records")
         records = db.query(Requests).order_by(Requests.id.desc()).limit(limit).all()
-        response_data['db'] = str(engine.url)
+        response_data['db'] = str(db.get_bind().url)
         
         # Convert records to response format
         for record in records:
@@ -195,4 +412,55 @@ def add_request(
             detail="Database is completely unavailable"
         )
     
-    return DatabaseStatusResponse(**response_data) 
\ No newline at end of file
+    return response_data 
+
+# Router for database endpoints
+router = APIRouter()
+
+# Router serving the same endpoints from async handlers (APP22_DB_ASYNC)
+async_router = APIRouter()
+
+@router.get("/sql", response_model=DatabaseStatusResponse, tags=["Database"])
+def add_request(
+    limit: int = Query(
+        5, 
+        description="Number of recent requests to retrieve",
+        ge=0,
+        le=1000  # Increased limit to 1000 for large queries
+    ),
+    request: Request = None,
+    db: Session = Depends(get_db)
+) -> DatabaseStatusResponse:
+    """Insert current request and retrieve last N requests from the database along with database status.
+    
+    Args:
+        limit: Number of recent requests to retrieve (0-1000)
+        request: FastAPI request object for client info
+        db: Database session dependency
+        
+    Returns:
+        DatabaseStatusResponse with connection status and recent requests
+        
+    Raises:
+        HTTPException: If there are critical database errors
+    """
+    return DatabaseStatusResponse(**add_request_logic(db, limit, _client_ip(request)))
+
+@async_router.get("/sql", response_model=DatabaseStatusResponse, tags=["Database"])
+async def add_request_async(
+    limit: int = Query(
+        5, 
+        description="Number of recent requests to retrieve",
+        ge=0,
+        le=1000
+    ),
+    request: Request = None,
+    db: AsyncSession = Depends(get_async_db)
+) -> DatabaseStatusResponse:
+    """Insert current request and retrieve last N requests from the database along with database status.
+    
+    Async variant of /sql served when APP22_DB_ASYNC is enabled.
+    """
+    # run_sync() runs on the event loop, so a full write-behind buffer drops the record instead of waiting
+    response_data = await db.run_sync(add_request_logic, limit, _client_ip(request), False)
+    return DatabaseStatusResponse(**response_data)
@@ -1,9 +1,23 @@
 import os
+import json
+import time
+import select
+import asyncio
+import ctypes
+import ctypes.util
 import hashlib
 import logging
-from typing import Dict, Any, List, Optional
-from fastapi import APIRouter, HTTPException, status, Query
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+import anyio
+from fastapi import APIRouter, HTTPException, status, Query, Header, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.types import Receive, Scope, Send
 from pathlib import Path
+from prometheus_client import Counter, Gauge
+from app.routes.app import registry
+from config import config
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -13,31 +27,420 @@ router = APIRouter()
 # Security: Define allowed file extensions
 IGNORED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.ico', '.svg', '.webp'}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB limit
+CHUNK_SIZE = 1024 * 1024  # Read size used when hashing files incrementally
+
+# Checksum cache metrics
+fs_cache_hits = Counter('app_fs_cache_hits', 'File checksum cache hits', registry=registry)
+fs_cache_misses = Counter('app_fs_cache_misses', 'File checksum cache misses', registry=registry)
+fs_cache_bytes = Gauge('app_fs_cache_bytes', 'Bytes accounted to the file checksum cache', registry=registry, multiprocess_mode='livesum')
+
+class ChecksumCache:
+    """LRU cache of file checksums and contents with a byte budget.
+
+    Entries are keyed by path and validated against (inode, size, mtime_ns),
+    so a changed file is re-read while unchanged files only cost a stat.
+    """
+
+    # Approximate fixed cost of an entry, so checksum-only entries are bounded too
+    ENTRY_OVERHEAD = 256
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def stat_key(st: os.stat_result) -> Tuple[int, int, int]:
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def get(self, path: str, key: Tuple[int, int, int]) -> Optional[Tuple[str, int, Optional[bytes]]]:
+        """Return (checksum, size, content) if cached for this exact file version."""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != key:
+                return None
+            self._entries.move_to_end(path)
+            return entry[1], entry[2], entry[3]
+
+    def put(self, path: str, key: Tuple[int, int, int], checksum: str, size: int, content: Optional[bytes]) -> None:
+        if self.max_bytes <= 0:
+            return
+        cost = self.ENTRY_OVERHEAD + len(path) + (len(content) if content is not None else 0)
+        if cost > self.max_bytes:
+            # Too large to cache with its content, keep the checksum only
+            content = None
+            cost = self.ENTRY_OVERHEAD + len(path)
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._bytes -= old[4]
+            self._entries[path] = (key, checksum, size, content, cost)
+            self._bytes += cost
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted[4]
+            fs_cache_bytes.set(self._bytes)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            fs_cache_bytes.set(0)
+
+checksum_cache = ChecksumCache(config.fs_cache_max_bytes)
+
+def _hash_file(path: str, keep_content: bool, max_content: Optional[int] = None) -> Tuple[str, int, Optional[bytes]]:
+    """Compute the MD5 checksum of a file in fixed-size chunks.
+
+    Results are served from the checksum cache while the file's stat
+    metadata is unchanged.
+
+    Args:
+        path: File to read
+        keep_content: Whether to also return the file body
+        max_content: Largest file whose body is returned (None for no limit)
+
+    Returns:
+        Tuple of checksum, size in bytes and the content (None if not kept)
+    """
+    try:
+        key = ChecksumCache.stat_key(os.stat(path))
+    except OSError:
+        key = None
+
+    if key is not None:
+        cached = checksum_cache.get(path, key)
+        if cached is not None:
+            checksum, size, content = cached
+            content_wanted = keep_content and (max_content is None or size <= max_content)
+            if not content_wanted or content is not None:
+                fs_cache_hits.inc()
+                return checksum, size, content if content_wanted else None
+    fs_cache_misses.inc()
+
+    md5 = hashlib.md5()
+    size = 0
+    chunks: Optional[List[bytes]] = [] if keep_content else None
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            md5.update(chunk)
+            size += len(chunk)
+            if chunks is not None:
+                if max_content is not None and size > max_content:
+                    chunks = None
+                else:
+                    chunks.append(chunk)
+    checksum = md5.hexdigest()
+    content = b''.join(chunks) if chunks is not None else None
+    if key is not None and key[1] == size:
+        checksum_cache.put(path, key, checksum, size, content)
+    return checksum, size, content
+
+def _cat_records(root_dir: str = "data") -> Iterator[Dict[str, Any]]:
+    """Lazily walk root_dir and yield one /cat record per file."""
+    for root, dirs, files in os.walk(root_dir):
+        for file in files:
+            abs_path = os.path.abspath(os.path.join(root, file))
+            ext = Path(abs_path).suffix.lower()
+            try:
+                checksum, size, content = _hash_file(
+                    abs_path, keep_content=ext not in IGNORED_EXTENSIONS, max_content=MAX_FILE_SIZE
+                )
+            except Exception as e:
+                yield {"path": abs_path, "checksum": None, "content": "-", "error": str(e)}
+                continue
+            record = {"path": abs_path, "checksum": checksum, "size": size, "content": "-"}
+            if content is not None:
+                try:
+                    record["content"] = content.decode('utf-8')
+                except UnicodeDecodeError:
+                    pass
+            elif ext not in IGNORED_EXTENSIONS:
+                record["reason"] = "File exceeds maximum size limit"
+            yield record
+
+def _ndjson(records: Iterator[Dict[str, Any]]) -> Iterator[bytes]:
+    for record in records:
+        yield json.dumps(record).encode('utf-8') + b'\n'
+
+class _Inotify:
+    """Minimal inotify binding through ctypes (Linux only).
+
+    Events are only used as a change signal, so they are drained without
+    being decoded.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+            IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        # AttributeError on platforms without inotify
+        self._init = libc.inotify_init1
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = self._init(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1 failed: {os.strerror(errno)}")
+
+    def add_watch(self, path: str) -> None:
+        if self._add_watch(self.fd, os.fsencode(path), self.MASK) < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_add_watch failed for {path}: {os.strerror(errno)}")
+
+    def wait(self, timeout: float) -> bool:
+        """Wait up to timeout seconds for events, draining them. Returns True if any arrived."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+        self.drain()
+        return True
+
+    def drain(self) -> None:
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+# Published to event subscribers when the index stops, ending their streams
+INDEX_CLOSED = None
+
+class DataIndex:
+    """In-memory index of the files under a directory, kept current by a watcher.
+
+    The watcher uses inotify where available and falls back to polling. Any
+    change triggers a rescan whose differences are published as events, so
+    requests read the index without touching the filesystem.
+    """
+
+    DEBOUNCE = 0.05  # Seconds to let a burst of inotify events settle before rescanning
+
+    def __init__(self, root: Path, mode: str = "auto", poll_interval: float = 2.0, max_queued_events: int = 1000):
+        self.root = root
+        self.mode = mode
+        self.poll_interval = poll_interval
+        self.max_queued_events = max_queued_events
+        # (entries by relative path, total size) replaced atomically on each rescan
+        self._snapshot: Tuple[Dict[str, Dict[str, Any]], int] = ({}, 0)
+        self._directories: set = set()
+        self._subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+        self._subscribers_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.backend: Optional[str] = None
+
+    def _scan(self) -> Tuple[Dict[str, Dict[str, Any]], set]:
+        entries: Dict[str, Dict[str, Any]] = {}
+        directories = set()
+        root_resolved = str(self.root.resolve())
+        for root, dirs, files in os.walk(self.root):
+            directories.add(root)
+            for file in files:
+                filepath = Path(root) / file
+                try:
+                    absolute_filepath = filepath.resolve()
+                    # Security: Ensure the file is within the data directory
+                    if not str(absolute_filepath).startswith(root_resolved):
+                        continue
+                    st = absolute_filepath.stat()
+                except OSError:
+                    continue
+                relative_path = str(filepath.relative_to(self.root))
+                entries[relative_path] = {
+                    'path': relative_path,
+                    'absolute_path': str(absolute_filepath),
+                    'size': st.st_size,
+                    'extension': absolute_filepath.suffix.lower(),
+                    'mtime_ns': st.st_mtime_ns
+                }
+        return entries, directories
+
+    def refresh(self) -> List[Dict[str, Any]]:
+        """Rescan the directory, swap in the new index and publish the differences."""
+        entries, directories = self._scan()
+        old_entries = self._snapshot[0]
+        self._snapshot = (entries, sum(entry['size'] for entry in entries.values()))
+        self._directories = directories
+
+        now = time.time()
+        events = []
+        for path, entry in entries.items():
+            old = old_entries.get(path)
+            if old is None:
+                events.append({'type': 'created', 'path': path, 'size': entry['size'], 'timestamp': now})
+            elif (old['size'], old['mtime_ns'], old['absolute_path']) != (entry['size'], entry['mtime_ns'], entry['absolute_path']):
+                events.append({'type': 'modified', 'path': path, 'size': entry['size'], 'timestamp': now})
+        for path in old_entries.keys() - entries.keys():
+            events.append({'type': 'deleted', 'path': path, 'size': None, 'timestamp': now})
+        if events:
+            self._publish(events)
+        return events
+
+    def stats(self) -> Dict[str, Any]:
+        entries, total_size = self._snapshot
+        return {'count': len(entries), 'total_size_bytes': total_size}
+
+    def listing(self) -> Dict[str, Any]:
+        entries = self._snapshot[0]
+        files_list = [
+            {key: entry[key] for key in ('path', 'absolute_path', 'size', 'extension')}
+            for entry in entries.values()
+        ]
+        return {'files': files_list, 'count': len(files_list)}
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register an asyncio queue receiving change events on the running loop."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queued_events)
+        with self._subscribers_lock:
+            self._subscribers.append((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        with self._subscribers_lock:
+            self._subscribers = [(loop, q) for loop, q in self._subscribers if q is not queue]
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, event: Dict[str, Any]) -> None:
+        # Slow consumers lose their oldest events rather than blocking the watcher
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    def _publish(self, events: List[Dict[str, Any]]) -> None:
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            try:
+                for event in events:
+                    loop.call_soon_threadsafe(self._offer, queue, event)
+            except RuntimeError:
+                # Event loop already closed
+                self.unsubscribe(queue)
+
+    def start(self) -> None:
+        """Build the initial index and start the watcher thread."""
+        if self._thread is not None:
+            return
+        self.refresh()
+        inotify = None
+        if self.mode in ("auto", "inotify") and self.root.is_dir():
+            try:
+                inotify = _Inotify()
+                for directory in self._directories:
+                    inotify.add_watch(directory)
+            except (OSError, AttributeError) as e:
+                if inotify is not None:
+                    inotify.close()
+                    inotify = None
+                if self.mode == "inotify":
+                    raise
+                logger.warning(f"inotify unavailable, falling back to polling: {e}")
+        self.backend = "inotify" if inotify is not None else "poll"
+        self._stop.clear()
+        target = self._run_inotify if inotify is not None else self._run_poll
+        args = (inotify,) if inotify is not None else ()
+        self._thread = threading.Thread(target=target, args=args, name="data-index", daemon=True)
+        self._thread.start()
+        logger.info(f"Data index started for {self.root} using {self.backend}")
+
+    def stop(self) -> None:
+        """Stop the watcher thread and end every open event stream."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._publish([INDEX_CLOSED])
+
+    def _run_poll(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Error refreshing data index: {e}")
+
+    def _run_inotify(self, inotify: _Inotify) -> None:
+        watched = set(self._directories)
+        try:
+            while not self._stop.is_set():
+                if not inotify.wait(0.5):
+                    continue
+                time.sleep(self.DEBOUNCE)
+                inotify.drain()
+                try:
+                    self.refresh()
+                    for directory in self._directories - watched:
+                        inotify.add_watch(directory)
+                    watched = set(self._directories)
+                except Exception as e:
+                    logger.error(f"Error refreshing data index: {e}")
+        finally:
+            inotify.close()
+
+# Process-wide index of data/ (only created when APP22_FS_WATCH is enabled)
+data_index: Optional[DataIndex] = None
+
+def start_data_index() -> None:
+    """Start the data/ index if enabled in the configuration."""
+    global data_index
+    if config.fs_watch == "off" or data_index is not None:
+        return
+    data_index = DataIndex(Path("data"), mode=config.fs_watch, poll_interval=config.fs_watch_interval)
+    data_index.start()
+
+def stop_data_index() -> None:
+    """Stop the data/ index watcher."""
+    global data_index
+    if data_index is not None:
+        data_index.stop()
+        data_index = None
 
 @router.get("/cat", tags=["Filesystem"])
-def cat() -> Dict[str, Any]:
+def cat(stream: bool = Query(False, description="Stream one NDJSON record per file instead of a single JSON object")):
     """Compatibility endpoint that returns the contents and checksums of files under data/.
 
     The response is a mapping of absolute file path to an object containing
     checksum and content (or '-' for binary/ignored types), matching tests' expectations.
+
+    With stream=true the tree is walked lazily and files are hashed in chunks,
+    emitting one application/x-ndjson record per file so memory stays flat
+    regardless of the size of the mounted volume. Content is only included
+    for text files up to MAX_FILE_SIZE.
     """
+    if stream:
+        return StreamingResponse(_ndjson(_cat_records()), media_type="application/x-ndjson")
+
     results: Dict[str, Any] = {}
     for root, dirs, files in os.walk("data"):
         for file in files:
             abs_path = os.path.abspath(os.path.join(root, file))
             try:
-                with open(abs_path, 'rb') as f:
-                    content = f.read()
-                    checksum = hashlib.md5(content).hexdigest()
-                    ext = Path(abs_path).suffix.lower()
-                    if ext in IGNORED_EXTENSIONS:
+                ext = Path(abs_path).suffix.lower()
+                checksum, size, content = _hash_file(abs_path, keep_content=ext not in IGNORED_EXTENSIONS)
+                if content is None:
+                    results[abs_path] = {"checksum": checksum, "content": "-"}
+                else:
+                    try:
+                        decoded = content.decode('utf-8')
+                        results[abs_path] = {"checksum": checksum, "content": decoded}
+                    except UnicodeDecodeError:
                         results[abs_path] = {"checksum": checksum, "content": "-"}
-                    else:
-                        try:
-                            decoded = content.decode('utf-8')
-                            results[abs_path] = {"checksum": checksum, "content": decoded}
-                        except UnicodeDecodeError:
-                            results[abs_path] = {"checksum": checksum, "content": "-"}
             except FileNotFoundError:
                 # Let this propagate so tests expecting this behavior pass
                 raise
@@ -86,38 +489,227 @@ def files(file: Optional[str] = Query(None, description="Path to specific file t
     
     # Handle list files request
     if ls is True:
+        if data_index is not None:
+            return data_index.listing()
         return _list_files(data_path)
     
     # Default: return count and total size
+    if data_index is not None:
+        return data_index.stats()
     return _get_directory_stats(data_path)
 
 
+@router.get("/files/events", tags=["Filesystem"])
+async def file_events(limit: Optional[int] = Query(None, ge=1, description="Close the stream after this many events")):
+    """Stream changes under data/ as NDJSON events (created, modified, deleted).
+    
+    Requires the data index watcher (APP22_FS_WATCH). Useful to observe
+    ConfigMap and Secret rollouts in real time.
+    
+    Raises:
+        HTTPException: If the data index watcher is disabled.
+    """
+    index = data_index
+    if index is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Data index watcher is disabled, set APP22_FS_WATCH to enable it"
+        )
+    queue = index.subscribe()
+    
+    async def stream():
+        try:
+            sent = 0
+            while limit is None or sent < limit:
+                event = await queue.get()
+                if event is INDEX_CLOSED:
+                    break
+                yield json.dumps(event).encode('utf-8') + b'\n'
+                sent += 1
+        finally:
+            index.unsubscribe(queue)
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+def _stat_etag(st: os.stat_result) -> str:
+    """Strong ETag derived from the file version, like the checksum cache key."""
+    return '"{:x}-{:x}-{:x}"'.format(*ChecksumCache.stat_key(st))
+
+
+@router.get("/files/raw", tags=["Filesystem"])
+@router.head("/files/raw", tags=["Filesystem"])
+def download(request: Request,
+             file: str = Query(..., description="Path of the file to download, relative to data/"),
+             range_header: Optional[str] = Header(None, alias="Range"),
+             if_none_match: Optional[str] = Header(None),
+             if_range: Optional[str] = Header(None)):
+    """Download a file from data/ as raw bytes.
+    
+    Unlike /files?file=, there is no size limit: the body is streamed with
+    constant memory. Supports single byte ranges (Range, If-Range) and
+    conditional requests (If-None-Match). The ETag is built from the inode,
+    size and modification time, so no request has to read the whole file.
+    
+    Raises:
+        HTTPException: If the path is outside data/, missing, not a file,
+            or the requested range is not satisfiable.
+    """
+    requested_file = _resolve_data_file(Path("data"), file)
+    stat_result = requested_file.stat()
+    etag = _stat_etag(stat_result)
+    headers = {'ETag': etag, 'Accept-Ranges': 'bytes'}
+    
+    if if_none_match is not None and _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    size = stat_result.st_size
+    byte_range = None
+    if range_header is not None and (if_range is None or _etag_matches(if_range, etag)):
+        byte_range = _parse_range(range_header, size)
+    
+    if byte_range is None:
+        return _FileRangeResponse(requested_file, 0, size - 1, headers=headers,
+                                  stat_result=stat_result, method=request.method)
+    
+    start, end = byte_range
+    headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return _FileRangeResponse(requested_file, start, end, status_code=status.HTTP_206_PARTIAL_CONTENT,
+                              headers=headers, stat_result=stat_result, method=request.method)
+
+
+# ASGI extension (and message type) for handing a file to the server's sendfile
+ZEROCOPY_SEND = "http.response.zerocopysend"
+
+
+class _FileRangeResponse(FileResponse):
+    """FileResponse limited to an inclusive byte range of the file.
+    
+    The body is handed to the server with the ASGI zerocopy extension
+    (sendfile) when the server offers it, and read in CHUNK_SIZE pieces
+    otherwise, so memory use does not depend on the file size.
+    """
+    
+    chunk_size = CHUNK_SIZE
+    
+    def __init__(self, path: Path, start: int, end: int, **kwargs: Any) -> None:
+        super().__init__(path, **kwargs)
+        self.start = start
+        self.end = end
+        self.headers['content-length'] = str(end - start + 1)
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        count = self.end - self.start + 1
+        if self.send_header_only or count <= 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        elif ZEROCOPY_SEND in scope.get("extensions", {}):
+            with open(self.path, 'rb') as file:
+                await send({
+                    "type": ZEROCOPY_SEND,
+                    "file": file,
+                    "offset": self.start,
+                    "count": count,
+                    "more_body": False,
+                })
+        else:
+            async with await anyio.open_file(self.path, mode="rb") as file:
+                await file.seek(self.start)
+                remaining = count
+                while remaining > 0:
+                    chunk = await file.read(min(self.chunk_size, remaining))
+                    # A file truncated while being served ends the body early
+                    remaining = remaining - len(chunk) if chunk else 0
+                    await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Check an If-None-Match/If-Range header against an ETag (weak comparison)."""
+    candidates = [candidate.strip() for candidate in header.split(',')]
+    return '*' in candidates or any(candidate.removeprefix('W/') == etag for candidate in candidates)
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single "bytes=" Range header into an inclusive (start, end) pair.
+    
+    Returns None for malformed or multi-range headers, which are served as
+    the full file.
+    
+    Raises:
+        HTTPException: If the range cannot be satisfied for this file size.
+    """
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+    first, sep, last = spec.strip().partition('-')
+    if not sep:
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else max(start, size - 1)
+            if start < 0 or end < start:
+                return None
+        else:
+            suffix = int(last)
+            if suffix < 0:
+                return None
+            start, end = max(size - suffix, 0), size - 1
+            if suffix == 0:
+                start = size
+    except ValueError:
+        return None
+    if start >= size:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail=f"Range not satisfiable for file of {size} bytes",
+            headers={'Content-Range': f'bytes */{size}'}
+        )
+    return start, min(end, size - 1)
+
+
+def _resolve_data_file(data_path: Path, file_path: str) -> Path:
+    """Resolve a path relative to the data directory, refusing anything outside it.
+    
+    Raises:
+        HTTPException: If the path escapes the data directory, does not exist
+            or is not a regular file.
+    """
+    # Security: Resolve the file path and ensure it's within data directory
+    requested_file = (data_path / file_path).resolve()
+    
+    # Security: Ensure the file is within the data directory
+    if not str(requested_file).startswith(str(data_path.resolve())):
+        logger.warning(f"Attempted path traversal detected: {file_path}")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied: path traversal not allowed"
+        )
+    
+    # Check if file exists
+    if not requested_file.exists():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"File not found: {file_path}"
+        )
+    
+    if not requested_file.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Path is not a file: {file_path}"
+        )
+    
+    return requested_file
+
+
 def _get_file_content(data_path: Path, file_path: str) -> Dict[str, Any]:
     """Get content and checksum of a specific file."""
     try:
-        # Security: Resolve the file path and ensure it's within data directory
-        requested_file = (data_path / file_path).resolve()
-        
-        # Security: Ensure the file is within the data directory
-        if not str(requested_file).startswith(str(data_path.resolve())):
-            logger.warning(f"Attempted path traversal detected: {file_path}")
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Access denied: path traversal not allowed"
-            )
-        
-        # Check if file exists
-        if not requested_file.exists():
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"File not found: {file_path}"
-            )
-        
-        if not requested_file.is_file():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Path is not a file: {file_path}"
-            )
+        requested_file = _resolve_data_file(data_path, file_path)
         
         # Check file size for security
         file_size = requested_file.stat().st_size
@@ -134,30 +726,30 @@ def _get_file_content(data_path: Path, file_path: str) -> Dict[str, Any]:
         # Get file extension
         file_extension = requested_file.suffix.lower()
         
-        # Read file content
-        with open(requested_file, 'rb') as f:
-            content = f.read()
-            checksum = hashlib.md5(content).hexdigest()
-            
-            result = {
-                'path': file_path,
-                'checksum': checksum,
-                'size': len(content)
-            }
-            
-            # Determine if content should be included
-            if file_extension in IGNORED_EXTENSIONS:
+        # Read file content (served from the checksum cache if unchanged)
+        checksum, size, content = _hash_file(
+            str(requested_file), keep_content=file_extension not in IGNORED_EXTENSIONS
+        )
+        
+        result = {
+            'path': file_path,
+            'checksum': checksum,
+            'size': size
+        }
+        
+        # Determine if content should be included
+        if file_extension in IGNORED_EXTENSIONS:
+            result['content'] = '-'
+            result['reason'] = 'Binary/image file excluded'
+        else:
+            try:
+                decoded_content = content.decode('utf-8')
+                result['content'] = decoded_content
+            except UnicodeDecodeError:
                 result['content'] = '-'
-                result['reason'] = 'Binary/image file excluded'
-            else:
-                try:
-                    decoded_content = content.decode('utf-8')
-                    result['content'] = decoded_content
-                except UnicodeDecodeError:
-                    result['content'] = '-'
-                    result['reason'] = 'Binary file - cannot decode as UTF-8'
-            
-            return result
+                result['reason'] = 'Binary file - cannot decode as UTF-8'
+        
+        return result
             
     except HTTPException:
         raise
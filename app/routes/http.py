@@ -1,13 +1,28 @@
+import os
 import time
+import hashlib
+import random
+import asyncio
 import logging
-from typing import Dict, Any
+from enum import Enum
+from functools import lru_cache
+from typing import Dict, Any, AsyncIterator
 from fastapi import APIRouter, Query, Request, Response, HTTPException, status
+from fastapi.responses import StreamingResponse
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Maximum delay of 5 minutes for safety
+MAX_DELAY_SECONDS = 300
+
+# /payload limits
+MAX_PAYLOAD_SIZE = 100 * 1024 ** 3  # 100 GiB
+MAX_PAYLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+DEFAULT_PAYLOAD_CHUNK_SIZE = 64 * 1024
+
 @router.get("/headers", tags=["HTTP"])
 def headers(request: Request) -> Dict[str, str]:
     """Get request headers.
@@ -33,8 +48,38 @@ def headers(request: Request) -> Dict[str, str]:
             detail="Error processing request headers"
         )
 
+class JitterDistribution(str, Enum):
+    """Distributions available for latency jitter."""
+    none = "none"
+    uniform = "uniform"
+    normal = "normal"
+    exponential = "exponential"
+
+def _compute_delay(delay: int, delay_ms: int, jitter: JitterDistribution, jitter_ms: int) -> float:
+    """Compute the total delay in seconds, including jitter, clamped to the allowed range.
+
+    Args:
+        delay: Base delay in seconds
+        delay_ms: Additional base delay in milliseconds
+        jitter: Distribution used to draw the jitter
+        jitter_ms: Jitter scale in milliseconds (upper bound for uniform,
+            standard deviation for normal, mean for exponential)
+
+    Returns:
+        Delay in seconds between 0 and MAX_DELAY_SECONDS
+    """
+    total_ms = delay * 1000 + delay_ms
+    if jitter_ms > 0:
+        if jitter == JitterDistribution.uniform:
+            total_ms += random.uniform(0, jitter_ms)
+        elif jitter == JitterDistribution.normal:
+            total_ms += random.gauss(0, jitter_ms)
+        elif jitter == JitterDistribution.exponential:
+            total_ms += random.expovariate(1 / jitter_ms)
+    return min(max(total_ms, 0), MAX_DELAY_SECONDS * 1000) / 1000
+
 @router.get("/response", tags=["HTTP"])
-def response(
+async def response(
     status_code: int = Query(
         200, 
         alias="status",
@@ -46,15 +91,37 @@ def response(
         0, 
         description="Delay in seconds before returning the response",
         ge=0,    # Delay cannot be negative
-        le=300   # Maximum delay of 5 minutes for safety
+        le=MAX_DELAY_SECONDS   # Maximum delay of 5 minutes for safety
+    ),
+    delay_ms: int = Query(
+        0,
+        description="Additional delay in milliseconds before returning the response",
+        ge=0,
+        le=MAX_DELAY_SECONDS * 1000
+    ),
+    jitter: JitterDistribution = Query(
+        JitterDistribution.none,
+        description="Distribution of random jitter added to the delay"
+    ),
+    jitter_ms: int = Query(
+        0,
+        description="Jitter scale in milliseconds (uniform: upper bound, normal: standard deviation, exponential: mean)",
+        ge=0,
+        le=60000
     ),
     response: Response = None
 ) -> Dict[str, Any]:
-    """Simulate HTTP response with optional status and delay.
+    """Simulate HTTP response with optional status, delay and jitter.
+    
+    The delay is awaited with asyncio.sleep, so delayed responses do not
+    occupy a worker thread.
     
     Args:
         status_code: HTTP status code to return (100-599)
         delay: Delay in seconds before returning response (0-300)
+        delay_ms: Additional delay in milliseconds
+        jitter: Jitter distribution (none, uniform, normal, exponential)
+        jitter_ms: Jitter scale in milliseconds
         response: FastAPI response object to modify
         
     Returns:
@@ -74,22 +141,28 @@ def response(
             )
         
         # Validate delay is reasonable
-        if delay < 0 or delay > 300:
+        if delay < 0 or delay > MAX_DELAY_SECONDS:
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail="Delay must be between 0 and 300 seconds"
             )
         
+        applied_delay = _compute_delay(delay, delay_ms, jitter, jitter_ms)
+        
         data = {
             'status': status_code,
             'delay': delay,
+            'delay_ms': delay_ms,
+            'jitter': jitter.value,
+            'jitter_ms': jitter_ms,
+            'applied_delay_ms': round(applied_delay * 1000, 3),
             'timestamp': time.time()
         }
         
         # Apply delay if specified
-        if delay > 0:
-            logger.debug(f"Applying delay of {delay} seconds")
-            time.sleep(delay)
+        if applied_delay > 0:
+            logger.debug(f"Applying delay of {applied_delay:.3f} seconds")
+            await asyncio.sleep(applied_delay)
         
         # Set the response status code
         if response:
@@ -106,4 +179,166 @@ def response(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error simulating response"
-        ) 
\ No newline at end of file
+        )
+
+class PayloadPattern(str, Enum):
+    """Content generated by /payload."""
+    random = "random"
+    zero = "zero"
+    text = "text"
+
+PAYLOAD_MEDIA_TYPES = {
+    PayloadPattern.random: "application/octet-stream",
+    PayloadPattern.zero: "application/octet-stream",
+    PayloadPattern.text: "text/plain",
+}
+
+_PAYLOAD_TEXT = b"The quick brown fox jumps over the lazy dog. App22 payload generator.\n"
+
+@lru_cache(maxsize=None)
+def _payload_source(pattern: PayloadPattern) -> memoryview:
+    """Generate the largest chunk of a pattern once per process."""
+    if pattern == PayloadPattern.random:
+        data = os.urandom(MAX_PAYLOAD_CHUNK_SIZE)
+    elif pattern == PayloadPattern.zero:
+        data = bytes(MAX_PAYLOAD_CHUNK_SIZE)
+    else:
+        data = (_PAYLOAD_TEXT * (MAX_PAYLOAD_CHUNK_SIZE // len(_PAYLOAD_TEXT) + 1))[:MAX_PAYLOAD_CHUNK_SIZE]
+    return memoryview(data)
+
+@lru_cache(maxsize=None)
+def _default_payload_chunk(pattern: PayloadPattern) -> bytes:
+    return _payload_source(pattern)[:DEFAULT_PAYLOAD_CHUNK_SIZE].tobytes()
+
+def _payload_chunk(pattern: PayloadPattern, chunk_size: int) -> bytes:
+    """Return the chunk of the given size for a pattern.
+
+    Only default-sized chunks are kept for the life of the process; other
+    sizes are copied once per request so clients cannot pin memory.
+    """
+    if chunk_size == DEFAULT_PAYLOAD_CHUNK_SIZE:
+        return _default_payload_chunk(pattern)
+    return _payload_source(pattern)[:chunk_size].tobytes()
+
+async def _generate_payload(pattern: PayloadPattern, size: int, chunk_size: int, rate: int) -> AsyncIterator[bytes]:
+    """Yield size bytes of a pattern, paced to rate bytes per second if set.
+
+    Every full chunk is the same preallocated bytes object, so generating the
+    body costs no allocation or copying per chunk.
+    """
+    chunk = _payload_chunk(pattern, chunk_size)
+    started = time.monotonic()
+    sent = 0
+    while sent < size:
+        remaining = size - sent
+        if remaining >= chunk_size:
+            yield chunk
+            sent += chunk_size
+        else:
+            yield _payload_source(pattern)[:remaining].tobytes()
+            sent = size
+        if rate > 0:
+            ahead = sent / rate - (time.monotonic() - started)
+            if ahead > 0:
+                await asyncio.sleep(ahead)
+
+@router.get("/payload", tags=["HTTP"])
+async def payload(
+    size: int = Query(
+        1024 * 1024,
+        description="Number of bytes to return",
+        ge=0,
+        le=MAX_PAYLOAD_SIZE
+    ),
+    pattern: PayloadPattern = Query(
+        PayloadPattern.random,
+        description="Content of the payload: random (incompressible), zero or text (compressible)"
+    ),
+    chunk_size: int = Query(
+        DEFAULT_PAYLOAD_CHUNK_SIZE,
+        description="Size in bytes of each streamed chunk",
+        ge=1,
+        le=MAX_PAYLOAD_CHUNK_SIZE
+    ),
+    rate: int = Query(
+        0,
+        description="Maximum transfer rate in bytes per second (0 for unlimited)",
+        ge=0
+    )
+) -> StreamingResponse:
+    """Stream a synthetic payload to measure network throughput.
+    
+    The body is generated from a preallocated buffer, so the server is not
+    the bottleneck when measuring ingress, service mesh or CNI bandwidth.
+    
+    Args:
+        size: Number of bytes to return (up to 100 GiB)
+        pattern: Payload content (random, zero, text)
+        chunk_size: Size of each streamed chunk (up to 4 MiB)
+        rate: Optional rate limit in bytes per second
+        
+    Returns:
+        Streaming response of exactly size bytes
+    """
+    logger.info(f"Streaming {size} bytes of {pattern.value} payload in {chunk_size} byte chunks")
+    headers = {
+        'Content-Length': str(size),
+        'X-Payload-Pattern': pattern.value,
+    }
+    return StreamingResponse(
+        _generate_payload(pattern, size, chunk_size, rate),
+        media_type=PAYLOAD_MEDIA_TYPES[pattern],
+        headers=headers
+    )
+
+class SinkHash(str, Enum):
+    """Digests /sink can compute over the uploaded body."""
+    none = "none"
+    md5 = "md5"
+    sha1 = "sha1"
+    sha256 = "sha256"
+
+@router.post("/sink", tags=["HTTP"])
+async def sink(
+    request: Request,
+    hash: SinkHash = Query(
+        SinkHash.none,
+        description="Digest to compute over the received body"
+    )
+) -> Dict[str, Any]:
+    """Consume a request body and report the ingest throughput.
+    
+    The body is read chunk by chunk from request.stream() and discarded, so
+    multi-GB uploads use constant memory. Multipart bodies are not parsed
+    and count as raw bytes.
+    
+    Args:
+        request: FastAPI request object providing the body stream
+        hash: Optional digest (md5, sha1, sha256) computed incrementally
+        
+    Returns:
+        Dictionary with bytes received, elapsed time, throughput and digest
+    """
+    digest = hashlib.new(hash.value) if hash != SinkHash.none else None
+    received = 0
+    chunks = 0
+    started = time.perf_counter()
+    async for chunk in request.stream():
+        received += len(chunk)
+        chunks += 1
+        if digest is not None:
+            digest.update(chunk)
+    elapsed = time.perf_counter() - started
+    
+    data: Dict[str, Any] = {
+        'bytes': received,
+        'chunks': chunks,
+        'elapsed_seconds': round(elapsed, 6),
+        'mb_per_second': round(received / elapsed / 1e6, 3) if elapsed > 0 else None,
+        'content_length': request.headers.get('content-length'),
+        'content_type': request.headers.get('content-type'),
+        'hash': hash.value,
+        'digest': digest.hexdigest() if digest is not None else None,
+    }
+    logger.info(f"Sink received {received} bytes in {elapsed:.3f}s")
+    return data
@@ -1,9 +1,12 @@
 import datetime
 import logging
+import threading
 from typing import List, Optional
 from pydantic import BaseModel, Field
 from fastapi import APIRouter, HTTPException, Query, Request, status
+from prometheus_client import Counter, Gauge
 
+from app.routes.app import registry
 from config import config
 
 logger = logging.getLogger(__name__)
@@ -25,21 +28,118 @@ class MongoDatabaseStatusResponse(BaseModel):
     exception: Optional[str] = None
 
 
+# Process-wide MongoClient shared by all requests (created lazily)
+_client = None
+_client_lock = threading.Lock()
+
+# Connection pool metrics exposed through the App metrics registry
+mongodb_pool_checked_out = Gauge(
+    'app_mongodb_pool_checked_out',
+    'MongoDB connections currently checked out of the pool',
+    registry=registry,
+    multiprocess_mode='livesum'
+)
+mongodb_pool_waiters = Gauge(
+    'app_mongodb_pool_waiters',
+    'Operations waiting to check out a MongoDB connection',
+    registry=registry,
+    multiprocess_mode='livesum'
+)
+mongodb_pool_connections_created = Counter(
+    'app_mongodb_pool_connections_created',
+    'MongoDB connections created by the pool',
+    registry=registry
+)
+
+
+def _create_pool_listener():
+    """Build a pymongo connection pool listener that updates the pool metrics."""
+    from pymongo import monitoring  # type: ignore
+
+    class PoolMetricsListener(monitoring.ConnectionPoolListener):
+        def pool_created(self, event):
+            pass
+
+        def pool_ready(self, event):
+            pass
+
+        def pool_cleared(self, event):
+            pass
+
+        def pool_closed(self, event):
+            pass
+
+        def connection_created(self, event):
+            mongodb_pool_connections_created.inc()
+
+        def connection_ready(self, event):
+            pass
+
+        def connection_closed(self, event):
+            pass
+
+        def connection_check_out_started(self, event):
+            mongodb_pool_waiters.inc()
+
+        def connection_check_out_failed(self, event):
+            mongodb_pool_waiters.dec()
+
+        def connection_checked_out(self, event):
+            mongodb_pool_waiters.dec()
+            mongodb_pool_checked_out.inc()
+
+        def connection_checked_in(self, event):
+            mongodb_pool_checked_out.dec()
+
+    return PoolMetricsListener()
+
+
 def _get_mongo_client():
-    try:
-        # Lazy import to avoid hard dependency in environments without pymongo
-        from pymongo import MongoClient  # type: ignore
-    except Exception as import_error:  # pragma: no cover
-        raise RuntimeError(
-            f"pymongo is required for /mongodb endpoint but is not installed: {import_error}"
-        )
+    """Return the process-wide MongoClient, creating it on first use.
+
+    The client owns a connection pool (sized via ``config.mongo_client_options``,
+    e.g. ``maxPoolSize``) and is reused across requests until
+    ``close_mongo_client()`` is called on application shutdown.
+    """
+    global _client
+    if _client is not None:
+        return _client
+
+    with _client_lock:
+        if _client is None:
+            try:
+                # Lazy import to avoid hard dependency in environments without pymongo
+                from pymongo import MongoClient  # type: ignore
+            except Exception as import_error:  # pragma: no cover
+                raise RuntimeError(
+                    f"pymongo is required for /mongodb endpoint but is not installed: {import_error}"
+                )
+
+            options = dict(config.mongo_client_options or {})
+            # Keep listeners supplied in the options next to the pool metrics listener
+            event_listeners = list(options.pop('event_listeners', None) or [])
+            event_listeners.append(_create_pool_listener())
+            _client = MongoClient(
+                config.mongo_uri,
+                serverSelectionTimeoutMS=config.mongo_server_selection_timeout_ms,
+                event_listeners=event_listeners,
+                **options
+            )
+            logger.info("MongoDB client created")
+    return _client
+
 
-    client = MongoClient(
-        config.mongo_uri,
-        serverSelectionTimeoutMS=config.mongo_server_selection_timeout_ms,
-        **(config.mongo_client_options or {})
-    )
-    return client
+def close_mongo_client() -> None:
+    """Close the process-wide MongoClient, if one was created."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            try:
+                _client.close()
+                logger.info("MongoDB client closed")
+            except Exception as e:
+                logger.warning(f"Error closing MongoDB client: {e}")
+            _client = None
 
 
 @router.get("/mongodb", response_model=MongoDatabaseStatusResponse, tags=["Database"])
@@ -55,7 +155,6 @@ def mongodb_status(
         "exception": None,
     }
 
-    client = None
     try:
         client = _get_mongo_client()
         db = client.get_database(config.mongo_db)
@@ -136,11 +235,3 @@ def mongodb_status(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Unexpected error interacting with MongoDB",
         )
-    finally:
-        try:
-            if client is not None:
-                client.close()
-        except Exception:
-            pass
-
-
@@ -0,0 +1,577 @@
+import os
+import mmap
+import time
+import random
+import logging
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+import psutil
+from fastapi import APIRouter, HTTPException, Query, status
+from app.routes.system import sampler
+from config import config
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Length of one busy/idle duty cycle of a CPU worker
+CPU_DUTY_CYCLE_SECONDS = 0.1
+
+# Memory is allocated and touched in blocks of this size
+MEMORY_BLOCK_SIZE = 1024 * 1024
+PAGE_SIZE = mmap.PAGESIZE
+
+# Set in each worker process by _init_cpu_worker
+_worker_stop_event = None
+
+
+def _init_cpu_worker(stop_event) -> None:
+    global _worker_stop_event
+    _worker_stop_event = stop_event
+
+
+def _burn_cpu(seconds: float, percent: int) -> float:
+    """Keep one core busy for percent of each duty cycle until the deadline.
+
+    Runs in a worker process so load scales past the GIL.
+
+    Returns:
+        CPU time in seconds consumed by the worker process
+    """
+    busy = CPU_DUTY_CYCLE_SECONDS * percent / 100
+    idle = CPU_DUTY_CYCLE_SECONDS - busy
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline and not _worker_stop_event.is_set():
+        cycle_start = time.monotonic()
+        while time.monotonic() - cycle_start < busy:
+            pass
+        if idle > 0:
+            _worker_stop_event.wait(idle)
+    return time.process_time()
+
+
+def _cpu_times() -> Tuple[float, float]:
+    """System-wide busy and total CPU seconds since boot, counted as psutil.cpu_percent() does."""
+    times = psutil.cpu_times()
+    # guest time is already included in user time on Linux
+    total = sum(times) - getattr(times, 'guest', 0.0) - getattr(times, 'guest_nice', 0.0)
+    idle = times.idle + getattr(times, 'iowait', 0.0)
+    return total - idle, total
+
+
+def _cpu_percent_between(start: Tuple[float, float], end: Tuple[float, float]) -> Optional[float]:
+    busy, total = end[0] - start[0], end[1] - start[1]
+    return round(busy / total * 100, 2) if total > 0 else None
+
+
+def max_cpu_cores() -> int:
+    """Number of cores a CPU stress job may use."""
+    return config.stress_max_cores or os.cpu_count() or 1
+
+
+class CpuStress:
+    """A cancellable CPU burn running one busy-loop worker process per core."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._futures: List[Future] = []
+        self._stop_event = None
+        self._job: Optional[Dict[str, Any]] = None
+        self._finish_lock = threading.Lock()
+        self._cpu_start: Tuple[float, float] = (0.0, 0.0)
+        self._cpu_end: Optional[Tuple[float, float]] = None
+
+    @property
+    def running(self) -> bool:
+        return any(not future.done() for future in self._futures)
+
+    def start(self, cores: int, seconds: float, percent: int) -> Dict[str, Any]:
+        """Start the workers and return immediately.
+
+        Raises:
+            RuntimeError: If a CPU stress job is already running.
+        """
+        with self._lock:
+            if self.running:
+                raise RuntimeError("A CPU stress job is already running")
+            self._shutdown_executor()
+            # Forking a process that runs threads (sampler, write buffer, watcher) is unsafe
+            context = multiprocessing.get_context("spawn")
+            self._stop_event = context.Event()
+            self._executor = ProcessPoolExecutor(
+                max_workers=cores,
+                mp_context=context,
+                initializer=_init_cpu_worker,
+                initargs=(self._stop_event,)
+            )
+            self._cpu_start = _cpu_times()
+            self._cpu_end = None
+            self._futures = [self._executor.submit(_burn_cpu, seconds, percent) for _ in range(cores)]
+            self._job = {
+                'cores': cores,
+                'seconds': seconds,
+                'percent': percent,
+                'started_at': time.time(),
+                'stopped_at': None,
+                'cancelled': False,
+            }
+            for future in self._futures:
+                future.add_done_callback(self._on_worker_done)
+            logger.info(f"CPU stress started: {cores} cores at {percent}% for {seconds}s")
+            return self.status()
+
+    def stop(self) -> Dict[str, Any]:
+        """Signal the workers to stop and wait for them to exit."""
+        with self._lock:
+            if self._job is not None and self.running:
+                self._stop_event.set()
+                self._job['cancelled'] = True
+                logger.info("CPU stress cancelled")
+            self._shutdown_executor()
+            return self.status()
+
+    def _on_worker_done(self, future: Future) -> None:
+        if not self.running:
+            self._finish()
+
+    def _finish(self) -> None:
+        """Freeze the end time and CPU counters of the job once every worker has exited."""
+        with self._finish_lock:
+            if self._job is not None and self._job['stopped_at'] is None:
+                self._job['stopped_at'] = time.time()
+                self._cpu_end = _cpu_times()
+
+    def _shutdown_executor(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def status(self) -> Dict[str, Any]:
+        """Describe the current or last job, including the utilisation achieved.
+
+        System CPU usage is measured from CPU time counters between the start
+        and the end of the job, so it covers jobs of any length and no longer
+        changes once the job has stopped.
+        """
+        if self._job is None:
+            return {'running': False}
+        job = self._job
+        running = self.running
+        if not running:
+            self._finish()
+        end = job['stopped_at'] or time.time()
+        elapsed = end - job['started_at']
+        data = dict(job, running=running, elapsed_seconds=round(elapsed, 3))
+        data['system_cpu_percent'] = _cpu_percent_between(self._cpu_start, self._cpu_end or _cpu_times())
+        if not running:
+            cpu_seconds = [future.result() for future in self._futures
+                           if not future.cancelled() and future.exception() is None]
+            data['worker_cpu_seconds'] = round(sum(cpu_seconds), 3)
+            data['worker_cpu_percent'] = round(sum(cpu_seconds) / elapsed / job['cores'] * 100, 2) if elapsed > 0 else None
+        return data
+
+
+class MemoryMethod(str, Enum):
+    """How /stress/memory allocates its blocks."""
+    bytearray = "bytearray"
+    mmap = "mmap"
+
+
+def _allocate_block(method: MemoryMethod, size: int):
+    """Allocate a block and write to every page so it counts towards RSS."""
+    if method == MemoryMethod.mmap:
+        block = mmap.mmap(-1, size)
+    else:
+        block = bytearray(size)
+    # Zeroed allocations are lazily mapped by the kernel until written to
+    block[::PAGE_SIZE] = b'\x01' * len(range(0, size, PAGE_SIZE))
+    return block
+
+
+class MemoryStress:
+    """Allocates and holds memory in a background thread until released."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._blocks: list = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._job: Optional[Dict[str, Any]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def allocated_bytes(self) -> int:
+        return sum(len(block) for block in list(self._blocks))
+
+    def start(self, mib: int, ramp: float, hold: float, method: MemoryMethod,
+              max_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """Start allocating and return immediately.
+
+        Args:
+            mib: Memory to allocate in MiB
+            ramp: Allocation rate in MiB per second (0 to allocate at once)
+            hold: Seconds to hold the memory once allocated (0 until released)
+            method: Allocation method
+            max_seconds: Release the memory this many seconds after the start
+                at the latest, whatever the hold
+
+        Raises:
+            RuntimeError: If a memory stress job is already running.
+        """
+        with self._lock:
+            if self.running:
+                raise RuntimeError("A memory stress job is already running")
+            self._stop.clear()
+            self._job = {
+                'mib': mib,
+                'ramp': ramp,
+                'hold': hold,
+                'max_seconds': max_seconds,
+                'method': method.value,
+                'started_at': time.time(),
+                'allocated_at': None,
+                'released_at': None,
+                'error': None,
+            }
+            self._thread = threading.Thread(
+                target=self._run, args=(mib * 1024 * 1024, ramp, hold, method, max_seconds),
+                name="memory-stress", daemon=True
+            )
+            self._thread.start()
+            logger.info(f"Memory stress started: {mib} MiB ({method.value}) at {ramp or 'max'} MiB/s, hold {hold or 'until released'}")
+            return self.status()
+
+    def stop(self) -> Dict[str, Any]:
+        """Release the memory, interrupting the ramp or hold."""
+        with self._lock:
+            self._stop.set()
+            if self._thread is not None:
+                self._thread.join()
+                self._thread = None
+            return self.status()
+
+    def _run(self, size: int, ramp: float, hold: float, method: MemoryMethod,
+             max_seconds: Optional[float]) -> None:
+        job = self._job
+        try:
+            started = time.monotonic()
+            allocated = 0
+            while allocated < size and not self._stop.is_set():
+                block_size = min(MEMORY_BLOCK_SIZE, size - allocated)
+                self._blocks.append(_allocate_block(method, block_size))
+                allocated += block_size
+                if ramp > 0:
+                    ahead = allocated / (ramp * 1024 * 1024) - (time.monotonic() - started)
+                    if ahead > 0:
+                        self._stop.wait(ahead)
+            if not self._stop.is_set():
+                job['allocated_at'] = time.time()
+                timeout = hold if hold > 0 else None
+                if max_seconds is not None:
+                    remaining = max(0.0, max_seconds - (time.monotonic() - started))
+                    timeout = remaining if timeout is None else min(timeout, remaining)
+                self._stop.wait(timeout)
+        except (MemoryError, OSError) as e:
+            job['error'] = str(e)
+            logger.error(f"Memory stress allocation failed: {e}")
+        finally:
+            self._release()
+            job['released_at'] = time.time()
+            logger.info("Memory stress released")
+
+    def _release(self) -> None:
+        blocks, self._blocks = self._blocks, []
+        for block in blocks:
+            if isinstance(block, mmap.mmap):
+                block.close()
+
+    def status(self) -> Dict[str, Any]:
+        """Describe the current or last job alongside process and system memory."""
+        data: Dict[str, Any] = {'running': self.running}
+        if self._job is not None:
+            data.update(self._job)
+        data['allocated_mib'] = round(self.allocated_bytes / 1024 / 1024, 2)
+        data['rss'] = psutil.Process().memory_info().rss
+        data['memory'] = sampler.latest()['memory']
+        return data
+
+
+class DiskPattern(str, Enum):
+    """Order in which /stress/disk visits the blocks of its test file."""
+    sequential = "sequential"
+    random = "random"
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    index = max(0, min(len(sorted_values) - 1, int(round(percent / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def _io_summary(latencies_ns: List[int], block_size: int, elapsed: float) -> Dict[str, Any]:
+    """Summarise the per-operation latencies of one benchmark phase."""
+    latencies_ms = sorted(latency / 1e6 for latency in latencies_ns)
+    total_bytes = len(latencies_ms) * block_size
+    return {
+        'operations': len(latencies_ms),
+        'bytes': total_bytes,
+        'elapsed_seconds': round(elapsed, 6),
+        'iops': round(len(latencies_ms) / elapsed, 2) if elapsed > 0 else None,
+        'mb_per_second': round(total_bytes / elapsed / 1e6, 3) if elapsed > 0 else None,
+        'latency_ms': {
+            'min': round(latencies_ms[0], 4),
+            'mean': round(sum(latencies_ms) / len(latencies_ms), 4),
+            'p50': round(_percentile(latencies_ms, 50), 4),
+            'p90': round(_percentile(latencies_ms, 90), 4),
+            'p99': round(_percentile(latencies_ms, 99), 4),
+            'max': round(latencies_ms[-1], 4),
+        }
+    }
+
+
+def run_disk_benchmark(directory: Path, size: int, block_size: int, pattern: DiskPattern,
+                       direct: bool = False, fsync: bool = False) -> Dict[str, Any]:
+    """Write then read back a test file block by block, timing every operation.
+
+    Args:
+        directory: Directory in which the test file is created (and removed)
+        size: Test file size in bytes, a multiple of block_size
+        block_size: Bytes per read or write
+        pattern: Visit blocks sequentially or in random order
+        direct: Open the file with O_DIRECT to bypass the page cache
+        fsync: fsync after every write
+
+    Returns:
+        Write and read results with IOPS, throughput and latency percentiles
+
+    Raises:
+        OSError: If the file cannot be created or the filesystem rejects O_DIRECT.
+    """
+    offsets = list(range(0, size, block_size))
+    flags = os.O_RDWR | os.O_CREAT | os.O_TRUNC
+    if direct:
+        flags |= os.O_DIRECT
+    # Page-aligned buffer, as required by O_DIRECT; random data defeats compression
+    buffer = mmap.mmap(-1, block_size)
+    buffer.write(os.urandom(block_size))
+    fd, path = tempfile.mkstemp(prefix=".app22-disk-", dir=directory)
+    os.close(fd)
+    try:
+        fd = os.open(path, flags)
+        try:
+            results = {}
+            for phase in ('write', 'read'):
+                if pattern == DiskPattern.random:
+                    random.shuffle(offsets)
+                latencies = []
+                started = time.perf_counter()
+                for offset in offsets:
+                    op_start = time.perf_counter_ns()
+                    if phase == 'write':
+                        os.pwrite(fd, buffer, offset)
+                        if fsync:
+                            os.fsync(fd)
+                    else:
+                        os.preadv(fd, [buffer], offset)
+                    latencies.append(time.perf_counter_ns() - op_start)
+                elapsed = time.perf_counter() - started
+                results[phase] = _io_summary(latencies, block_size, elapsed)
+                if phase == 'write':
+                    # Flush and drop the file from the page cache so reads hit the device
+                    os.fsync(fd)
+                    if hasattr(os, 'posix_fadvise'):
+                        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            return results
+        finally:
+            os.close(fd)
+    finally:
+        buffer.close()
+        os.unlink(path)
+
+
+cpu_stress = CpuStress()
+memory_stress = MemoryStress()
+_disk_lock = threading.Lock()
+
+
+def stop_stress() -> None:
+    """Stop any running stress job (called on application shutdown)."""
+    cpu_stress.stop()
+    memory_stress.stop()
+
+
+@router.get("/stress/cpu", tags=["Stress"])
+def stress_cpu(
+    cores: int = Query(1, description="Number of cores to load", ge=1),
+    seconds: float = Query(60, description="Duration of the load in seconds", gt=0),
+    percent: int = Query(100, description="Target utilisation of each core", ge=1, le=100)
+) -> Dict[str, Any]:
+    """Generate CPU load to exercise HPA and node autoscaling.
+    
+    One busy-loop worker process per core runs for the requested duration,
+    busy for the given percentage of each 100ms cycle. The request returns
+    immediately; use /stress/cpu/status to follow the job and
+    DELETE /stress/cpu to cancel it.
+    
+    Raises:
+        HTTPException: If the request exceeds the configured limits or a job
+            is already running.
+    """
+    limit = max_cpu_cores()
+    if cores > limit:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"cores must not exceed {limit} (APP22_STRESS_MAX_CORES)"
+        )
+    if seconds > config.stress_max_seconds:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"seconds must not exceed {config.stress_max_seconds} (APP22_STRESS_MAX_SECONDS)"
+        )
+    try:
+        return cpu_stress.start(cores, seconds, percent)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.get("/stress/cpu/status", tags=["Stress"])
+def stress_cpu_status() -> Dict[str, Any]:
+    """Get the state of the current or last CPU stress job."""
+    return cpu_stress.status()
+
+
+@router.delete("/stress/cpu", tags=["Stress"])
+def stress_cpu_cancel() -> Dict[str, Any]:
+    """Cancel the running CPU stress job."""
+    return cpu_stress.stop()
+
+
+@router.get("/stress/memory", tags=["Stress"])
+def stress_memory(
+    mib: int = Query(256, description="Memory to allocate in MiB", ge=1),
+    ramp: float = Query(0, description="Allocation rate in MiB per second (0 to allocate at once)", ge=0),
+    hold: float = Query(0, description="Seconds to hold the memory once allocated (0 until released or APP22_STRESS_MAX_SECONDS)", ge=0),
+    method: MemoryMethod = Query(MemoryMethod.bytearray, description="Allocate bytearrays or anonymous mmap regions")
+) -> Dict[str, Any]:
+    """Allocate and hold memory to test OOMKill, eviction and VPA.
+    
+    Every page is written to, so the process RSS grows by the requested
+    amount. The request returns immediately; use /stress/memory/status to
+    follow the job and DELETE /stress/memory to release the memory. The
+    ramp and the hold together never last longer than the configured
+    maximum, and the memory is released when it is reached.
+    
+    Raises:
+        HTTPException: If the request exceeds the configured limits or a job
+            is already running.
+    """
+    if config.stress_max_memory_mib and mib > config.stress_max_memory_mib:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"mib must not exceed {config.stress_max_memory_mib} (APP22_STRESS_MAX_MEMORY_MIB)"
+        )
+    ramp_seconds = mib / ramp if ramp > 0 else 0
+    if ramp_seconds + hold > config.stress_max_seconds:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"ramp time (mib / ramp) plus hold must not exceed {config.stress_max_seconds} (APP22_STRESS_MAX_SECONDS)"
+        )
+    try:
+        return memory_stress.start(mib, ramp, hold, method, config.stress_max_seconds)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.get("/stress/memory/status", tags=["Stress"])
+def stress_memory_status() -> Dict[str, Any]:
+    """Get the state of the current or last memory stress job and the process RSS."""
+    return memory_stress.status()
+
+
+@router.delete("/stress/memory", tags=["Stress"])
+def stress_memory_release() -> Dict[str, Any]:
+    """Release the memory held by the memory stress job."""
+    return memory_stress.stop()
+
+
+@router.get("/stress/disk", tags=["Stress"])
+def stress_disk(
+    directory: Optional[str] = Query(None, description="Directory to benchmark (defaults to APP22_STRESS_DISK_DIR)"),
+    size_mib: int = Query(64, description="Test file size in MiB", ge=1),
+    block_size: int = Query(4096, description="Bytes per read or write, a multiple of 512", ge=512, le=16 * 1024 * 1024),
+    pattern: DiskPattern = Query(DiskPattern.sequential, description="Access blocks sequentially or in random order"),
+    direct: bool = Query(False, description="Bypass the page cache with O_DIRECT"),
+    fsync: bool = Query(False, description="fsync after every write")
+) -> Dict[str, Any]:
+    """Benchmark a mounted volume by writing and reading back a test file.
+    
+    Returns IOPS, throughput and latency percentiles for the write and read
+    phases, to compare storage classes from inside the pod. Reads bypass the
+    page cache where the platform allows it. The test file is removed
+    afterwards.
+    
+    Raises:
+        HTTPException: If the request exceeds the configured limits, the
+            directory is missing, the filesystem rejects the options or a
+            benchmark is already running.
+    """
+    if config.stress_max_disk_mib and size_mib > config.stress_max_disk_mib:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"size_mib must not exceed {config.stress_max_disk_mib} (APP22_STRESS_MAX_DISK_MIB)"
+        )
+    if block_size % 512 != 0:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="block_size must be a multiple of 512"
+        )
+    size = size_mib * 1024 * 1024
+    if block_size > size:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="block_size must not exceed the test file size"
+        )
+    if direct and not hasattr(os, 'O_DIRECT'):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="O_DIRECT is not supported on this platform"
+        )
+    target = Path(directory or config.stress_disk_dir)
+    if not target.is_dir():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Directory not found: {target}"
+        )
+    
+    if not _disk_lock.acquire(blocking=False):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A disk benchmark is already running")
+    try:
+        logger.info(f"Disk benchmark started in {target}: {size_mib} MiB, {block_size} byte blocks, {pattern.value}")
+        results = run_disk_benchmark(target, size - size % block_size, block_size, pattern, direct, fsync)
+    except OSError as e:
+        logger.error(f"Disk benchmark failed in {target}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Disk benchmark failed: {e}"
+        )
+    finally:
+        _disk_lock.release()
+    
+    return {
+        'directory': str(target.resolve()),
+        'size_mib': size_mib,
+        'block_size': block_size,
+        'pattern': pattern.value,
+        'direct': direct,
+        'fsync': fsync,
+        **results
+    }
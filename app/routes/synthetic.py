@@ -0,0 +1,221 @@
+import math
+import time
+import random
+import asyncio
+import logging
+from enum import Enum
+from typing import Dict, Any, List, Optional, Tuple
+from pydantic import BaseModel, Field
+from fastapi import APIRouter, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from prometheus_client.core import GaugeMetricFamily
+from app.routes.app import register_collector, reject_in_multi_worker_mode
+from config import config
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+METRIC_NAME = "app_synthetic"
+
+# Label names, label values per series and values per series, replaced as a whole
+Series = Tuple[List[str], List[List[str]], List[float]]
+
+
+class SyntheticPattern(str, Enum):
+    """How synthetic series evolve over time."""
+    random_walk = "random_walk"
+    sine = "sine"
+    step = "step"
+
+
+class SyntheticSettings(BaseModel):
+    """Model for the synthetic series generator settings."""
+    series: int = Field(..., ge=0, description="Number of series (0 stops the generator)")
+    labels: int = Field(1, ge=1, le=30, description="Labels per series")
+    pattern: SyntheticPattern = Field(SyntheticPattern.random_walk, description="How values evolve")
+    interval: float = Field(1.0, ge=0.01, le=3600, description="Seconds between value updates")
+    period: float = Field(60.0, gt=0, description="Period in seconds of sine and step patterns")
+
+
+class SyntheticSeriesCollector:
+    """Collector exporting K generated series with M labels each as the
+    app_synthetic gauge, updated by a background task.
+
+    Values are kept in a plain list and rendered at scrape time, which is
+    much cheaper than maintaining K labelled Gauge children. Series are
+    built and advanced in the thread pool, off the event loop, and swapped
+    in as one tuple so a scrape never sees labels and values out of step.
+    """
+
+    def __init__(self):
+        self.settings = SyntheticSettings(series=0)
+        self._series: Series = ([], [], [])
+        self._task: Optional[asyncio.Task] = None
+        self._configure_lock = asyncio.Lock()
+        self.updated_at: Optional[float] = None
+
+    def describe(self):
+        # Nothing to check for collisions until series are configured
+        return []
+
+    def collect(self):
+        label_names, label_values, values = self._series
+        if not values:
+            return
+        family = GaugeMetricFamily(METRIC_NAME, "Synthetic series generated by App22", labels=label_names)
+        for labels, value in zip(label_values, values):
+            family.add_metric(labels, value)
+        yield family
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def values(self) -> List[float]:
+        return self._series[2]
+
+    @staticmethod
+    def _build(settings: SyntheticSettings, now: float) -> Series:
+        """Generate the labels of every series and their values at time now."""
+        label_names = [f"label_{j}" for j in range(settings.labels)]
+        # label_0 is unique per series; the others repeat with decreasing cardinality
+        label_values = [
+            [str(i)] + [f"v{i % (settings.series // (j + 1) or 1)}" for j in range(1, settings.labels)]
+            for i in range(settings.series)
+        ]
+        values = SyntheticSeriesCollector._advance(settings, [0.0] * settings.series, now)
+        return label_names, label_values, values
+
+    @staticmethod
+    def _advance(settings: SyntheticSettings, values: List[float], now: float) -> List[float]:
+        """New values of the series at time now."""
+        count = len(values)
+        if settings.pattern == SyntheticPattern.random_walk:
+            gauss = random.gauss
+            return [value + gauss(0, 1) for value in values]
+        if settings.pattern == SyntheticPattern.sine:
+            base = 2 * math.pi * now / settings.period
+            return [math.sin(base + 2 * math.pi * i / count) for i in range(count)]
+        position = 2 * now / settings.period
+        return [float(math.floor(position + i / count) % 2) for i in range(count)]
+
+    def _swap(self, series: Series, now: float) -> None:
+        self._series = series
+        self.updated_at = now
+
+    def update(self, now: float) -> None:
+        """Advance every series to time now."""
+        label_names, label_values, values = self._series
+        self._swap((label_names, label_values, self._advance(self.settings, values, now)), now)
+
+    async def configure(self, settings: SyntheticSettings) -> None:
+        """Replace the generated series and restart the update task."""
+        async with self._configure_lock:
+            await self.stop()
+            now = time.time()
+            series = await run_in_threadpool(self._build, settings, now)
+            self.settings = settings
+            self._swap(series, now)
+            if settings.series > 0:
+                self._task = asyncio.get_running_loop().create_task(self._run())
+                logger.info(f"Synthetic series generator started: {settings.series} series x {settings.labels} labels, "
+                            f"{settings.pattern.value} every {settings.interval}s")
+
+    async def stop(self) -> None:
+        """Cancel the update task."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        settings = self.settings
+        while True:
+            await asyncio.sleep(settings.interval)
+            try:
+                now = time.time()
+                label_names, label_values, values = self._series
+                values = await run_in_threadpool(self._advance, settings, values, now)
+                # Swapped on the event loop, so a cancelled update never replaces newer series
+                self._swap((label_names, label_values, values), now)
+            except Exception as e:
+                logger.error(f"Error updating synthetic series: {e}")
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "metric": METRIC_NAME,
+            "updated_at": self.updated_at,
+            **self.settings.model_dump(mode="json"),
+        }
+
+
+synthetic_series = SyntheticSeriesCollector()
+register_collector(synthetic_series)
+
+
+def _check_limit(settings: SyntheticSettings) -> None:
+    if config.synth_max_series and settings.series > config.synth_max_series:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"series must not exceed {config.synth_max_series} (APP22_SYNTH_MAX_SERIES)"
+        )
+
+
+async def start_synthetic() -> None:
+    """Start the generator with the series configured in Config, if any."""
+    if config.synth_series <= 0:
+        return
+    settings = SyntheticSettings(
+        series=min(config.synth_series, config.synth_max_series or config.synth_series),
+        labels=config.synth_labels,
+        pattern=config.synth_pattern,
+        interval=config.synth_interval,
+        period=config.synth_period
+    )
+    await synthetic_series.configure(settings)
+
+
+async def stop_synthetic() -> None:
+    """Stop the generator."""
+    await synthetic_series.stop()
+
+
+@router.get("/metrics/synthetic", tags=["App"])
+def synthetic_status() -> Dict[str, Any]:
+    """Get the synthetic series generator settings."""
+    return synthetic_series.status()
+
+
+@router.put("/metrics/synthetic", tags=["App"])
+async def synthetic_configure(settings: SyntheticSettings) -> Dict[str, Any]:
+    """Generate K series with M labels each as the app_synthetic gauge.
+    
+    Series evolve as random walks, sine waves or step functions, updated
+    every interval seconds, to test scrape duration, TSDB head series
+    limits and cardinality alerts. Replaces any previous configuration.
+    With several workers the generator can only be configured at startup
+    with APP22_SYNTH_*, so that every worker exports the same series.
+    
+    Raises:
+        HTTPException: If the number of series exceeds APP22_SYNTH_MAX_SERIES
+            or several workers are running.
+    """
+    reject_in_multi_worker_mode("The synthetic series generator")
+    _check_limit(settings)
+    await synthetic_series.configure(settings)
+    return synthetic_series.status()
+
+
+@router.delete("/metrics/synthetic", tags=["App"])
+async def synthetic_delete() -> Dict[str, Any]:
+    """Stop the generator and remove its series."""
+    reject_in_multi_worker_mode("The synthetic series generator")
+    await synthetic_series.configure(SyntheticSettings(series=0))
+    return synthetic_series.status()
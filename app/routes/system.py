@@ -1,57 +1,201 @@
 import os
-import sys
 import socket
 import time
+import asyncio
 import datetime
 import platform
 import psutil
 import logging
+from collections import deque
+from typing import Dict, Any, Optional, Tuple
 from fastapi import APIRouter
+from config import config
+
+logger = logging.getLogger(__name__)
 
-logging.basicConfig(format='%(asctime)s %(levelname)s: %(message)s',stream=sys.stdout, level=logging.INFO, datefmt='%Y/%m/%d %H:%M:%S')
 router = APIRouter()
 
+# Averaging windows (in seconds) exposed by /sys
+AVERAGE_WINDOWS = (1, 10, 60)
+
+# Static system information, computed once at startup
+_static_info: Optional[Dict[str, Any]] = None
+
+
+def load_static_info() -> Dict[str, Any]:
+    """Collect system information that does not change while the process runs."""
+    global _static_info
+    _static_info = {
+        "boot_time": psutil.boot_time(),
+        "platform": {
+            "system": platform.system(),
+            "node": platform.node(),
+            "release": platform.release(),
+            "version": platform.version(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "architecture": platform.architecture(),
+            "platform": platform.platform()
+        },
+        "physical_cores": psutil.cpu_count(logical=False),
+        "total_cores": psutil.cpu_count(logical=True),
+    }
+    return _static_info
+
+
+def get_static_info() -> Dict[str, Any]:
+    """Return cached static system information, loading it on first use."""
+    if _static_info is None:
+        return load_static_info()
+    return _static_info
+
+
+class SystemSampler:
+    """Background sampler keeping a rolling window of CPU, memory and frequency readings.
+
+    Readings are taken with non-blocking psutil calls every ``interval`` seconds
+    so that request handlers only read the latest snapshot.
+    """
+
+    def __init__(self, interval: float = 1.0, window: int = 60):
+        self.interval = interval
+        self.window = window
+        self._samples: deque = deque(maxlen=max(1, int(window / interval) + 1))
+        self._task: Optional[asyncio.Task] = None
+
+    def sample(self) -> Dict[str, Any]:
+        """Take a single reading and append it to the rolling window."""
+        freq = psutil.cpu_freq()
+        memory = psutil.virtual_memory()
+        snapshot = {
+            "timestamp": time.time(),
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "max_frequency": freq.max if freq else None,
+            "current_frequency": freq.current if freq else None,
+            "memory": {
+                "total": memory.total,
+                "available": memory.available,
+                "percent": memory.percent,
+                "used": memory.used,
+                "free": memory.free
+            }
+        }
+        self._samples.append(snapshot)
+        return snapshot
+
+    def latest(self) -> Dict[str, Any]:
+        """Return the most recent reading, sampling once if none exists yet."""
+        if not self._samples:
+            return self.sample()
+        return self._samples[-1]
+
+    def averages(self, windows: Tuple[int, ...] = AVERAGE_WINDOWS) -> Dict[str, Dict[str, Optional[float]]]:
+        """Average CPU usage, memory usage and frequency over the given windows (in seconds)."""
+        samples = list(self._samples)
+        now = time.time()
+        result = {}
+        for window in windows:
+            recent = [s for s in samples if s["timestamp"] >= now - window] or samples[-1:]
+            frequencies = [s["current_frequency"] for s in recent if s["current_frequency"] is not None]
+            result[f"{window}s"] = {
+                "cpu_percent": _mean([s["cpu_percent"] for s in recent]),
+                "memory_percent": _mean([s["memory"]["percent"] for s in recent]),
+                "current_frequency": _mean(frequencies),
+            }
+        return result
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the sampling task on the running event loop."""
+        if self.running:
+            return
+        # The first non-blocking cpu_percent() call only primes psutil's counters
+        psutil.cpu_percent(interval=None)
+        self._samples.clear()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info(f"System sampler started (interval={self.interval}s, window={self.window}s)")
+
+    async def stop(self) -> None:
+        """Cancel the sampling task and wait for it to finish."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.sample()
+            except Exception as e:
+                logger.error(f"Error sampling system metrics: {e}")
+
+
+def _mean(values) -> Optional[float]:
+    if not values:
+        return None
+    return round(sum(values) / len(values), 2)
+
+
+sampler = SystemSampler(
+    interval=config.sys_sample_interval,
+    window=config.sys_sample_window
+)
+
+
+async def start_sampler() -> None:
+    """Load static system information and start the background sampler."""
+    load_static_info()
+    sampler.start()
+
+
+async def stop_sampler() -> None:
+    """Stop the background sampler."""
+    await sampler.stop()
+
+
 @router.get("/sys", tags=["System"])
-def info():
-    """Get comprehensive system information."""
+async def info():
+    """Get comprehensive system information.
+
+    Dynamic values come from the latest background sample, so this endpoint
+    never blocks waiting for psutil measurements.
+    """
+    static = get_static_info()
+    snapshot = sampler.latest()
     data = {}
-    
+
     # Basic system info
     data["hostname"] = socket.gethostname()
     data["timedate"] = datetime.datetime.now()
-    data["uptime"] = time.time() - psutil.boot_time()
-    
+    data["uptime"] = time.time() - static["boot_time"]
+
     # Platform information
-    data["platform"] = {
-        "system": platform.system(),
-        "node": platform.node(),
-        "release": platform.release(),
-        "version": platform.version(),
-        "machine": platform.machine(),
-        "processor": platform.processor(),
-        "architecture": platform.architecture(),
-        "platform": platform.platform()
-    }
-    
+    data["platform"] = static["platform"]
+
     # CPU information
     data["cpu"] = {
-        "physical_cores": psutil.cpu_count(logical=False),
-        "total_cores": psutil.cpu_count(logical=True),
-        "max_frequency": psutil.cpu_freq().max if psutil.cpu_freq() else None,
-        "current_frequency": psutil.cpu_freq().current if psutil.cpu_freq() else None,
-        "cpu_usage_percent": psutil.cpu_percent(interval=1)
+        "physical_cores": static["physical_cores"],
+        "total_cores": static["total_cores"],
+        "max_frequency": snapshot["max_frequency"],
+        "current_frequency": snapshot["current_frequency"],
+        "cpu_usage_percent": snapshot["cpu_percent"]
     }
-    
+
     # Memory information
-    memory = psutil.virtual_memory()
-    data["memory"] = {
-        "total": memory.total,
-        "available": memory.available,
-        "percent": memory.percent,
-        "used": memory.used,
-        "free": memory.free
-    }
-    
+    data["memory"] = snapshot["memory"]
+
+    # Rolling averages
+    data["averages"] = sampler.averages()
+    data["sampled_at"] = snapshot["timestamp"]
+
     return data
 
 @router.get("/env", tags=["System"])
@@ -66,4 +210,4 @@ def env():
 @router.get("/crash", tags=["System"])
 def crash():
     """Simulate a system crash."""
-    os._exit(255) 
\ No newline at end of file
+    os._exit(255)
@@ -1,10 +1,12 @@
 import uuid
 import datetime
-from typing import List, Optional
-from pydantic import BaseModel
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import and_, or_, delete, insert, select, update
 from sqlalchemy.orm import Session
-from app.routes.database import get_db, Tasks
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.routes.database import get_db, get_async_db, Tasks
 
 # Pydantic models for request/response validation (moved from app/todo.py)
 class TaskCreate(BaseModel):
@@ -27,11 +29,80 @@ class TaskResponse(BaseModel):
     class Config:
         from_attributes = True
 
+# Maximum number of items accepted by a single bulk request
+BULK_MAX_ITEMS = 10000
+
+# Number of ids per IN (...) clause, below the bind parameter limits of all supported databases
+BULK_CHUNK_SIZE = 500
+
+class TaskBulkCreate(BaseModel):
+    tasks: List[TaskCreate] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: str
+
+class TaskBulkUpdate(BaseModel):
+    tasks: List[TaskBulkUpdateItem] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+class TaskBulkDelete(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+class TaskBulkItemResult(BaseModel):
+    id: str
+    status: str
+
+class TaskBulkResponse(BaseModel):
+    count: int
+    results: List[TaskBulkItemResult]
+
 # Todo business logic functions (moved from app/todo.py)
-def get_tasks_logic(db: Session, limit: int = 10):
-    tasks = db.query(Tasks).order_by(Tasks.updated_at.desc()).limit(limit).all()
+def encode_cursor(task: Tasks) -> str:
+    """Build the keyset pagination cursor pointing after the given task."""
+    return f"{task.updated_at.isoformat()},{task.id}"
+
+def decode_cursor(cursor: str) -> Tuple[datetime.datetime, str]:
+    """Parse a '<updated_at>,<id>' cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    updated_at, _, task_id = cursor.partition(",")
+    if not task_id:
+        raise ValueError("cursor must have the form '<updated_at>,<id>'")
+    return datetime.datetime.fromisoformat(updated_at), task_id
+
+def get_tasks_logic(db: Session, limit: int = 10, done: Optional[bool] = None,
+                    after: Optional[Tuple[datetime.datetime, str]] = None):
+    query = db.query(Tasks)
+    if done is not None:
+        query = query.filter(Tasks.done == done)
+    if after is not None:
+        updated_at, task_id = after
+        query = query.filter(or_(
+            Tasks.updated_at < updated_at,
+            and_(Tasks.updated_at == updated_at, Tasks.id < task_id)
+        ))
+    tasks = query.order_by(Tasks.updated_at.desc(), Tasks.id.desc()).limit(limit).all()
     return tasks
 
+def get_tasks_page_logic(db: Session, limit: int = 10, done: Optional[bool] = None,
+                         after: Optional[Tuple[datetime.datetime, str]] = None):
+    """Get one page of tasks and the cursor of the next page (None on the last page)."""
+    tasks = get_tasks_logic(db, limit + 1, done, after)
+    next_cursor = encode_cursor(tasks[limit - 1]) if len(tasks) > limit else None
+    return tasks[:limit], next_cursor
+
+def _parse_after(after: Optional[str]) -> Optional[Tuple[datetime.datetime, str]]:
+    if after is None:
+        return None
+    try:
+        return decode_cursor(after)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid cursor: {e}"
+        )
+
 def get_task_logic(db: Session, task_id: str):
     task = db.query(Tasks).filter(Tasks.id == task_id).first()
     return task
@@ -73,9 +144,65 @@ def remove_task_logic(db: Session, task_id: str):
     db.commit()
     return True
 
+def _chunks(items: Sequence, size: int = BULK_CHUNK_SIZE) -> Iterator[Sequence]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def _existing_task_ids(db: Session, task_ids: Sequence[str]) -> set:
+    existing = set()
+    for chunk in _chunks(list(set(task_ids))):
+        existing.update(db.execute(select(Tasks.id).where(Tasks.id.in_(chunk))).scalars())
+    return existing
+
+def bulk_add_tasks_logic(db: Session, tasks: List[TaskCreate]) -> List[Dict[str, str]]:
+    now = datetime.datetime.now()
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "title": task.title,
+            "description": task.description,
+            "done": task.done,
+            "updated_at": now
+        }
+        for task in tasks
+    ]
+    db.execute(insert(Tasks), rows)
+    db.commit()
+    return [{"id": row["id"], "status": "created"} for row in rows]
+
+def bulk_update_tasks_logic(db: Session, tasks: List[TaskBulkUpdateItem]) -> List[Dict[str, str]]:
+    existing = _existing_task_ids(db, [task.id for task in tasks])
+    now = datetime.datetime.now()
+    rows = [
+        {**task.model_dump(exclude_unset=True), "id": task.id, "updated_at": now}
+        for task in tasks
+        if task.id in existing
+    ]
+    if rows:
+        # ORM bulk UPDATE by primary key, grouped into executemany batches by column set
+        db.execute(update(Tasks), rows)
+    db.commit()
+    return [{"id": task.id, "status": "updated" if task.id in existing else "not_found"} for task in tasks]
+
+def bulk_remove_tasks_logic(db: Session, task_ids: List[str]) -> List[Dict[str, str]]:
+    existing = _existing_task_ids(db, task_ids)
+    for chunk in _chunks(list(existing)):
+        db.execute(
+            delete(Tasks).where(Tasks.id.in_(chunk)),
+            execution_options={"synchronize_session": False}
+        )
+    db.commit()
+    return [{"id": task_id, "status": "deleted" if task_id in existing else "not_found"} for task_id in task_ids]
+
+def _bulk_response(results: List[Dict[str, str]]) -> TaskBulkResponse:
+    return TaskBulkResponse(count=len(results), results=results)
+
 # Router for todo endpoints
 router = APIRouter()
 
+# Router serving the same endpoints from async handlers (APP22_DB_ASYNC)
+async_router = APIRouter()
+
 # Todo endpoints
 @router.post("/tasks", response_model=TaskResponse, status_code=201, tags=["ToDo"])
 def add_task(task: TaskCreate, db: Session = Depends(get_db)):
@@ -84,11 +211,37 @@ def add_task(task: TaskCreate, db: Session = Depends(get_db)):
 
 @router.get("/tasks", response_model=List[TaskResponse], tags=["ToDo"])
 def get_tasks(
-    limit: int = Query(10, description="Number of tasks to retrieve"),
+    response: Response,
+    limit: int = Query(10, ge=1, le=1000, description="Number of tasks to retrieve"),
+    done: Optional[bool] = Query(None, description="Only return tasks with this done status"),
+    after: Optional[str] = Query(None, description="Cursor '<updated_at>,<id>' from the X-Next-Cursor header of the previous page"),
     db: Session = Depends(get_db)
 ):
-    """Get list of tasks."""
-    return get_tasks_logic(db, limit)
+    """Get list of tasks, most recently updated first.
+    
+    When more tasks are available, the cursor of the next page is returned
+    in the X-Next-Cursor response header.
+    """
+    tasks, next_cursor = get_tasks_page_logic(db, limit, done, _parse_after(after))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return tasks
+
+# Bulk endpoints are registered before /tasks/{task_id} so "bulk" is not taken as an ID
+@router.post("/tasks/bulk", response_model=TaskBulkResponse, status_code=201, tags=["ToDo"])
+def bulk_add_tasks(body: TaskBulkCreate, db: Session = Depends(get_db)):
+    """Add many tasks in one transaction."""
+    return _bulk_response(bulk_add_tasks_logic(db, body.tasks))
+
+@router.patch("/tasks/bulk", response_model=TaskBulkResponse, tags=["ToDo"])
+def bulk_update_tasks(body: TaskBulkUpdate, db: Session = Depends(get_db)):
+    """Update many tasks by ID in one transaction."""
+    return _bulk_response(bulk_update_tasks_logic(db, body.tasks))
+
+@router.delete("/tasks/bulk", response_model=TaskBulkResponse, tags=["ToDo"])
+def bulk_remove_tasks(body: TaskBulkDelete, db: Session = Depends(get_db)):
+    """Remove many tasks by ID in one transaction."""
+    return _bulk_response(bulk_remove_tasks_logic(db, body.ids))
 
 @router.get("/tasks/{task_id}", response_model=TaskResponse, tags=["ToDo"])
 def get_task(task_id: str, db: Session = Depends(get_db)):
@@ -112,4 +265,63 @@ def remove_task(task_id: str, db: Session = Depends(get_db)):
     result = remove_task_logic(db, task_id)
     if result is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    return {"message": "Task deleted successfully"} 
\ No newline at end of file
+    return {"message": "Task deleted successfully"}
+
+# Async todo endpoints, sharing the business logic through AsyncSession.run_sync()
+@async_router.post("/tasks", response_model=TaskResponse, status_code=201, tags=["ToDo"])
+async def add_task_async(task: TaskCreate, db: AsyncSession = Depends(get_async_db)):
+    """Add new task."""
+    return await db.run_sync(add_task_logic, task)
+
+@async_router.get("/tasks", response_model=List[TaskResponse], tags=["ToDo"])
+async def get_tasks_async(
+    response: Response,
+    limit: int = Query(10, ge=1, le=1000, description="Number of tasks to retrieve"),
+    done: Optional[bool] = Query(None, description="Only return tasks with this done status"),
+    after: Optional[str] = Query(None, description="Cursor '<updated_at>,<id>' from the X-Next-Cursor header of the previous page"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get list of tasks, most recently updated first."""
+    tasks, next_cursor = await db.run_sync(get_tasks_page_logic, limit, done, _parse_after(after))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return tasks
+
+@async_router.post("/tasks/bulk", response_model=TaskBulkResponse, status_code=201, tags=["ToDo"])
+async def bulk_add_tasks_async(body: TaskBulkCreate, db: AsyncSession = Depends(get_async_db)):
+    """Add many tasks in one transaction."""
+    return _bulk_response(await db.run_sync(bulk_add_tasks_logic, body.tasks))
+
+@async_router.patch("/tasks/bulk", response_model=TaskBulkResponse, tags=["ToDo"])
+async def bulk_update_tasks_async(body: TaskBulkUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Update many tasks by ID in one transaction."""
+    return _bulk_response(await db.run_sync(bulk_update_tasks_logic, body.tasks))
+
+@async_router.delete("/tasks/bulk", response_model=TaskBulkResponse, tags=["ToDo"])
+async def bulk_remove_tasks_async(body: TaskBulkDelete, db: AsyncSession = Depends(get_async_db)):
+    """Remove many tasks by ID in one transaction."""
+    return _bulk_response(await db.run_sync(bulk_remove_tasks_logic, body.ids))
+
+@async_router.get("/tasks/{task_id}", response_model=TaskResponse, tags=["ToDo"])
+async def get_task_async(task_id: str, db: AsyncSession = Depends(get_async_db)):
+    """Get a specific task by ID."""
+    task = await db.run_sync(get_task_logic, task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
+
+@async_router.put("/tasks/{task_id}", response_model=TaskResponse, tags=["ToDo"])
+async def update_task_async(task_id: str, task: TaskUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Update a specific task by ID."""
+    updated_task = await db.run_sync(update_task_logic, task_id, task)
+    if updated_task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return updated_task
+
+@async_router.delete("/tasks/{task_id}", tags=["ToDo"])
+async def remove_task_async(task_id: str, db: AsyncSession = Depends(get_async_db)):
+    """Remove a specific task by ID."""
+    result = await db.run_sync(remove_task_logic, task_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return {"message": "Task deleted successfully"}
@@ -0,0 +1,254 @@
+import os
+import sys
+import time
+import asyncio
+import inspect
+import importlib
+import threading
+import contextlib
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from starlette.concurrency import run_in_threadpool
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
+
+# Taken when the app package starts importing; phases are reported relative to it
+IMPORT_STARTED = time.perf_counter()
+IMPORT_STARTED_WALL = time.time()
+
+# Modules whose presence in sys.modules /startup reports
+TRACKED_MODULES = ("sqlalchemy", "pymongo", "psycopg2", "mysql.connector", "oracledb", "psutil", "prometheus_client")
+
+
+def _process_started_at() -> Optional[float]:
+    """Wall-clock time the interpreter process started, when /proc makes it available."""
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the parenthesised command name; starttime is field 22
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/stat") as f:
+            btime = next(int(line.split()[1]) for line in f if line.startswith("btime"))
+        return btime + int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, StopIteration):
+        return None
+
+
+class StartupTimings:
+    """Durations of the phases between importing the app and serving its first request."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.phases: List[Dict[str, Any]] = []
+        self.ready_at: Optional[float] = None
+
+    def record(self, name: str, started: float, seconds: float) -> None:
+        """Record a phase; only its first occurrence in the process is kept."""
+        with self._lock:
+            if any(phase["name"] == name for phase in self.phases):
+                return
+            self.phases.append({
+                "name": name,
+                "offset_seconds": round(started - IMPORT_STARTED, 6),
+                "seconds": round(seconds, 6),
+            })
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a named phase."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started, time.perf_counter() - started)
+
+    def mark_ready(self) -> None:
+        """Note the moment the first app finished starting up."""
+        if self.ready_at is None:
+            self.ready_at = time.perf_counter()
+
+    def snapshot(self) -> Dict[str, Any]:
+        process_started = _process_started_at()
+        ready_seconds = None if self.ready_at is None else round(self.ready_at - IMPORT_STARTED, 6)
+        process_ready_seconds = None
+        if process_started is not None and self.ready_at is not None:
+            process_ready_seconds = round(IMPORT_STARTED_WALL - process_started + ready_seconds, 3)
+        with self._lock:
+            phases = list(self.phases)
+        return {
+            "import_to_ready_seconds": ready_seconds,
+            "process_to_ready_seconds": process_ready_seconds,
+            "phases": phases,
+            "modules": {name: name in sys.modules for name in TRACKED_MODULES},
+        }
+
+
+startup_timings = StartupTimings()
+
+
+def _resolve(spec: str) -> Any:
+    """Import a ``module:attribute`` reference."""
+    module, _, attribute = spec.partition(":")
+    return getattr(importlib.import_module(module), attribute)
+
+
+async def _call_hooks(hooks: Sequence[Callable[[], Any]]) -> None:
+    for hook in hooks:
+        result = hook()
+        if inspect.isawaitable(result):
+            await result
+
+
+class RouteGroup:
+    """The routers of one API area and the hooks run when they are mounted, started and stopped.
+
+    Routers and hooks are given as ``module:attribute`` strings so nothing is
+    imported until the group is loaded into an app. Lazy groups are loaded by
+    the first request under one of their path prefixes when fast startup is
+    enabled.
+    """
+
+    def __init__(self, name: str, routers: Sequence[str], prefixes: Sequence[str] = (),
+                 on_load: Sequence[str] = (), on_startup: Sequence[str] = (),
+                 on_shutdown: Sequence[str] = (), lazy: bool = False):
+        self.name = name
+        self.routers = tuple(routers)
+        self.prefixes = tuple(prefixes)
+        self.on_load = tuple(on_load)
+        self.on_startup = tuple(on_startup)
+        self.on_shutdown = tuple(on_shutdown)
+        self.lazy = lazy
+
+    def matches(self, path: str) -> bool:
+        return any(path == prefix or path.startswith(prefix + "/") for prefix in self.prefixes)
+
+    def resolve(self) -> Tuple[List[Any], List[Callable], List[Callable], List[Callable]]:
+        """Import the group's modules and look up its routers and hooks."""
+        with startup_timings.phase(f"import {self.name}"):
+            return ([_resolve(spec) for spec in self.routers],
+                    [_resolve(spec) for spec in self.on_load],
+                    [_resolve(spec) for spec in self.on_startup],
+                    [_resolve(spec) for spec in self.on_shutdown])
+
+
+class LoadedGroup:
+    """A route group mounted in one app."""
+
+    def __init__(self, group: RouteGroup, on_startup: List[Callable], on_shutdown: List[Callable],
+                 load_seconds: float):
+        self.group = group
+        self.on_startup = on_startup
+        self.on_shutdown = on_shutdown
+        self.load_seconds = load_seconds
+
+
+def load_group(app, group: RouteGroup, resolved=None) -> LoadedGroup:
+    """Include a group's routers in an app and run its load hooks."""
+    started = time.perf_counter()
+    routers, on_load, on_startup, on_shutdown = resolved or group.resolve()
+    for router in routers:
+        app.include_router(router)
+    for spec, hook in zip(group.on_load, on_load):
+        # Groups sharing a load hook (database and todo create the same tables) run it once per app
+        if spec in app.state.load_hooks_run:
+            continue
+        app.state.load_hooks_run.add(spec)
+        try:
+            hook()
+        except Exception as e:
+            print(f"{group.name.capitalize()} initialization error: {e}")
+    # Routes changed, so the OpenAPI schema has to be rebuilt
+    app.openapi_schema = None
+    seconds = time.perf_counter() - started
+    startup_timings.record(f"load {group.name}", started, seconds)
+    loaded = LoadedGroup(group, on_startup, on_shutdown, seconds)
+    app.state.route_groups[group.name] = loaded
+    return loaded
+
+
+async def start_groups(app) -> None:
+    """Run the startup hooks of every group loaded so far."""
+    for loaded in list(app.state.route_groups.values()):
+        with startup_timings.phase(f"start {loaded.group.name}"):
+            await _call_hooks(loaded.on_startup)
+    app.state.started = True
+
+
+async def stop_groups(app) -> None:
+    """Run the shutdown hooks of every loaded group, last loaded first."""
+    app.state.started = False
+    for loaded in reversed(list(app.state.route_groups.values())):
+        await _call_hooks(loaded.on_shutdown)
+
+
+class LazyGroupRoute(BaseRoute):
+    """Placeholder route that loads a lazy group on the first request under its prefixes.
+
+    Once the group is loaded the placeholder stops matching and the request is
+    dispatched again to the routes the group just registered. Requests for
+    ``schema_path`` load the group too, so the OpenAPI schema lists every route.
+    """
+
+    def __init__(self, group: RouteGroup, schema_path: Optional[str] = None):
+        self.group = group
+        self.schema_path = schema_path
+        self.loaded = False
+        self._lock = asyncio.Lock()
+
+    def matches(self, scope: Scope) -> Tuple[Match, Scope]:
+        if self.loaded or scope["type"] not in ("http", "websocket"):
+            return Match.NONE, {}
+        if self.group.matches(scope["path"]) or scope["path"] == self.schema_path:
+            return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name: str, **path_params: Any):
+        raise NoMatchFound(name, path_params)
+
+    async def load(self, app) -> None:
+        async with self._lock:
+            if self.loaded:
+                return
+            # Module imports are slow and blocking, so they run off the event loop
+            resolved = await run_in_threadpool(self.group.resolve)
+            loaded = load_group(app, self.group, resolved)
+            if getattr(app.state, "started", False):
+                with startup_timings.phase(f"start {self.group.name}"):
+                    await _call_hooks(loaded.on_startup)
+            self.loaded = True
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        app = scope["app"]
+        await self.load(app)
+        await app.router(scope, receive, send)
+
+
+def select_groups(groups: Sequence[RouteGroup], names: Optional[Sequence[str]]) -> List[RouteGroup]:
+    """The groups named in an allowlist, or every group when there is no allowlist."""
+    if names is None:
+        return list(groups)
+    known = {group.name for group in groups}
+    unknown = sorted(set(names) - known)
+    if unknown:
+        raise ValueError(f"Unknown route groups {', '.join(unknown)}; expected any of {', '.join(sorted(known))}")
+    return [group for group in groups if group.name in names]
+
+
+def mount_groups(app, groups: Sequence[RouteGroup], lazy: bool,
+                 enabled: Optional[Sequence[str]] = None) -> None:
+    """Load the enabled groups into an app, deferring lazy groups to their first request when ``lazy`` is set.
+
+    Groups left out of ``enabled`` are never imported and register no routes.
+    """
+    selected = select_groups(groups, enabled)
+    app.state.route_groups = {}
+    app.state.disabled_groups = [group.name for group in groups if group not in selected]
+    app.state.load_hooks_run = set()
+    app.state.started = False
+    placeholders = 0
+    for group in selected:
+        if lazy and group.lazy:
+            # Ahead of FastAPI's own routes so the schema route cannot answer first
+            app.router.routes.insert(placeholders, LazyGroupRoute(group, app.openapi_url))
+            placeholders += 1
+        else:
+            load_group(app, group)
+
@@ -0,0 +1,126 @@
+"""Side-by-side benchmark of the sync and async (APP22_DB_ASYNC) database paths.
+
+Starts one App22 server per mode on its own temporary SQLite database and
+drives /sql and /tasks with concurrent requests.
+
+Usage:
+    python benchmarks/database.py --requests 2000 --concurrency 64
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, List
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = [
+    ("GET /sql", "GET", "/sql?limit=5", None),
+    ("POST /tasks", "POST", "/tasks", {"title": "bench", "description": "benchmark task"}),
+    ("GET /tasks", "GET", "/tasks?limit=10", None),
+]
+
+
+def start_server(port: int, db_path: str, async_mode: bool) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        APP22_PORT=str(port),
+        APP22_HOST="127.0.0.1",
+        APP22_DEBUG="0",
+        APP22_DB_URL=f"sqlite:///{db_path}",
+        APP22_DB_ASYNC="1" if async_mode else "0",
+    )
+    return subprocess.Popen(
+        [sys.executable, "run.py"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_ready(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/version")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start within {timeout}s")
+
+
+async def run_scenario(base_url: str, method: str, path: str, body, requests: int, concurrency: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(None)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def worker():
+            nonlocal errors
+            while not queue.empty():
+                queue.get_nowait()
+                start = time.perf_counter()
+                response = await client.request(method, path, json=body)
+                latencies.append(time.perf_counter() - start)
+                if response.status_code >= 400:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "errors": errors,
+    }
+
+
+async def benchmark(args) -> None:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for index, (mode, async_mode) in enumerate([("sync", False), ("async", True)]):
+            port = args.port + index
+            server = start_server(port, os.path.join(tmp, f"{mode}.db"), async_mode)
+            try:
+                base_url = f"http://127.0.0.1:{port}"
+                await wait_ready(base_url)
+                for name, method, path, body in SCENARIOS:
+                    results[(name, mode)] = await run_scenario(
+                        base_url, method, path, body, args.requests, args.concurrency
+                    )
+            finally:
+                server.terminate()
+                server.wait()
+
+    print(f"{args.requests} requests per scenario, concurrency {args.concurrency}")
+    print(f"{'scenario':<14}{'mode':<7}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for name, _, _, _ in SCENARIOS:
+        for mode in ("sync", "async"):
+            r = results[(name, mode)]
+            print(f"{name:<14}{mode:<7}{r['rps']:>10.1f}{r['p50_ms']:>10.2f}{r['p99_ms']:>10.2f}{r['errors']:>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent client connections")
+    parser.add_argument("--port", type=int, default=5100, help="First port to bind the servers to")
+    asyncio.run(benchmark(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
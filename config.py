@@ -1,7 +1,8 @@
-from pydantic import Field, field_validator
+from pydantic import Field, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Literal
 import os
+import tempfile
 import warnings
 from ast import literal_eval
 
@@ -40,6 +41,92 @@ class Config(BaseSettings):
         description="Enable debug mode"
     )
     
+    fast_startup: bool = Field(
+        default=False,
+        description="Import the System, Database, ToDo, MongoDB and Stress routes on their first request instead of at startup"
+    )
+    
+    route_groups: str = Field(
+        default="all",
+        description="Comma-separated route groups to mount (system, app, synthetic, http, filesystem, database, todo, mongodb, stress) or all"
+    )
+    
+    request_metrics: bool = Field(
+        default=True,
+        description="Record per-route request count, latency and response size metrics"
+    )
+    
+    metrics_cache_ttl: float = Field(
+        default=0,
+        ge=0,
+        description="Seconds a rendered /metrics exposition is reused between scrapes (0 disables caching)"
+    )
+    
+    metrics_max_series: int = Field(
+        default=1000,
+        ge=0,
+        description="Maximum label values per /metrics/counter, gauge and histogram metric (0 for no limit)"
+    )
+    
+    synth_series: int = Field(
+        default=0,
+        ge=0,
+        description="Number of synthetic app_synthetic series generated at startup (0 disables the generator)"
+    )
+    
+    synth_labels: int = Field(
+        default=1,
+        ge=1,
+        le=30,
+        description="Labels per synthetic series"
+    )
+    
+    synth_pattern: Literal["random_walk", "sine", "step"] = Field(
+        default="random_walk",
+        description="How synthetic series evolve"
+    )
+    
+    synth_interval: float = Field(
+        default=1.0,
+        ge=0.01,
+        description="Seconds between synthetic series updates"
+    )
+    
+    synth_period: float = Field(
+        default=60.0,
+        gt=0,
+        description="Period in seconds of the sine and step synthetic patterns"
+    )
+    
+    synth_max_series: int = Field(
+        default=100000,
+        ge=0,
+        description="Maximum number of synthetic series (0 for no limit)"
+    )
+    
+    # Logging Settings
+    log_format: Literal["text", "json"] = Field(
+        default="text",
+        description="Log line format; json writes one object per line, including uvicorn access logs"
+    )
+    
+    log_async: bool = Field(
+        default=False,
+        description="Queue log records and write them from a background thread"
+    )
+    
+    log_queue_size: int = Field(
+        default=10000,
+        ge=1,
+        description="Maximum number of log records waiting to be written"
+    )
+    
+    log_block_ms: int = Field(
+        default=0,
+        ge=0,
+        description="Time in milliseconds to wait for room in a full log queue before dropping the record"
+    )
+    
     # Database Settings
     db_url: str = Field(
         default="sqlite:///app22.db",
@@ -56,6 +143,40 @@ class Config(BaseSettings):
         description="Additional SQLAlchemy engine options"
     )
     
+    db_async: bool = Field(
+        default=False,
+        description="Serve /sql and /tasks from an async SQLAlchemy engine"
+    )
+    
+    db_write_behind: bool = Field(
+        default=False,
+        description="Queue /sql request records in memory and write them in batches"
+    )
+    
+    db_write_behind_batch_size: int = Field(
+        default=500,
+        ge=1,
+        description="Maximum number of request records written per batch"
+    )
+    
+    db_write_behind_flush_ms: int = Field(
+        default=100,
+        ge=1,
+        description="Maximum time in milliseconds a request record waits before being flushed"
+    )
+    
+    db_write_behind_max_queue: int = Field(
+        default=10000,
+        ge=1,
+        description="Maximum number of request records held in the write-behind buffer"
+    )
+    
+    db_write_behind_block_ms: int = Field(
+        default=0,
+        ge=0,
+        description="Time in milliseconds to wait for room in a full buffer before dropping the record"
+    )
+    
     # Server Settings
     host: str = Field(
         default="0.0.0.0",
@@ -66,7 +187,87 @@ class Config(BaseSettings):
         default=5000,
         description="Server port"
     )
-    
+
+    workers: int = Field(
+        default=1,
+        ge=1,
+        description="Number of uvicorn worker processes (metrics and health state are shared when above 1)"
+    )
+
+    multiproc_dir: Optional[str] = Field(
+        default=None,
+        description="Directory for metrics and state shared by workers (a temporary directory if unset)"
+    )
+
+    # System sampler settings
+    sys_sample_interval: float = Field(
+        default=1.0,
+        gt=0,
+        description="Interval in seconds between background system samples"
+    )
+
+    sys_sample_window: int = Field(
+        default=60,
+        ge=1,
+        description="Seconds of system samples kept for rolling averages"
+    )
+
+    # Filesystem settings
+    fs_cache_max_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        ge=0,
+        description="Byte budget of the /cat and /files checksum cache (0 disables it)"
+    )
+
+    fs_watch: Literal["off", "auto", "inotify", "poll"] = Field(
+        default="off",
+        description="Keep an in-memory index of data/ for /files (auto uses inotify and falls back to polling)"
+    )
+
+    fs_watch_interval: float = Field(
+        default=2.0,
+        gt=0,
+        description="Rescan interval in seconds when the data/ index is polling"
+    )
+
+    # Stress settings
+    stress_max_cores: int = Field(
+        default=0,
+        ge=0,
+        description="Maximum cores a /stress/cpu job may load (0 for all available cores)"
+    )
+
+    stress_max_seconds: float = Field(
+        default=600,
+        gt=0,
+        description="Maximum duration in seconds of a stress job"
+    )
+
+    stress_max_memory_mib: int = Field(
+        default=4096,
+        ge=0,
+        description="Maximum MiB a /stress/memory job may allocate (0 for no limit)"
+    )
+
+    stress_disk_dir: str = Field(
+        default_factory=tempfile.gettempdir,
+        description="Default directory benchmarked by /stress/disk"
+    )
+
+    stress_max_disk_mib: int = Field(
+        default=1024,
+        ge=0,
+        description="Maximum test file size in MiB for /stress/disk (0 for no limit)"
+    )
+
+    @property
+    def enabled_route_groups(self) -> Optional[List[str]]:
+        """Route groups named in route_groups, or None when every group is enabled."""
+        names = [name.strip().lower() for name in self.route_groups.split(',') if name.strip()]
+        if not names or 'all' in names:
+            return None
+        return names
+
     # Computed properties for backward compatibility
     @property
     def VERSION(self) -> Optional[str]:
@@ -146,13 +347,20 @@ class Config(BaseSettings):
                 raise ValueError(f"Port must be a valid integer, got: {v}")
         return v
     
-    @field_validator('debug', mode='before')
+    @field_validator('debug', 'fast_startup', 'log_async', 'db_async', 'db_write_behind', 'request_metrics', mode='before')
     @classmethod
     def parse_debug(cls, v):
-        """Parse debug flag from various formats."""
+        """Parse debug and other boolean flags from various formats."""
         if isinstance(v, str):
             return v.lower() in ('1', 'true', 'yes', 'on')
         return bool(v)
+    
+    @model_validator(mode='after')
+    def check_synthetic_pattern(self):
+        """Refuse random walks with several workers, which would each export a different walk."""
+        if self.workers > 1 and self.synth_series > 0 and self.synth_pattern == "random_walk":
+            raise ValueError("synth_pattern random_walk needs a single worker; use sine or step with APP22_WORKERS above 1")
+        return self
 
 
 # Global configuration instance
@@ -1,11 +1,33 @@
-from app import create_app
+import os
+import glob
+import tempfile
 from config import config
 import uvicorn
 
-app = create_app()
+# Must be set before prometheus_client is imported by the workers
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+
+def prepare_multiprocess_dir() -> str:
+    """Create the directory shared by the workers and clear files left by a previous run."""
+    path = config.multiproc_dir or tempfile.mkdtemp(prefix="app22-")
+    os.makedirs(path, exist_ok=True)
+    for filename in glob.glob(os.path.join(path, "*.db")) + glob.glob(os.path.join(path, "app22_*.state")):
+        os.remove(filename)
+    os.environ[MULTIPROC_DIR_ENV] = path
+    return path
+
 
 if __name__ == '__main__':
     if config.debug:
         uvicorn.run("run:app", host=config.host, port=config.port, reload=True)
+    elif config.workers > 1:
+        prepare_multiprocess_dir()
+        uvicorn.run("app:create_app", factory=True, host=config.host, port=config.port, workers=config.workers)
     else:
-        uvicorn.run(app, host=config.host, port=config.port)
\ No newline at end of file
+        from app import create_app
+        uvicorn.run(create_app(), host=config.host, port=config.port)
+elif __name__ != '__mp_main__':
+    # Imported by uvicorn in reload mode (but not by spawned /stress/cpu workers)
+    from app import create_app
+    app = create_app()
@@ -1,11 +1,16 @@
 import os
 import tempfile
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from app import create_app
-from app.routes.database import get_db, Base
+from app.routes.database import get_db, get_async_db, get_async_database_uri, Base
+from app.routes.database import async_router as database_async_router
+from app.routes.todo import async_router as todo_async_router
 from config import Config
 
 
@@ -48,6 +53,31 @@ def test_client(test_db):
         yield client
 
 
+@pytest.fixture
+def async_test_client(test_db):
+    """Create a test client serving /sql and /tasks from the async handlers."""
+    TestSessionLocal, test_engine = test_db
+    
+    # NullPool keeps connections from outliving the TestClient event loop
+    async_engine = create_async_engine(
+        get_async_database_uri(str(test_engine.url)),
+        poolclass=NullPool
+    )
+    AsyncTestSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    
+    async def override_get_async_db():
+        async with AsyncTestSessionLocal() as db:
+            yield db
+    
+    app = FastAPI()
+    app.include_router(database_async_router)
+    app.include_router(todo_async_router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    
+    with TestClient(app) as client:
+        yield client
+
+
 @pytest.fixture
 def test_config():
     """Create test configuration."""
@@ -1,4 +1,13 @@
+import gzip
+import json
+import asyncio
+import pytest
+from unittest.mock import patch
 from fastapi import status
+from app.routes import app as app_routes
+from app.routes.app import registry, MetricsCache, MAX_NDJSON_LINE_BYTES, OVERFLOW_LABEL, accepts_gzip
+from app.middleware import RequestMetricsMiddleware, OTHER_METHOD, UNMATCHED_ROUTE
+from app.multiprocess import MULTIPROC_DIR_ENV
 
 
 class TestAppMetrics:
@@ -34,3 +43,260 @@ class TestAppMetrics:
         assert 'app_histogram_count{name="latency"}' in m
 
 
+def _sample(sample_name, **labels):
+    return registry.get_sample_value(sample_name, labels) or 0.0
+
+
+class TestRequestMetricsMiddleware:
+    def test_requests_labelled_by_route_template(self, test_client):
+        before = _sample('app_http_requests_total', method='GET', route='/tasks/{task_id}', status='404')
+        test_client.get('/tasks/12345')
+        test_client.get('/tasks/67890')
+        after = _sample('app_http_requests_total', method='GET', route='/tasks/{task_id}', status='404')
+        assert after == before + 2
+        # Raw paths never become label values
+        assert '/tasks/12345' not in test_client.get('/metrics').text
+
+    def test_latency_and_size_recorded(self, test_client):
+        count = _sample('app_http_request_duration_seconds_count', method='GET', route='/payload')
+        size = _sample('app_http_response_size_bytes_sum', method='GET', route='/payload')
+        test_client.get('/payload?size=5000')
+        assert _sample('app_http_request_duration_seconds_count', method='GET', route='/payload') == count + 1
+        assert _sample('app_http_response_size_bytes_sum', method='GET', route='/payload') == size + 5000
+
+    @pytest.mark.parametrize('message, expected', [
+        ({'count': 100, 'offset': 10}, 100),
+        ({'offset': 1000}, 3096),
+        ({}, 4096),
+    ])
+    def test_zerocopy_response_size(self, tmp_path, message, expected):
+        path = tmp_path / 'blob.bin'
+        path.write_bytes(bytes(4096))
+
+        async def app(scope, receive, send):
+            await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+            with open(path, 'rb') as file:
+                await send({'type': 'http.response.zerocopysend', 'file': file, **message})
+
+        async def send(message):
+            pass
+
+        async def run():
+            middleware = RequestMetricsMiddleware(app)
+            await middleware({'type': 'http', 'method': 'GET', 'path': '/zerocopy', 'endpoint': app}, None, send)
+
+        size = _sample('app_http_response_size_bytes_sum', method='GET', route='/zerocopy')
+        asyncio.run(run())
+        assert _sample('app_http_response_size_bytes_sum', method='GET', route='/zerocopy') == size + expected
+
+    def test_unmatched_route(self, test_client):
+        before = _sample('app_http_requests_total', method='GET', route=UNMATCHED_ROUTE, status='404')
+        test_client.get('/no/such/path')
+        assert _sample('app_http_requests_total', method='GET', route=UNMATCHED_ROUTE, status='404') == before + 1
+
+    def test_nonstandard_methods_labelled_other(self, test_client):
+        before = _sample('app_http_requests_total', method=OTHER_METHOD, route=UNMATCHED_ROUTE, status='404')
+        for method in ('FOO', 'BAR'):
+            test_client.request(method, '/no/such/path')
+        assert _sample('app_http_requests_total', method=OTHER_METHOD, route=UNMATCHED_ROUTE, status='404') == before + 2
+        assert 'method="FOO"' not in test_client.get('/metrics').text
+
+    def test_in_progress_and_errors(self):
+        seen = {}
+
+        async def failing_app(scope, receive, send):
+            seen['in_progress'] = _sample('app_http_requests_in_progress', method='PUT')
+            raise RuntimeError("boom")
+
+        async def run():
+            middleware = RequestMetricsMiddleware(failing_app)
+            scope = {'type': 'http', 'method': 'PUT', 'path': '/x'}
+            try:
+                await middleware(scope, None, None)
+            except RuntimeError:
+                pass
+
+        before = _sample('app_http_requests_total', method='PUT', route=UNMATCHED_ROUTE, status='500')
+        base = _sample('app_http_requests_in_progress', method='PUT')
+        asyncio.run(run())
+        assert seen['in_progress'] == base + 1
+        assert _sample('app_http_requests_in_progress', method='PUT') == base
+        assert _sample('app_http_requests_total', method='PUT', route=UNMATCHED_ROUTE, status='500') == before + 1
+
+
+class TestMetricsExposition:
+    def test_openmetrics_negotiation(self, test_client):
+        resp = test_client.get('/metrics', headers={'Accept': 'application/openmetrics-text; version=1.0.0'})
+        assert resp.headers['content-type'].startswith('application/openmetrics-text')
+        assert resp.text.endswith('# EOF\n')
+
+    def test_gzip_negotiation(self, test_client):
+        resp = test_client.get('/metrics', headers={'Accept-Encoding': 'gzip'})
+        assert resp.headers['content-encoding'] == 'gzip'
+        assert 'app_counter' in resp.text  # decompressed transparently by the client
+        plain = test_client.get('/metrics', headers={'Accept-Encoding': 'identity'})
+        assert 'content-encoding' not in plain.headers
+        refused = test_client.get('/metrics', headers={'Accept-Encoding': 'gzip;q=0, identity'})
+        assert 'content-encoding' not in refused.headers
+
+    @pytest.mark.parametrize('header, expected', [
+        ('gzip', True),
+        ('br, GZIP;q=0.5', True),
+        ('gzip;q=0', False),
+        ('gzip; q=0.000, deflate', False),
+        ('*', True),
+        ('*;q=0', False),
+        ('gzip;q=0, *', False),
+        ('identity', False),
+        ('', False),
+    ])
+    def test_accepts_gzip(self, header, expected):
+        assert accepts_gzip(header) is expected
+
+    def test_cache_reuses_rendering(self):
+        cache = MetricsCache(ttl=60)
+        calls = []
+        render = lambda: calls.append(1) or b'rendered'
+        assert cache.get(('text/plain', False), render) == b'rendered'
+        assert cache.get(('text/plain', False), render) == b'rendered'
+        assert len(calls) == 1
+        cache.get(('text/plain', True), render)
+        assert len(calls) == 2
+
+    def test_cache_expires(self):
+        cache = MetricsCache(ttl=60)
+        calls = []
+        render = lambda: calls.append(1) or b'rendered'
+        with patch('app.routes.app.time.monotonic', side_effect=[0, 30, 61]):
+            cache.get(('text/plain', False), render)
+            cache.get(('text/plain', False), render)
+            cache.get(('text/plain', False), render)
+        assert len(calls) == 2
+
+    def test_cache_disabled(self):
+        cache = MetricsCache(ttl=0)
+        calls = []
+        cache.get(('text/plain', False), lambda: calls.append(1) or b'')
+        cache.get(('text/plain', False), lambda: calls.append(1) or b'')
+        assert len(calls) == 2
+
+    def test_series_cap_overflow(self, test_client, monkeypatch):
+        monkeypatch.setattr(app_routes.config, 'metrics_max_series', 2)
+        monkeypatch.setattr(app_routes, '_series_names', {})
+        before = _sample('app_metrics_series_overflow_total', metric='app_counter')
+        for name in ('cap_a', 'cap_b', 'cap_c', 'cap_d', 'cap_a'):
+            assert test_client.post(f'/metrics/counter?name={name}').status_code == 200
+        m = test_client.get('/metrics').text
+        assert 'app_counter_total{name="cap_c"}' not in m
+        assert _sample('app_counter_total', name='cap_a') >= 2
+        assert _sample('app_metrics_series_overflow_total', metric='app_counter') == before + 2
+        assert f'app_counter_total{{name="{OVERFLOW_LABEL}"}}' in m
+
+
+class TestMetricsBatch:
+    def test_batch_json_array(self, test_client):
+        counter = _sample('app_counter_total', name='batch_reqs')
+        ops = [
+            {'type': 'counter', 'name': 'batch_reqs', 'inc': 2},
+            {'type': 'counter', 'name': 'batch_reqs'},
+            {'type': 'gauge', 'name': 'batch_load', 'set_value': 5},
+            {'type': 'gauge', 'name': 'batch_load', 'inc': 2, 'dec': 1},
+            {'type': 'histogram', 'name': 'batch_latency', 'observe': 0.5},
+        ]
+        resp = test_client.post('/metrics/batch', json=ops)
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.json() == {'ok': True, 'applied': 5, 'failed': 0, 'errors': []}
+        assert _sample('app_counter_total', name='batch_reqs') == counter + 3
+        assert _sample('app_gauge', name='batch_load') == 6
+        assert _sample('app_histogram_count', name='batch_latency') >= 1
+
+    def test_batch_reports_invalid_operations(self, test_client):
+        ops = [
+            {'type': 'counter', 'name': 'batch_ok'},
+            {'type': 'counter', 'name': 'batch_bad', 'inc': -1},
+            {'type': 'summary', 'name': 'x'},
+            {'type': 'histogram', 'name': 'batch_h'},
+            {'family': 'app_counter', 'type': 'gauge', 'name': 'x'},
+            {'type': 'counter', 'name': ''},
+            'not an object',
+        ]
+        data = test_client.post('/metrics/batch', json=ops).json()
+        assert data['ok'] is False
+        assert data['applied'] == 1
+        assert data['failed'] == 6
+        assert [error['index'] for error in data['errors']] == [1, 2, 3, 4, 5, 6]
+
+    def test_batch_rejects_non_array(self, test_client):
+        assert test_client.post('/metrics/batch', json={'type': 'counter'}).status_code == 400
+        assert test_client.post('/metrics/batch', content=b'{not json').status_code == 400
+
+    def test_batch_ndjson_stream(self, test_client):
+        before = _sample('app_counter_total', name='ndjson_reqs')
+        lines = [json.dumps({'type': 'counter', 'name': 'ndjson_reqs'}).encode() for _ in range(1000)]
+        body = b'\n'.join(lines) + b'\nnot json\n'
+        # Split mid-line to exercise reassembly across chunks
+        chunks = [body[i:i + 777] for i in range(0, len(body), 777)]
+        resp = test_client.post('/metrics/batch', content=iter(chunks),
+                                headers={'Content-Type': 'application/x-ndjson'})
+        data = resp.json()
+        assert data['applied'] == 1000
+        assert data['failed'] == 1
+        assert _sample('app_counter_total', name='ndjson_reqs') == before + 1000
+
+    def test_batch_ndjson_last_line_without_newline(self, test_client):
+        before = _sample('app_counter_total', name='ndjson_last')
+        body = b'{"type": "counter", "name": "ndjson_last"}\n{"type": "counter", "name": "ndjson_last", "inc": 2}'
+        data = test_client.post('/metrics/batch', content=body, headers={'Content-Type': 'application/x-ndjson'}).json()
+        assert data['applied'] == 2
+        assert _sample('app_counter_total', name='ndjson_last') == before + 3
+
+    def test_batch_ndjson_line_too_long(self, test_client):
+        chunks = [b'{"type": "counter", "name": "ndjson_long"}\n'] + [b'x' * 8192] * 10
+        resp = test_client.post('/metrics/batch', content=iter(chunks),
+                                headers={'Content-Type': 'application/x-ndjson'})
+        assert resp.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        resp = test_client.post('/metrics/batch', content=b'x' * (MAX_NDJSON_LINE_BYTES + 1) + b'\n',
+                                headers={'Content-Type': 'application/x-ndjson'})
+        assert resp.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+    def test_register_family_with_buckets(self, test_client):
+        resp = test_client.post('/metrics/families', json={
+            'name': 'batch_test_latency', 'type': 'histogram', 'buckets': [0.5, 0.1, 1.0]
+        })
+        assert resp.status_code == status.HTTP_201_CREATED
+        data = test_client.post('/metrics/batch', json=[
+            {'family': 'batch_test_latency', 'name': 'api', 'observe': 0.2},
+        ]).json()
+        assert data['applied'] == 1
+        assert _sample('batch_test_latency_bucket', name='api', le='0.1') == 0
+        assert _sample('batch_test_latency_bucket', name='api', le='0.5') == 1
+        # Duplicate names and clashes with existing series are rejected
+        assert test_client.post('/metrics/families', json={'name': 'batch_test_latency', 'type': 'gauge'}).status_code == 409
+        assert test_client.post('/metrics/families', json={'name': 'app_http_requests', 'type': 'counter'}).status_code == 409
+        assert test_client.post('/metrics/families', json={'name': 'bad-name', 'type': 'gauge'}).status_code == 422
+
+
+class TestMultiWorkerMetrics:
+    @pytest.fixture
+    def multi_worker(self, monkeypatch, tmp_path):
+        monkeypatch.setenv(MULTIPROC_DIR_ENV, str(tmp_path))
+        monkeypatch.setattr(app_routes, 'GAUGE_MODE', 'livemostrecent')
+
+    def test_gauge_only_accepts_set(self, test_client, multi_worker):
+        assert test_client.post('/metrics/gauge?name=mp_load&set_value=5').status_code == 200
+        resp = test_client.post('/metrics/gauge?name=mp_load&inc=2')
+        assert resp.status_code == 400
+        assert 'set_value' in resp.json()['detail']
+        data = test_client.post('/metrics/batch', json=[
+            {'type': 'gauge', 'name': 'mp_load', 'set_value': 7},
+            {'type': 'gauge', 'name': 'mp_load', 'dec': 1},
+        ]).json()
+        assert data['applied'] == 1
+        assert data['failed'] == 1
+        assert _sample('app_gauge', name='mp_load') == 7
+
+    def test_runtime_families_rejected(self, test_client, multi_worker):
+        resp = test_client.post('/metrics/families', json={'name': 'mp_latency', 'type': 'histogram'})
+        assert resp.status_code == status.HTTP_501_NOT_IMPLEMENTED
+        assert 'mp_latency' not in app_routes._families
+
@@ -1,3 +1,4 @@
+import time
 import pytest
 from unittest.mock import patch
 from fastapi import status
@@ -114,3 +115,62 @@ class TestAppRoutes:
         # Newlines should be replaced with spaces
         assert "\n" not in data["logged_message"]
         assert "\r" not in data["logged_message"]
+
+
+class TestProbeRoutes:
+    """Test cases for readiness/startup probes and scheduled probe failures."""
+    
+    @pytest.fixture(autouse=True)
+    def reset_probes(self, test_client):
+        yield
+        for probe in ("readiness", "startup"):
+            test_client.get(f"/healthz/fail?probe={probe}&seconds=0")
+            if test_client.get("/healthz/status").json()[probe]["enabled"] is False:
+                test_client.get(f"/healthz/toggle?probe={probe}")
+    
+    @pytest.mark.parametrize("probe,path", [("readiness", "/readyz"), ("startup", "/startupz")])
+    def test_probe_toggle(self, test_client, probe, path):
+        """Test each probe toggles independently of liveness."""
+        liveness = test_client.get("/healthz").status_code
+        assert test_client.get(path).status_code == status.HTTP_200_OK
+        
+        response = test_client.get(f"/healthz/toggle?probe={probe}")
+        
+        assert response.json()["healthy"] is False
+        assert test_client.get(path).status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        assert test_client.get("/healthz").status_code == liveness
+    
+    def test_scheduled_failure_recovers(self, test_client):
+        """Test a probe fails for the scheduled duration, then recovers."""
+        data = test_client.get("/healthz/fail?probe=readiness&seconds=0.3").json()
+        
+        assert data["probe"] == "readiness"
+        assert data["fail_until"] - data["fail_from"] == pytest.approx(0.3)
+        assert test_client.get("/readyz").status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        assert test_client.get("/healthz/status").json()["readiness"]["healthy"] is False
+        time.sleep(0.35)
+        assert test_client.get("/readyz").status_code == status.HTTP_200_OK
+    
+    def test_scheduled_failure_delay(self, test_client):
+        """Test a delayed failure only starts after the delay."""
+        test_client.get("/healthz/fail?probe=startup&seconds=5&delay=0.2")
+        
+        assert test_client.get("/startupz").status_code == status.HTTP_200_OK
+        time.sleep(0.25)
+        assert test_client.get("/startupz").status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    
+    def test_scheduled_failure_cancel(self, test_client):
+        """Test seconds=0 cancels a scheduled failure."""
+        test_client.get("/healthz/fail?probe=readiness&seconds=60")
+        
+        data = test_client.get("/healthz/fail?probe=readiness&seconds=0").json()
+        
+        assert data["fail_until"] == 0
+        assert test_client.get("/readyz").status_code == status.HTTP_200_OK
+    
+    def test_probe_invalid_parameters(self, test_client):
+        """Test unknown probes and negative durations are rejected."""
+        assert test_client.get("/healthz/toggle?probe=sidecar").status_code == 422
+        assert test_client.get("/healthz/fail?probe=readiness&seconds=-1").status_code == 422
+        assert test_client.get("/healthz/fail?probe=readiness").status_code == 422
+
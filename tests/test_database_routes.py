@@ -1,9 +1,11 @@
 import pytest
+import time
 import datetime
 from unittest.mock import patch, MagicMock
 from fastapi import status
 from sqlalchemy.orm import Session
-from app.routes.database import Requests
+from app.routes import database
+from app.routes.database import Requests, RequestWriteBuffer, WriteBufferFull
 
 
 class TestDatabaseRoutes:
@@ -201,4 +203,124 @@ class TestDatabaseRoutes:
         response = test_client.get("/sql?limit=invalid")
         
         # FastAPI should return 422 for invalid query parameters
-        assert response.status_code == 422 
\ No newline at end of file
+        assert response.status_code == 422
+
+
+class TestRequestWriteBuffer:
+    """Test cases for the write-behind buffer used by /sql."""
+    
+    def _count(self, session_factory):
+        db = session_factory()
+        try:
+            return db.query(Requests).count()
+        finally:
+            db.close()
+    
+    def _wait_for_count(self, session_factory, expected, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._count(session_factory) == expected:
+                return True
+            time.sleep(0.02)
+        return False
+    
+    def test_flush_on_batch_size(self, test_db):
+        """Test a full batch is written without waiting for the flush interval."""
+        TestSessionLocal, test_engine = test_db
+        buffer = RequestWriteBuffer(TestSessionLocal, batch_size=10, flush_interval=60)
+        buffer.start()
+        try:
+            for i in range(10):
+                buffer.submit(datetime.datetime.now(), f"10.0.0.{i}")
+            assert self._wait_for_count(TestSessionLocal, 10)
+        finally:
+            buffer.stop()
+    
+    def test_flush_on_interval(self, test_db):
+        """Test a partial batch is written after the flush interval."""
+        TestSessionLocal, test_engine = test_db
+        buffer = RequestWriteBuffer(TestSessionLocal, batch_size=1000, flush_interval=0.05)
+        buffer.start()
+        try:
+            for i in range(3):
+                buffer.submit(datetime.datetime.now(), "10.0.0.1")
+            assert self._wait_for_count(TestSessionLocal, 3)
+        finally:
+            buffer.stop()
+    
+    def test_flush_on_stop(self, test_db):
+        """Test pending rows are written when the buffer is stopped."""
+        TestSessionLocal, test_engine = test_db
+        buffer = RequestWriteBuffer(TestSessionLocal, batch_size=1000, flush_interval=60)
+        buffer.start()
+        for i in range(25):
+            buffer.submit(datetime.datetime.now(), "10.0.0.1")
+        
+        start = time.monotonic()
+        buffer.stop()
+        
+        assert time.monotonic() - start < 5
+        assert self._count(TestSessionLocal) == 25
+        assert buffer.depth == 0
+    
+    def test_full_buffer_drops(self, test_db):
+        """Test rows are rejected once the bounded queue is full."""
+        TestSessionLocal, test_engine = test_db
+        buffer = RequestWriteBuffer(TestSessionLocal, max_queue=2)
+        buffer.submit(datetime.datetime.now(), "10.0.0.1")
+        buffer.submit(datetime.datetime.now(), "10.0.0.1")
+        
+        with pytest.raises(WriteBufferFull):
+            buffer.submit(datetime.datetime.now(), "10.0.0.1")
+        assert buffer.depth == 2
+    
+    def test_full_buffer_blocks_before_dropping(self, test_db):
+        """Test submit waits up to block_timeout for room in the buffer."""
+        TestSessionLocal, test_engine = test_db
+        buffer = RequestWriteBuffer(TestSessionLocal, max_queue=1, block_timeout=0.1)
+        buffer.submit(datetime.datetime.now(), "10.0.0.1")
+        
+        start = time.monotonic()
+        with pytest.raises(WriteBufferFull):
+            buffer.submit(datetime.datetime.now(), "10.0.0.1")
+        assert time.monotonic() - start >= 0.09
+    
+    def test_non_blocking_submit_drops_at_once(self, test_db):
+        """Test submit with block=False ignores block_timeout."""
+        TestSessionLocal, test_engine = test_db
+        buffer = RequestWriteBuffer(TestSessionLocal, max_queue=1, block_timeout=5)
+        buffer.submit(datetime.datetime.now(), "10.0.0.1")
+        
+        start = time.monotonic()
+        with pytest.raises(WriteBufferFull):
+            buffer.submit(datetime.datetime.now(), "10.0.0.1", block=False)
+        assert time.monotonic() - start < 1
+    
+    def test_sql_endpoint_with_write_behind(self, test_client, test_db):
+        """Test /sql queues records in write-behind mode."""
+        TestSessionLocal, test_engine = test_db
+        buffer = RequestWriteBuffer(TestSessionLocal, batch_size=100, flush_interval=60)
+        buffer.start()
+        with patch.object(database, 'request_buffer', buffer):
+            for i in range(5):
+                response = test_client.get("/sql")
+                assert response.status_code == status.HTTP_200_OK
+                assert response.json()["writable"] is True
+        buffer.stop()
+        
+        assert self._count(TestSessionLocal) == 5
+    
+    def test_sql_endpoint_with_full_buffer(self, test_client, test_db):
+        """Test /sql reports the database as not writable when the buffer is full."""
+        TestSessionLocal, test_engine = test_db
+        buffer = RequestWriteBuffer(TestSessionLocal, max_queue=1)
+        buffer.submit(datetime.datetime.now(), "10.0.0.1")
+        
+        with patch.object(database, 'request_buffer', buffer):
+            response = test_client.get("/sql")
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["writable"] is False
+        assert data["connected"] is True
+        assert "buffer is full" in data["exception"]
@@ -1,9 +1,17 @@
 import pytest
 import os
 import tempfile
+import json
 import hashlib
+import time
+import asyncio
+import threading
 from unittest.mock import patch, mock_open
 from fastapi import status
+from pathlib import Path
+from app.routes.app import registry
+from app.routes import filesystem
+from app.routes.filesystem import ChecksumCache, DataIndex, checksum_cache
 
 
 class TestFilesystemRoutes:
@@ -180,4 +188,376 @@ class TestFilesystemRoutes:
             # The endpoint should handle this gracefully or raise an error
             # This depends on the actual implementation behavior
             with pytest.raises(FileNotFoundError):
-                response = test_client.get("/cat") 
\ No newline at end of file
+                response = test_client.get("/cat")
+
+    def test_cat_endpoint_stream(self, test_client, tmp_path, monkeypatch):
+        """Test cat endpoint streams one NDJSON record per file."""
+        data_dir = tmp_path / "data"
+        (data_dir / "nested").mkdir(parents=True)
+        (data_dir / "test.txt").write_text("Hello, World!")
+        (data_dir / "nested" / "image.png").write_bytes(b'\x89PNG\r\n\x1a\n')
+        (data_dir / "nested" / "test.bin").write_bytes(b'\x80\x81\x82')
+        monkeypatch.chdir(tmp_path)
+        
+        response = test_client.get("/cat?stream=true")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        records = {Path(r["path"]).name: r for r in map(json.loads, response.text.splitlines())}
+        
+        assert set(records) == {"test.txt", "image.png", "test.bin"}
+        assert records["test.txt"]["content"] == "Hello, World!"
+        assert records["test.txt"]["checksum"] == hashlib.md5(b"Hello, World!").hexdigest()
+        assert records["test.txt"]["size"] == 13
+        assert records["image.png"]["content"] == "-"
+        assert records["test.bin"]["content"] == "-"
+        assert records["test.bin"]["checksum"] == hashlib.md5(b'\x80\x81\x82').hexdigest()
+    
+    def test_cat_endpoint_stream_large_file(self, test_client, tmp_path, monkeypatch):
+        """Test large files are hashed in chunks without returning their content."""
+        data_dir = tmp_path / "data"
+        data_dir.mkdir()
+        content = b"a" * 5000
+        (data_dir / "large.txt").write_bytes(content)
+        monkeypatch.chdir(tmp_path)
+        
+        with patch('app.routes.filesystem.CHUNK_SIZE', 1024), \
+                patch('app.routes.filesystem.MAX_FILE_SIZE', 4096):
+            response = test_client.get("/cat?stream=true")
+        
+        record = json.loads(response.text)
+        assert record["checksum"] == hashlib.md5(content).hexdigest()
+        assert record["size"] == 5000
+        assert record["content"] == "-"
+        assert record["reason"] == "File exceeds maximum size limit"
+    
+    def test_cat_endpoint_stream_empty(self, test_client, tmp_path, monkeypatch):
+        """Test streaming cat with no data directory returns an empty body."""
+        monkeypatch.chdir(tmp_path)
+        
+        response = test_client.get("/cat?stream=true")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.text == ""
+
+
+class TestChecksumCache:
+    """Test cases for the /cat and /files checksum cache."""
+    
+    def _hits(self):
+        return registry.get_sample_value('app_fs_cache_hits_total') or 0.0
+    
+    def _misses(self):
+        return registry.get_sample_value('app_fs_cache_misses_total') or 0.0
+    
+    def test_cache_lru_eviction(self):
+        """Test least recently used entries are evicted to stay within the byte budget."""
+        overhead = ChecksumCache.ENTRY_OVERHEAD
+        cache = ChecksumCache(max_bytes=2 * (overhead + 1 + 100))
+        cache.put("a", (1, 100, 1), "ca", 100, b"a" * 100)
+        cache.put("b", (2, 100, 1), "cb", 100, b"b" * 100)
+        assert cache.get("a", (1, 100, 1)) is not None  # "a" is now most recently used
+        
+        cache.put("c", (3, 100, 1), "cc", 100, b"c" * 100)
+        
+        assert cache.get("b", (2, 100, 1)) is None
+        assert cache.get("a", (1, 100, 1)) == ("ca", 100, b"a" * 100)
+        assert cache.get("c", (3, 100, 1)) == ("cc", 100, b"c" * 100)
+    
+    def test_cache_invalidated_by_stat_key(self):
+        """Test entries only match the exact (inode, size, mtime_ns) they were stored with."""
+        cache = ChecksumCache(max_bytes=1024 * 1024)
+        cache.put("a", (1, 3, 100), "old", 3, b"old")
+        
+        assert cache.get("a", (1, 3, 200)) is None
+        assert cache.get("a", (2, 3, 100)) is None
+        assert cache.get("a", (1, 3, 100)) == ("old", 3, b"old")
+    
+    def test_cache_oversized_content(self):
+        """Test content larger than the budget is not kept, but the checksum is."""
+        cache = ChecksumCache(max_bytes=ChecksumCache.ENTRY_OVERHEAD + 64)
+        cache.put("a", (1, 1000, 1), "ca", 1000, b"a" * 1000)
+        
+        assert cache.get("a", (1, 1000, 1)) == ("ca", 1000, None)
+    
+    def test_files_endpoint_uses_cache(self, test_client, tmp_path, monkeypatch):
+        """Test repeated /files?file= calls on an unchanged file are cache hits."""
+        checksum_cache.clear()
+        data_dir = tmp_path / "data"
+        data_dir.mkdir()
+        test_file = data_dir / "secret.txt"
+        test_file.write_text("v1")
+        monkeypatch.chdir(tmp_path)
+        
+        first = test_client.get("/files?file=secret.txt").json()
+        hits, misses = self._hits(), self._misses()
+        with patch('builtins.open', side_effect=AssertionError("file should not be read")):
+            second = test_client.get("/files?file=secret.txt").json()
+        
+        assert second == first
+        assert self._hits() == hits + 1
+        assert self._misses() == misses
+        
+        # Same size, new mtime: the cache entry is invalidated
+        test_file.write_text("v2")
+        stat = test_file.stat()
+        os.utime(test_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        third = test_client.get("/files?file=secret.txt").json()
+        
+        assert third["content"] == "v2"
+        assert third["checksum"] == hashlib.md5(b"v2").hexdigest()
+        assert self._misses() == misses + 1
+    
+    def test_cat_endpoint_uses_cache(self, test_client, tmp_path, monkeypatch):
+        """Test /cat and /cat?stream=true reuse cached checksums."""
+        checksum_cache.clear()
+        data_dir = tmp_path / "data"
+        data_dir.mkdir()
+        (data_dir / "a.txt").write_text("alpha")
+        (data_dir / "b.png").write_bytes(b"\x89PNG")
+        monkeypatch.chdir(tmp_path)
+        
+        first = test_client.get("/cat").json()
+        hits = self._hits()
+        second = test_client.get("/cat").json()
+        streamed = [json.loads(line) for line in test_client.get("/cat?stream=true").text.splitlines()]
+        
+        assert second == first
+        assert self._hits() == hits + 4
+        assert {r["path"]: r["checksum"] for r in streamed} == {p: r["checksum"] for p, r in first.items()}
+
+
+class TestDataIndex:
+    """Test cases for the watched data/ index and /files/events."""
+    
+    def test_refresh_reports_changes(self, tmp_path):
+        """Test a rescan diffs the previous index into created, modified and deleted events."""
+        (tmp_path / "a.txt").write_text("a")
+        (tmp_path / "b.txt").write_text("bb")
+        index = DataIndex(tmp_path, mode="poll")
+        
+        created = index.refresh()
+        assert sorted((e["type"], e["path"]) for e in created) == [("created", "a.txt"), ("created", "b.txt")]
+        assert index.stats() == {"count": 2, "total_size_bytes": 3}
+        assert index.refresh() == []
+        
+        (tmp_path / "a.txt").write_text("aaaa")
+        (tmp_path / "b.txt").unlink()
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "c.txt").write_text("c")
+        events = index.refresh()
+        
+        assert sorted((e["type"], e["path"]) for e in events) == [
+            ("created", os.path.join("sub", "c.txt")), ("deleted", "b.txt"), ("modified", "a.txt")
+        ]
+        assert index.stats() == {"count": 2, "total_size_bytes": 5}
+        listing = index.listing()
+        assert listing["count"] == 2
+        assert {f["path"] for f in listing["files"]} == {"a.txt", os.path.join("sub", "c.txt")}
+    
+    def test_files_endpoint_served_from_index(self, test_client, tmp_path, monkeypatch):
+        """Test /files and /files?ls=true answer from the index when it is running."""
+        data_dir = tmp_path / "data"
+        data_dir.mkdir()
+        (data_dir / "config.yaml").write_text("key: value")
+        monkeypatch.chdir(tmp_path)
+        index = DataIndex(Path("data"), mode="poll")
+        index.refresh()
+        monkeypatch.setattr(filesystem, "data_index", index)
+        
+        with patch('app.routes.filesystem._get_directory_stats', side_effect=AssertionError("should use the index")), \
+             patch('app.routes.filesystem._list_files', side_effect=AssertionError("should use the index")):
+            stats = test_client.get("/files").json()
+            listing = test_client.get("/files?ls=true").json()
+        
+        assert stats == {"count": 1, "total_size_bytes": 10}
+        assert listing["count"] == 1
+        assert listing["files"][0]["path"] == "config.yaml"
+        assert listing["files"][0]["extension"] == ".yaml"
+    
+    def test_events_endpoint_disabled(self, test_client, monkeypatch):
+        """Test /files/events returns 503 without a running watcher."""
+        monkeypatch.setattr(filesystem, "data_index", None)
+        
+        response = test_client.get("/files/events")
+        
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    
+    @pytest.mark.parametrize("mode", ["poll", "auto"])
+    def test_events_endpoint_streams_changes(self, test_client, tmp_path, monkeypatch, mode):
+        """Test the watcher publishes file changes to /files/events subscribers."""
+        index = DataIndex(tmp_path, mode=mode, poll_interval=0.05)
+        index.start()
+        monkeypatch.setattr(filesystem, "data_index", index)
+        try:
+            def writer():
+                # Wait for the stream to subscribe before changing the directory
+                deadline = time.time() + 5
+                while not index._subscribers and time.time() < deadline:
+                    time.sleep(0.01)
+                (tmp_path / "new.txt").write_text("hello")
+            
+            thread = threading.Thread(target=writer)
+            thread.start()
+            response = test_client.get("/files/events?limit=1")
+            thread.join()
+        finally:
+            index.stop()
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/x-ndjson"
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert events[0]["type"] == "created"
+        assert events[0]["path"] == "new.txt"
+        assert events[0]["size"] == 5
+        assert index._subscribers == []
+    
+    def test_events_stream_ends_when_index_stops(self, test_client, tmp_path, monkeypatch):
+        """Test stopping the index ends open /files/events streams so shutdown is not held up."""
+        index = DataIndex(tmp_path, mode="poll", poll_interval=0.05)
+        index.start()
+        monkeypatch.setattr(filesystem, "data_index", index)
+        
+        def stopper():
+            deadline = time.time() + 5
+            while not index._subscribers and time.time() < deadline:
+                time.sleep(0.01)
+            index.stop()
+        
+        thread = threading.Thread(target=stopper)
+        thread.start()
+        response = test_client.get("/files/events")
+        thread.join()
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.text == ""
+        assert index._subscribers == []
+
+
+class TestFileDownload:
+    """Test cases for the raw /files/raw download endpoint."""
+    
+    @pytest.fixture
+    def data_file(self, tmp_path, monkeypatch):
+        data_dir = tmp_path / "data"
+        data_dir.mkdir()
+        payload = bytes(range(256)) * 4096  # 1 MiB, spans several read chunks
+        (data_dir / "blob.bin").write_bytes(payload)
+        monkeypatch.chdir(tmp_path)
+        return payload
+    
+    def test_download_full_file(self, test_client, data_file):
+        """Test the whole file is returned with a stat-based ETag."""
+        response = test_client.get("/files/raw?file=blob.bin")
+        st = os.stat("data/blob.bin")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == data_file
+        assert response.headers["etag"] == f'"{st.st_ino:x}-{st.st_size:x}-{st.st_mtime_ns:x}"'
+        assert response.headers["accept-ranges"] == "bytes"
+        assert response.headers["content-length"] == str(len(data_file))
+    
+    def test_download_uses_zerocopy_when_offered(self, data_file):
+        """Test the range is handed to the server when it offers the zerocopy extension."""
+        messages = []
+        
+        async def send(message):
+            messages.append({key: value for key, value in message.items() if key != "file"})
+        
+        response = filesystem._FileRangeResponse(Path("data/blob.bin"), 10, 19)
+        asyncio.run(response({"type": "http", "extensions": {filesystem.ZEROCOPY_SEND: {}}}, None, send))
+        
+        assert messages[1] == {"type": "http.response.zerocopysend", "offset": 10, "count": 10, "more_body": False}
+    
+    def test_download_etag_changes_with_file(self, test_client, data_file):
+        """Test rewriting the file changes the ETag."""
+        etag = test_client.head("/files/raw?file=blob.bin").headers["etag"]
+        st = os.stat("data/blob.bin")
+        os.utime("data/blob.bin", ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        
+        assert test_client.head("/files/raw?file=blob.bin").headers["etag"] != etag
+    
+    def test_download_operation_ids_unique(self, test_client):
+        """Test GET and HEAD are documented as separate operations."""
+        paths = test_client.get("/openapi.json").json()["paths"]
+        
+        assert paths["/files/raw"]["get"]["operationId"] != paths["/files/raw"]["head"]["operationId"]
+    
+    def test_download_large_file_not_limited(self, test_client, tmp_path, monkeypatch):
+        """Test files above MAX_FILE_SIZE are still served."""
+        data_dir = tmp_path / "data"
+        data_dir.mkdir()
+        (data_dir / "big.bin").write_bytes(b"x" * 64)
+        monkeypatch.chdir(tmp_path)
+        
+        with patch('app.routes.filesystem.MAX_FILE_SIZE', 16):
+            response = test_client.get("/files/raw?file=big.bin")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == b"x" * 64
+    
+    @pytest.mark.parametrize("header,start,end", [
+        ("bytes=0-99", 0, 99),
+        ("bytes=1000-", 1000, 1024 * 1024 - 1),
+        ("bytes=-10", 1024 * 1024 - 10, 1024 * 1024 - 1),
+        ("bytes=1048500-9999999", 1048500, 1024 * 1024 - 1),
+    ])
+    def test_download_range(self, test_client, data_file, header, start, end):
+        """Test single byte ranges return 206 with the matching slice."""
+        response = test_client.get("/files/raw?file=blob.bin", headers={"Range": header})
+        
+        assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+        assert response.content == data_file[start:end + 1]
+        assert response.headers["content-range"] == f"bytes {start}-{end}/{len(data_file)}"
+        assert response.headers["content-length"] == str(end - start + 1)
+    
+    def test_download_range_not_satisfiable(self, test_client, data_file):
+        """Test a range starting past the end of the file returns 416."""
+        response = test_client.get("/files/raw?file=blob.bin", headers={"Range": f"bytes={len(data_file)}-"})
+        
+        assert response.status_code == status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+        assert response.headers["content-range"] == f"bytes */{len(data_file)}"
+    
+    def test_download_malformed_range_ignored(self, test_client, data_file):
+        """Test malformed and multi-range headers fall back to the full file."""
+        for header in ("bytes=abc", "items=0-1", "bytes=0-1,5-6"):
+            response = test_client.get("/files/raw?file=blob.bin", headers={"Range": header})
+            assert response.status_code == status.HTTP_200_OK
+            assert len(response.content) == len(data_file)
+    
+    def test_download_if_none_match(self, test_client, data_file):
+        """Test a matching If-None-Match returns 304 without a body."""
+        etag = test_client.get("/files/raw?file=blob.bin").headers["etag"]
+        
+        response = test_client.get("/files/raw?file=blob.bin", headers={"If-None-Match": f'"other", {etag}'})
+        
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+    
+    def test_download_if_range_mismatch(self, test_client, data_file):
+        """Test a stale If-Range validator ignores the Range header."""
+        response = test_client.get("/files/raw?file=blob.bin", headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.content) == len(data_file)
+    
+    def test_download_head(self, test_client, data_file):
+        """Test HEAD returns the headers only."""
+        response = test_client.head("/files/raw?file=blob.bin")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == b""
+        assert response.headers["content-length"] == str(len(data_file))
+    
+    def test_download_path_traversal(self, test_client, data_file):
+        """Test paths outside data/ are rejected."""
+        response = test_client.get("/files/raw?file=../../etc/passwd")
+        
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+    
+    def test_download_not_found(self, test_client, data_file):
+        """Test missing files return 404."""
+        response = test_client.get("/files/raw?file=missing.bin")
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
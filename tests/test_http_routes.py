@@ -1,7 +1,12 @@
 import pytest
 import time
+import asyncio
+import zlib
+import hashlib
 from unittest.mock import patch
 from fastapi import status
+from app.routes.http import response as response_endpoint, _compute_delay, JitterDistribution
+from app.routes.http import _generate_payload, _payload_chunk, PayloadPattern, DEFAULT_PAYLOAD_CHUNK_SIZE
 
 
 class TestHTTPRoutes:
@@ -127,4 +132,168 @@ class TestHTTPRoutes:
         
         # Test with non-integer delay
         response = test_client.get("/response?delay=invalid")
-        assert response.status_code == 422 
\ No newline at end of file
+        assert response.status_code == 422 
+
+    def test_response_endpoint_with_delay_ms(self, test_client):
+        """Test response endpoint with millisecond delay."""
+        start_time = time.time()
+        
+        response = test_client.get("/response?delay_ms=200")
+        
+        actual_delay = time.time() - start_time
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["delay_ms"] == 200
+        assert data["applied_delay_ms"] == 200
+        assert actual_delay >= 0.19
+    
+    def test_response_endpoint_with_jitter(self, test_client):
+        """Test response endpoint reports the applied jittered delay."""
+        response = test_client.get("/response?delay_ms=10&jitter=uniform&jitter_ms=50")
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["jitter"] == "uniform"
+        assert 10 <= data["applied_delay_ms"] <= 60
+    
+    def test_response_endpoint_invalid_jitter(self, test_client):
+        """Test response endpoint rejects unknown jitter distributions."""
+        response = test_client.get("/response?jitter=pareto&jitter_ms=10")
+        assert response.status_code == 422
+    
+    @pytest.mark.parametrize("jitter", list(JitterDistribution))
+    def test_compute_delay_bounds(self, jitter):
+        """Test jittered delays are never negative nor above the maximum."""
+        for _ in range(200):
+            delay = _compute_delay(0, 5, jitter, 100)
+            assert 0 <= delay <= 300
+        assert _compute_delay(300, 0, jitter, 60000) <= 300
+    
+    def test_compute_delay_without_jitter(self):
+        """Test delay combines seconds and milliseconds."""
+        assert _compute_delay(1, 250, JitterDistribution.none, 0) == 1.25
+        assert _compute_delay(0, 100, JitterDistribution.normal, 0) == 0.1
+    
+    def test_response_delays_run_concurrently(self):
+        """Test delayed responses do not serialize on worker threads."""
+        async def run():
+            return await asyncio.gather(*[
+                response_endpoint(
+                    status_code=200,
+                    delay=0,
+                    delay_ms=300,
+                    jitter=JitterDistribution.none,
+                    jitter_ms=0,
+                    response=None
+                )
+                for _ in range(100)
+            ])
+        
+        start_time = time.time()
+        results = asyncio.run(run())
+        elapsed = time.time() - start_time
+        
+        assert len(results) == 100
+        assert elapsed < 3
+    
+    def test_payload_endpoint_default(self, test_client):
+        """Test /payload streams 1 MiB of random data by default."""
+        response = test_client.get("/payload")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.content) == 1024 * 1024
+        assert response.headers["content-length"] == str(1024 * 1024)
+        assert response.headers["content-type"] == "application/octet-stream"
+        assert response.headers["x-payload-pattern"] == "random"
+    
+    @pytest.mark.parametrize("size,chunk_size", [(0, 1024), (1000, 64), (1000, 1000), (65537, 65536)])
+    def test_payload_endpoint_exact_size(self, test_client, size, chunk_size):
+        """Test the body is exactly size bytes whatever the chunk size."""
+        response = test_client.get(f"/payload?size={size}&chunk_size={chunk_size}")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.content) == size
+    
+    def test_payload_endpoint_patterns(self, test_client):
+        """Test zero and text payloads are compressible while random is not."""
+        zero = test_client.get("/payload?size=100000&pattern=zero")
+        text = test_client.get("/payload?size=100000&pattern=text")
+        rand = test_client.get("/payload?size=100000&pattern=random")
+        
+        assert zero.content == bytes(100000)
+        assert text.headers["content-type"].startswith("text/plain")
+        assert len(zlib.compress(text.content)) < 10000
+        assert len(zlib.compress(rand.content)) > 99000
+    
+    def test_payload_endpoint_invalid_parameters(self, test_client):
+        """Test out of range parameters are rejected."""
+        assert test_client.get("/payload?size=-1").status_code == 422
+        assert test_client.get("/payload?chunk_size=0").status_code == 422
+        assert test_client.get(f"/payload?chunk_size={8 * 1024 * 1024}").status_code == 422
+        assert test_client.get("/payload?pattern=ones").status_code == 422
+    
+    def test_payload_chunks_are_reused(self):
+        """Test full chunks are the same preallocated object."""
+        async def collect():
+            return [chunk async for chunk in _generate_payload(PayloadPattern.zero, 4096 * 3 + 10, 4096, 0)]
+        
+        chunks = asyncio.run(collect())
+        
+        assert len(chunks) == 4
+        assert chunks[0] is chunks[1] is chunks[2]
+        assert len(chunks[0]) == 4096
+        assert len(chunks[3]) == 10
+    
+    def test_only_default_payload_chunk_is_cached(self):
+        """Test client-chosen chunk sizes are not kept between requests."""
+        assert _payload_chunk(PayloadPattern.zero, DEFAULT_PAYLOAD_CHUNK_SIZE) is _payload_chunk(PayloadPattern.zero, DEFAULT_PAYLOAD_CHUNK_SIZE)
+        assert _payload_chunk(PayloadPattern.zero, 4096) is not _payload_chunk(PayloadPattern.zero, 4096)
+    
+    def test_payload_rate_limit(self):
+        """Test the rate limit paces the stream."""
+        async def consume():
+            return sum([len(chunk) async for chunk in _generate_payload(PayloadPattern.text, 50000, 10000, 100000)])
+        
+        start_time = time.time()
+        total = asyncio.run(consume())
+        elapsed = time.time() - start_time
+        
+        assert total == 50000
+        assert 0.4 <= elapsed < 2
+    
+    def test_sink_endpoint(self, test_client):
+        """Test /sink counts the uploaded bytes."""
+        body = b"x" * 100000
+        response = test_client.post("/sink", content=body)
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["bytes"] == 100000
+        assert data["chunks"] >= 1
+        assert data["elapsed_seconds"] >= 0
+        assert data["content_length"] == "100000"
+        assert data["hash"] == "none"
+        assert data["digest"] is None
+    
+    @pytest.mark.parametrize("algorithm", ["md5", "sha1", "sha256"])
+    def test_sink_endpoint_hash(self, test_client, algorithm):
+        """Test /sink digests a chunked upload incrementally."""
+        parts = [bytes([i]) * 65536 for i in range(8)]
+        
+        response = test_client.post(f"/sink?hash={algorithm}", content=iter(parts))
+        
+        data = response.json()
+        assert data["bytes"] == 8 * 65536
+        assert data["chunks"] >= 2
+        assert data["digest"] == hashlib.new(algorithm, b"".join(parts)).hexdigest()
+    
+    def test_sink_endpoint_empty_body(self, test_client):
+        """Test /sink accepts an empty body."""
+        data = test_client.post("/sink").json()
+        
+        assert data["bytes"] == 0
+    
+    def test_sink_endpoint_invalid_hash(self, test_client):
+        """Test unknown digests are rejected."""
+        assert test_client.post("/sink?hash=crc32", content=b"x").status_code == 422
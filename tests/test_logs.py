@@ -0,0 +1,199 @@
+import io
+import json
+import queue
+import logging
+import threading
+import pytest
+from fastapi.testclient import TestClient
+from app import create_app
+from app.logs import JsonFormatter, LogPipeline, LogQueueHandler, LogWriter, log_pipeline, make_formatter
+from config import config
+
+
+def _record(msg="hello %s", args=("world",), name="test", level=logging.INFO, exc_info=None):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, exc_info)
+
+
+@pytest.fixture
+def test_logger():
+    """A logger that does not propagate to the root logger."""
+    logger = logging.getLogger("tests.logs")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    yield logger
+    logger.handlers = []
+    logger.propagate = True
+
+
+class TestJsonFormatter:
+    """Test cases for JSON log lines."""
+
+    def test_fields(self):
+        data = json.loads(JsonFormatter().format(_record()))
+        assert data["message"] == "hello world"
+        assert data["level"] == "INFO"
+        assert data["logger"] == "test"
+        assert data["time"].endswith("+00:00")
+
+    def test_access_log_fields(self):
+        record = _record('%s - "%s %s HTTP/%s" %d', ("127.0.0.1:5000", "GET", "/healthz", "1.1", 200),
+                         name="uvicorn.access")
+        data = json.loads(JsonFormatter().format(record))
+        assert data["method"] == "GET"
+        assert data["path"] == "/healthz"
+        assert data["status"] == 200
+
+    def test_exception(self):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            import sys
+            record = _record(exc_info=sys.exc_info())
+        data = json.loads(JsonFormatter().format(record))
+        assert "ValueError: boom" in data["exception"]
+
+
+class TestLogQueueHandler:
+    """Test cases for queueing log records."""
+
+    def test_prepare_merges_message(self):
+        handler = LogQueueHandler(queue.Queue())
+        record = handler.prepare(_record())
+        assert record.msg == "hello world"
+        assert record.args is None
+
+    def test_drops_when_full(self, test_logger):
+        handler = LogQueueHandler(queue.Queue(maxsize=2))
+        test_logger.addHandler(handler)
+        for i in range(5):
+            test_logger.info("message %d", i)
+        assert handler.queue.qsize() == 2
+        assert handler.dropped == 3
+        assert handler.blocked == 0
+
+    def test_blocks_before_dropping(self, test_logger):
+        handler = LogQueueHandler(queue.Queue(maxsize=1), block_timeout=0.05)
+        test_logger.addHandler(handler)
+        test_logger.info("first")
+        test_logger.info("second")
+        assert handler.dropped == 1
+        assert handler.blocked == 1
+        assert handler.blocked_seconds >= 0.04
+
+    def test_waiting_record_is_kept_when_room_frees(self, test_logger):
+        handler = LogQueueHandler(queue.Queue(maxsize=1), block_timeout=5)
+        test_logger.addHandler(handler)
+        test_logger.info("first")
+        threading.Timer(0.05, handler.queue.get).start()
+        test_logger.info("second")
+        assert handler.dropped == 0
+        assert handler.blocked == 1
+        assert handler.queue.get_nowait().msg == "second"
+
+
+class TestLogWriter:
+    """Test cases for the background log writer."""
+
+    def test_writes_and_drains_on_stop(self, test_logger):
+        stream = io.StringIO()
+        stream_handler = logging.StreamHandler(stream)
+        stream_handler.setFormatter(make_formatter("json"))
+        log_queue = queue.Queue()
+        writer = LogWriter(log_queue, stream_handler)
+        test_logger.addHandler(LogQueueHandler(log_queue))
+        writer.start()
+        for i in range(100):
+            test_logger.info("message %d", i)
+        writer.stop()
+        lines = stream.getvalue().splitlines()
+        assert [json.loads(line)["message"] for line in lines] == [f"message {i}" for i in range(100)]
+        assert writer.written == 100
+
+
+class TestLogPipeline:
+    """Test cases for switching the root logger between sync and async writes."""
+
+    def test_start_and_stop(self, capsys):
+        pipeline = LogPipeline()
+        root = logging.getLogger()
+        try:
+            pipeline.configure("json")
+            pipeline.start(queue_size=100)
+            assert pipeline.queue_handler in root.handlers
+            assert pipeline.stream_handler not in root.handlers
+            logging.getLogger("tests.pipeline").warning("queued")
+            pipeline.stop()
+            assert pipeline.queue_handler not in root.handlers
+            assert pipeline.stream_handler in root.handlers
+            assert pipeline.stats()["written"] >= 1
+            assert pipeline.stats()["async"] is False
+        finally:
+            pipeline.stop()
+            root.removeHandler(pipeline.stream_handler)
+
+    def test_routes_server_loggers(self):
+        pipeline = LogPipeline()
+        access = logging.getLogger("uvicorn.access")
+        handler = logging.NullHandler()
+        access.handlers, access.propagate = [handler], False
+        try:
+            pipeline.start(queued=False)
+            assert access.handlers == [] and access.propagate
+            pipeline.stop()
+            assert access.handlers == [handler] and not access.propagate
+        finally:
+            access.handlers = []
+            root = logging.getLogger()
+            root.removeHandler(pipeline.stream_handler)
+
+
+class TestBulkLog:
+    """Test cases for /log in bulk mode."""
+
+    @pytest.fixture
+    def async_logging(self, monkeypatch):
+        monkeypatch.setattr(config, "log_async", True)
+        monkeypatch.setattr(config, "log_queue_size", 50)
+
+    def test_bulk_messages(self, test_client):
+        response = test_client.get("/log", params={"count": 20, "size": 64, "level": "warning"})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["emitted"] == 20
+        assert data["size"] == 64
+        assert data["level"] == "warning"
+        assert data["messages_per_second"] > 0
+
+    def test_disabled_level_emits_nothing(self, test_client):
+        data = test_client.get("/log", params={"count": 5, "level": "debug"}).json()
+        assert data["emitted"] == 0
+
+    def test_rate_limit(self, test_client):
+        data = test_client.get("/log", params={"count": 10, "rate": 100}).json()
+        assert data["elapsed_seconds"] >= 0.09
+
+    def test_limits(self, test_client, monkeypatch):
+        monkeypatch.setattr(config, "stress_max_seconds", 10)
+        assert test_client.get("/log", params={"count": 0}).status_code == 422
+        assert test_client.get("/log", params={"count": 1, "size": 2 * 1024 * 1024}).status_code == 422
+        assert test_client.get("/log", params={"count": 2048, "size": 1024 * 1024}).status_code == 422
+        assert test_client.get("/log", params={"count": 2, "rate": 1e-9}).status_code == 422
+        assert test_client.get("/log", params={"count": 101, "rate": 10}).status_code == 422
+
+    def test_stops_at_max_seconds(self, test_client, monkeypatch):
+        monkeypatch.setattr(config, "stress_max_seconds", 0.05)
+        data = test_client.get("/log", params={"count": 10_000_000, "size": 1, "level": "warning"}).json()
+        assert 0 < data["emitted"] < 10_000_000
+        assert data["elapsed_seconds"] < 1
+
+    def test_async_pipeline_counts_drops(self, async_logging):
+        with TestClient(create_app()) as client:
+            assert client.get("/log/stats").json()["async"] is True
+            data = client.get("/log", params={"count": 5000, "size": 200}).json()
+            stats = client.get("/log/stats").json()
+        assert data["emitted"] == 5000
+        assert stats["queue_size"] == 50
+        assert data["dropped"] == stats["dropped"]
+        final = log_pipeline.stats()
+        assert final["async"] is False
+        assert final["written"] + final["dropped"] >= 5000
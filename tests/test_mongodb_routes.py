@@ -1,6 +1,11 @@
 import datetime
+import pytest
 from unittest.mock import patch, MagicMock
 from fastapi import status
+from fastapi.testclient import TestClient
+from app import create_app
+from app.routes import mongodb
+from app.routes.app import registry
 
 
 class TestMongoDBRoutes:
@@ -69,4 +74,83 @@ class TestMongoDBRoutes:
         assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
         assert 'pymongo is required' in response.json()['detail']
 
+    def test_mongodb_client_is_reused(self, test_client):
+        mongodb.close_mongo_client()
+        mock_client, mock_db, mock_collection = self._mock_client()
+        mock_collection.find.return_value = []
+
+        with patch('pymongo.MongoClient', return_value=mock_client) as mock_cls:
+            assert test_client.get('/mongodb').status_code == status.HTTP_200_OK
+            assert test_client.get('/mongodb').status_code == status.HTTP_200_OK
+
+        mock_cls.assert_called_once()
+        mock_client.close.assert_not_called()
+        mongodb.close_mongo_client()
+        mock_client.close.assert_called_once()
+
+    def test_mongodb_client_options_and_shutdown(self):
+        mongodb.close_mongo_client()
+        mock_client, mock_db, mock_collection = self._mock_client()
+        mock_collection.find.return_value = []
+
+        with patch('pymongo.MongoClient', return_value=mock_client) as mock_cls, \
+                patch.object(mongodb.config, 'mongo_client_options', {'maxPoolSize': 7}):
+            with TestClient(create_app()) as client:
+                assert client.get('/mongodb').status_code == status.HTTP_200_OK
+
+        kwargs = mock_cls.call_args.kwargs
+        assert kwargs['maxPoolSize'] == 7
+        assert len(kwargs['event_listeners']) == 1
+        # Closed on application shutdown
+        mock_client.close.assert_called_once()
+        assert mongodb._client is None
+
+    def test_mongodb_client_options_event_listeners(self):
+        mongodb.close_mongo_client()
+        mock_client, mock_db, mock_collection = self._mock_client()
+        user_listener = object()
+
+        with patch('pymongo.MongoClient', return_value=mock_client) as mock_cls, \
+                patch.object(mongodb.config, 'mongo_client_options', {'event_listeners': [user_listener]}):
+            mongodb._get_mongo_client()
 
+        listeners = mock_cls.call_args.kwargs['event_listeners']
+        assert listeners[0] is user_listener
+        assert len(listeners) == 2
+        mongodb.close_mongo_client()
+
+    def test_mongodb_pool_metrics(self):
+        listener = mongodb._create_pool_listener()
+
+        def value(name):
+            return registry.get_sample_value(name) or 0.0
+
+        created = value('app_mongodb_pool_connections_created_total')
+        checked_out = value('app_mongodb_pool_checked_out')
+        waiters = value('app_mongodb_pool_waiters')
+
+        listener.connection_created(None)
+        listener.connection_check_out_started(None)
+        assert value('app_mongodb_pool_waiters') == waiters + 1
+        listener.connection_checked_out(None)
+        assert value('app_mongodb_pool_waiters') == waiters
+        assert value('app_mongodb_pool_checked_out') == checked_out + 1
+        listener.connection_checked_in(None)
+
+        assert value('app_mongodb_pool_connections_created_total') == created + 1
+        assert value('app_mongodb_pool_checked_out') == checked_out
+
+    def test_mongodb_with_mongomock(self, test_client):
+        mongomock = pytest.importorskip('mongomock')
+        mongodb.close_mongo_client()
+
+        with patch('pymongo.MongoClient', mongomock.MongoClient):
+            for _ in range(3):
+                response = test_client.get('/mongodb?limit=2')
+                assert response.status_code == status.HTTP_200_OK
+
+        data = response.json()
+        assert data['connected'] is True
+        assert data['writable'] is True
+        assert len(data['data']) == 2
+        mongodb.close_mongo_client()
@@ -0,0 +1,135 @@
+import os
+import sys
+import time
+import socket
+import subprocess
+import pytest
+import httpx
+from app import multiprocess
+from app.multiprocess import SharedState, cleanup_dead_workers, MULTIPROC_DIR_ENV
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _dead_pid():
+    """Return the pid of a process that has exited."""
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestSharedState:
+    """Test cases for state shared between workers."""
+    
+    def test_in_memory_without_multiprocess_dir(self, monkeypatch):
+        """Test a single process keeps the state in memory."""
+        monkeypatch.delenv(MULTIPROC_DIR_ENV, raising=False)
+        
+        state = SharedState("test", initial=b"\x01\x00")
+        
+        assert not state.shared
+        assert state.get_bool(0) is True
+        assert state.get_bool(1) is False
+    
+    def test_shared_between_instances(self, monkeypatch, tmp_path):
+        """Test writes through one mapping are seen through another, as in two workers."""
+        monkeypatch.setenv(MULTIPROC_DIR_ENV, str(tmp_path))
+        
+        first = SharedState("test", initial=b"\x01")
+        second = SharedState("test", initial=b"\x01")
+        with first.lock():
+            first.set_bool(0, False)
+        
+        assert first.shared
+        assert second.get_bool(0) is False
+        # Existing state is not reinitialised by a worker starting later
+        assert SharedState("test", initial=b"\x01").get_bool(0) is False
+        assert os.listdir(tmp_path) == ["app22_test.state"]
+
+
+class TestDeadWorkerCleanup:
+    """Test cases for removing metrics files of exited workers."""
+    
+    def test_cleanup_dead_workers(self, monkeypatch, tmp_path):
+        """Test live gauge files of exited processes are removed and others kept."""
+        monkeypatch.setenv(MULTIPROC_DIR_ENV, str(tmp_path))
+        dead, alive = _dead_pid(), os.getpid()
+        for name in (f"gauge_livesum_{dead}.db", f"gauge_livesum_{alive}.db", f"counter_{dead}.db"):
+            (tmp_path / name).write_bytes(b"")
+        
+        cleanup_dead_workers()
+        
+        assert sorted(os.listdir(tmp_path)) == sorted([f"gauge_livesum_{alive}.db", f"counter_{dead}.db"])
+    
+    def test_cleanup_without_multiprocess_dir(self, monkeypatch):
+        """Test cleanup is a no-op for a single process."""
+        monkeypatch.delenv(MULTIPROC_DIR_ENV, raising=False)
+        
+        assert multiprocess.multiprocess_dir() is None
+        cleanup_dead_workers()
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestMultiWorkerServer:
+    """Run App22 with several workers and check metrics and health are shared."""
+    
+    @pytest.fixture
+    def server(self, tmp_path):
+        port = _free_port()
+        env = dict(
+            os.environ,
+            APP22_HOST="127.0.0.1",
+            APP22_PORT=str(port),
+            APP22_DEBUG="0",
+            APP22_WORKERS="2",
+            APP22_MULTIPROC_DIR=str(tmp_path / "multiproc"),
+            APP22_DB_URL=f"sqlite:///{tmp_path / 'app22.db'}",
+        )
+        env.pop(MULTIPROC_DIR_ENV, None)
+        process = subprocess.Popen([sys.executable, "run.py"], cwd=ROOT, env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        base_url = f"http://127.0.0.1:{port}"
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            try:
+                if httpx.get(f"{base_url}/version").status_code == 200:
+                    break
+            except httpx.TransportError:
+                time.sleep(0.2)
+        yield base_url
+        process.terminate()
+        process.wait(timeout=30)
+    
+    def test_metrics_and_health_shared(self, server):
+        # Fresh connections spread requests over both workers
+        for _ in range(40):
+            response = httpx.post(f"{server}/metrics/counter?name=workers", headers={"Connection": "close"})
+            assert response.status_code == 200
+        for _ in range(10):
+            metrics = httpx.get(f"{server}/metrics", headers={"Connection": "close"}).text
+            assert 'app_counter_total{name="workers"} 40.0' in metrics
+        
+        # The value last set by any worker, not the sum over workers
+        for value in range(1, 11):
+            httpx.post(f"{server}/metrics/gauge?name=workers&set_value={value}", headers={"Connection": "close"})
+        for _ in range(10):
+            metrics = httpx.get(f"{server}/metrics", headers={"Connection": "close"}).text
+            assert 'app_gauge{name="workers"} 10.0' in metrics
+        
+        response = httpx.post(f"{server}/metrics/families", json={"name": "per_worker", "type": "counter"})
+        assert response.status_code == 501
+        
+        assert httpx.get(f"{server}/healthz/toggle").json()["healthy"] is False
+        for _ in range(10):
+            assert httpx.get(f"{server}/healthz", headers={"Connection": "close"}).status_code == 500
+        
+        httpx.get(f"{server}/healthz/fail?probe=readiness&seconds=60")
+        for _ in range(10):
+            assert httpx.get(f"{server}/readyz", headers={"Connection": "close"}).status_code == 500
@@ -0,0 +1,194 @@
+import os
+import sys
+import json
+import subprocess
+import pytest
+from fastapi.testclient import TestClient
+from app import create_app
+from app.routes.database import get_db
+from app.startup import LazyGroupRoute, RouteGroup, select_groups, startup_timings
+from config import Config, config
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _paths(app):
+    return {getattr(route, "path", None) for route in app.router.routes}
+
+
+@pytest.fixture
+def fast_startup(monkeypatch):
+    monkeypatch.setattr(config, "fast_startup", True)
+
+
+@pytest.fixture
+def lazy_client(fast_startup, test_db):
+    """A test client started in fast-startup mode with the test database."""
+    TestSessionLocal, test_engine = test_db
+
+    def override_get_db():
+        db = TestSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = create_app()
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as client:
+        yield client
+
+
+class TestRouteGroup:
+    """Test cases for route group path matching."""
+
+    def test_matches_prefix_and_subpaths(self):
+        group = RouteGroup("stress", [], prefixes=["/stress"])
+        assert group.matches("/stress")
+        assert group.matches("/stress/cpu/status")
+        assert not group.matches("/stressed")
+        assert not group.matches("/sys")
+
+
+class TestRouteGroupAllowlist:
+    """Test cases for mounting only selected route groups."""
+
+    def test_config_parses_allowlist(self):
+        assert Config(route_groups="all").enabled_route_groups is None
+        assert Config(route_groups="").enabled_route_groups is None
+        assert Config(route_groups="App, HTTP").enabled_route_groups == ["app", "http"]
+
+    def test_select_groups(self):
+        groups = [RouteGroup("app", []), RouteGroup("http", []), RouteGroup("database", [])]
+        assert select_groups(groups, None) == groups
+        assert [group.name for group in select_groups(groups, ["http", "app"])] == ["app", "http"]
+
+    def test_unknown_group_rejected(self):
+        with pytest.raises(ValueError, match="Unknown route groups sql"):
+            select_groups([RouteGroup("app", [])], ["app", "sql"])
+
+    def test_only_enabled_groups_mounted(self, monkeypatch):
+        monkeypatch.setattr(config, "route_groups", "app,http")
+        app = create_app()
+        paths = _paths(app)
+        assert "/healthz" in paths
+        assert "/payload" in paths
+        assert "/sys" not in paths
+        assert "/sql" not in paths
+        assert "/files" not in paths
+        assert set(app.state.route_groups) == {"app", "http"}
+        with TestClient(app) as client:
+            assert client.get("/version").status_code == 200
+            assert client.get("/sql").status_code == 404
+            data = client.get("/startup").json()
+            assert "database" in data["disabled_groups"]
+            assert "database" not in data["groups"]
+
+    def test_disabled_lazy_groups_get_no_placeholder(self, fast_startup, monkeypatch):
+        monkeypatch.setattr(config, "route_groups", "app,todo")
+        app = create_app()
+        lazy = {route.group.name for route in app.router.routes if isinstance(route, LazyGroupRoute)}
+        assert lazy == {"todo"}
+
+    def test_disabled_groups_not_imported(self):
+        code = (
+            "import sys, json\n"
+            "from app import create_app\n"
+            "create_app()\n"
+            "print(json.dumps([m for m in ('sqlalchemy', 'pymongo', 'psutil', 'app.routes.filesystem') if m in sys.modules]))\n"
+        )
+        env = dict(os.environ, APP22_ROUTE_GROUPS="app,http")
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                                capture_output=True, text=True, timeout=60)
+        assert result.returncode == 0, result.stderr
+        assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+
+class TestFastStartup:
+    """Test cases for lazily mounted route groups."""
+
+    def test_eager_by_default(self):
+        app = create_app()
+        assert "/sql" in _paths(app)
+        assert "/stress/cpu" in _paths(app)
+        assert not any(isinstance(route, LazyGroupRoute) for route in app.router.routes)
+
+    def test_lazy_groups_are_not_mounted(self, fast_startup):
+        app = create_app()
+        paths = _paths(app)
+        assert "/healthz" in paths
+        assert "/payload" in paths
+        assert "/sql" not in paths
+        assert "/tasks" not in paths
+        assert "/sys" not in paths
+        lazy = {route.group.name for route in app.router.routes if isinstance(route, LazyGroupRoute)}
+        assert lazy == {"system", "database", "todo", "mongodb", "stress"}
+
+    def test_first_request_loads_group(self, lazy_client, sample_task_data):
+        response = lazy_client.post("/tasks", json=sample_task_data)
+        assert response.status_code == 201
+        assert lazy_client.get("/tasks").status_code == 200
+        paths = _paths(lazy_client.app)
+        assert "/tasks" in paths
+        assert "/sql" not in paths
+        assert set(lazy_client.app.state.route_groups) >= {"app", "http", "todo"}
+        assert "database" not in lazy_client.app.state.route_groups
+
+    def test_lazy_group_runs_startup_hooks(self, lazy_client):
+        from app.routes.system import sampler
+        response = lazy_client.get("/sys")
+        assert response.status_code == 200
+        assert sampler.running
+
+    def test_unknown_path_is_still_404(self, lazy_client):
+        assert lazy_client.get("/does-not-exist").status_code == 404
+
+    def test_openapi_lists_lazy_routes(self, lazy_client):
+        response = lazy_client.get("/openapi.json")
+        assert response.status_code == 200
+        paths = response.json()["paths"]
+        assert "/sql" in paths
+        assert "/tasks" in paths
+        assert "/stress/cpu" in paths
+
+    def test_drivers_not_imported(self):
+        code = (
+            "import sys, json\n"
+            "from app import create_app\n"
+            "create_app()\n"
+            "print(json.dumps([m for m in ('sqlalchemy', 'pymongo', 'psutil') if m in sys.modules]))\n"
+        )
+        env = dict(os.environ, APP22_FAST_STARTUP="1")
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                                capture_output=True, text=True, timeout=60)
+        assert result.returncode == 0, result.stderr
+        assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+
+class TestStartupEndpoint:
+    """Test cases for the /startup breakdown."""
+
+    def test_reports_phases_and_groups(self, lazy_client):
+        data = lazy_client.get("/startup").json()
+        assert data["fast_startup"] is True
+        names = [phase["name"] for phase in data["phases"]]
+        assert "import fastapi" in names
+        assert "create_app" in names
+        assert all(phase["seconds"] >= 0 for phase in data["phases"])
+        assert data["import_to_ready_seconds"] > 0
+        assert data["groups"]["app"]["loaded"] is True
+        assert data["groups"]["mongodb"] == {"loaded": False, "load_seconds": None}
+        assert set(data["modules"]) >= {"sqlalchemy", "psutil", "prometheus_client"}
+
+    def test_group_reported_loaded_after_first_request(self, lazy_client):
+        lazy_client.get("/mongodb")
+        data = lazy_client.get("/startup").json()
+        assert data["groups"]["mongodb"]["loaded"] is True
+        assert data["groups"]["mongodb"]["load_seconds"] >= 0
+
+    def test_phases_recorded_once(self):
+        startup_timings.record("test phase", 0.0, 1.0)
+        startup_timings.record("test phase", 0.0, 2.0)
+        phases = [phase for phase in startup_timings.phases if phase["name"] == "test phase"]
+        assert len(phases) == 1
+        assert phases[0]["seconds"] == 1.0
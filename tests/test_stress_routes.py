@@ -0,0 +1,272 @@
+import os
+import time
+import threading
+import pytest
+from fastapi import status
+from app.routes import stress
+import psutil
+from unittest.mock import patch
+from app.routes.stress import CpuStress, MemoryStress, DiskPattern, _burn_cpu, _init_cpu_worker, _percentile
+from app.routes.stress import run_disk_benchmark
+
+
+@pytest.fixture
+def cpu_stress(monkeypatch):
+    """Replace the process-wide CPU stress job with a fresh one."""
+    job = CpuStress()
+    monkeypatch.setattr(stress, "cpu_stress", job)
+    yield job
+    job.stop()
+
+
+@pytest.fixture
+def memory_stress(monkeypatch):
+    """Replace the process-wide memory stress job with a fresh one."""
+    job = MemoryStress()
+    monkeypatch.setattr(stress, "memory_stress", job)
+    yield job
+    job.stop()
+
+
+def _wait_until(test_client, url, predicate, timeout=10):
+    deadline = time.time() + timeout
+    data = test_client.get(url).json()
+    while not predicate(data) and time.time() < deadline:
+        time.sleep(0.05)
+        data = test_client.get(url).json()
+    return data
+
+
+def _wait_until_done(test_client, timeout=10):
+    return _wait_until(test_client, "/stress/cpu/status", lambda data: not data["running"], timeout)
+
+
+class TestCpuStress:
+    """Test cases for the /stress/cpu endpoints."""
+    
+    def test_status_without_job(self, test_client, cpu_stress):
+        """Test status before any job has run."""
+        response = test_client.get("/stress/cpu/status")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"running": False}
+    
+    def test_cpu_stress_runs_to_completion(self, test_client, cpu_stress):
+        """Test a short job starts, finishes and reports the CPU time used."""
+        response = test_client.get("/stress/cpu?cores=1&seconds=0.5&percent=100")
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["running"] is True
+        assert data["cores"] == 1
+        assert data["percent"] == 100
+        
+        data = _wait_until_done(test_client)
+        assert data["running"] is False
+        assert data["cancelled"] is False
+        assert data["worker_cpu_seconds"] > 0.2
+        assert data["worker_cpu_percent"] > 30
+    
+    def test_cpu_stress_status_frozen_after_job(self, test_client, cpu_stress):
+        """Test the achieved utilisation stops changing once the job has ended."""
+        test_client.get("/stress/cpu?cores=1&seconds=0.3&percent=100")
+        data = _wait_until_done(test_client)
+        
+        assert data["stopped_at"] is not None
+        assert data["system_cpu_percent"] is not None
+        time.sleep(0.2)
+        later = test_client.get("/stress/cpu/status").json()
+        assert later["system_cpu_percent"] == data["system_cpu_percent"]
+        assert later["elapsed_seconds"] == data["elapsed_seconds"]
+    
+    def test_cpu_workers_are_spawned(self, test_client, cpu_stress):
+        """Test workers are not forked from the multithreaded server process."""
+        test_client.get("/stress/cpu?cores=1&seconds=0.1&percent=10")
+        
+        assert cpu_stress._executor._mp_context.get_start_method() == "spawn"
+        _wait_until_done(test_client)
+    
+    def test_cpu_stress_cancel(self, test_client, cpu_stress):
+        """Test a running job can be cancelled."""
+        test_client.get("/stress/cpu?cores=1&seconds=60&percent=50")
+        
+        start_time = time.time()
+        data = test_client.delete("/stress/cpu").json()
+        
+        assert time.time() - start_time < 5
+        assert data["running"] is False
+        assert data["cancelled"] is True
+    
+    def test_cpu_stress_conflict(self, test_client, cpu_stress):
+        """Test only one job runs at a time."""
+        test_client.get("/stress/cpu?cores=1&seconds=60&percent=10")
+        
+        response = test_client.get("/stress/cpu?cores=1&seconds=1")
+        
+        assert response.status_code == status.HTTP_409_CONFLICT
+    
+    def test_cpu_stress_limits(self, test_client, cpu_stress, monkeypatch):
+        """Test requests above the configured limits are refused."""
+        monkeypatch.setattr(stress.config, "stress_max_cores", 2)
+        monkeypatch.setattr(stress.config, "stress_max_seconds", 10)
+        
+        assert test_client.get("/stress/cpu?cores=3&seconds=1").status_code == 422
+        assert test_client.get("/stress/cpu?cores=1&seconds=11").status_code == 422
+        assert test_client.get("/stress/cpu?cores=1&seconds=1&percent=101").status_code == 422
+        assert test_client.get("/stress/cpu?cores=0&seconds=1").status_code == 422
+        assert not cpu_stress.running
+    
+    def test_burn_cpu_duty_cycle(self):
+        """Test the worker loop is idle for the rest of each duty cycle."""
+        _init_cpu_worker(threading.Event())
+        
+        before = time.process_time()
+        start_time = time.monotonic()
+        _burn_cpu(0.5, 20)
+        elapsed = time.monotonic() - start_time
+        used = time.process_time() - before
+        
+        assert 0.45 <= elapsed < 1
+        assert used < elapsed * 0.6
+
+
+class TestMemoryStress:
+    """Test cases for the /stress/memory endpoints."""
+    
+    @pytest.mark.parametrize("method", ["bytearray", "mmap"])
+    def test_memory_stress_allocate_and_release(self, test_client, memory_stress, method):
+        """Test allocated memory shows up in RSS and is freed on release."""
+        rss_before = psutil.Process().memory_info().rss
+        
+        response = test_client.get(f"/stress/memory?mib=64&method={method}")
+        assert response.status_code == status.HTTP_200_OK
+        
+        data = _wait_until(test_client, "/stress/memory/status", lambda data: data["allocated_at"] is not None)
+        assert data["running"] is True
+        assert data["allocated_mib"] == 64
+        assert data["method"] == method
+        assert data["rss"] - rss_before > 48 * 1024 * 1024
+        assert "percent" in data["memory"]
+        
+        data = test_client.delete("/stress/memory").json()
+        assert data["running"] is False
+        assert data["allocated_mib"] == 0
+        assert data["released_at"] is not None
+    
+    def test_memory_stress_ramp(self, test_client, memory_stress):
+        """Test the ramp rate paces the allocation."""
+        test_client.get("/stress/memory?mib=10&ramp=20")
+        
+        time.sleep(0.2)
+        partial = test_client.get("/stress/memory/status").json()
+        data = _wait_until(test_client, "/stress/memory/status", lambda data: data["allocated_at"] is not None)
+        
+        assert 0 < partial["allocated_mib"] < 10
+        assert data["allocated_at"] - data["started_at"] >= 0.45
+    
+    def test_memory_stress_hold(self, test_client, memory_stress):
+        """Test memory is released automatically after the hold duration."""
+        test_client.get("/stress/memory?mib=8&hold=0.2")
+        
+        data = _wait_until(test_client, "/stress/memory/status", lambda data: not data["running"])
+        
+        assert data["allocated_mib"] == 0
+        assert data["released_at"] - data["allocated_at"] >= 0.2
+    
+    def test_memory_stress_released_at_max_seconds(self, test_client, memory_stress, monkeypatch):
+        """Test memory held until released is freed once the maximum duration is reached."""
+        monkeypatch.setattr(stress.config, "stress_max_seconds", 0.3)
+        test_client.get("/stress/memory?mib=8")
+        
+        data = _wait_until(test_client, "/stress/memory/status", lambda data: not data["running"])
+        
+        assert data["allocated_mib"] == 0
+        assert data["max_seconds"] == 0.3
+        assert 0.25 <= data["released_at"] - data["started_at"] < 2
+    
+    def test_memory_stress_conflict(self, test_client, memory_stress):
+        """Test only one job runs at a time."""
+        test_client.get("/stress/memory?mib=1")
+        
+        assert test_client.get("/stress/memory?mib=1").status_code == status.HTTP_409_CONFLICT
+    
+    def test_memory_stress_limits(self, test_client, memory_stress, monkeypatch):
+        """Test requests above the configured limits are refused."""
+        monkeypatch.setattr(stress.config, "stress_max_memory_mib", 16)
+        monkeypatch.setattr(stress.config, "stress_max_seconds", 10)
+        
+        assert test_client.get("/stress/memory?mib=17").status_code == 422
+        assert test_client.get("/stress/memory?mib=1&hold=11").status_code == 422
+        assert test_client.get("/stress/memory?mib=16&ramp=1").status_code == 422
+        assert test_client.get("/stress/memory?mib=10&ramp=2&hold=6").status_code == 422
+        assert test_client.get("/stress/memory?mib=1&method=swap").status_code == 422
+        assert not memory_stress.running
+
+
+class TestDiskStress:
+    """Test cases for the /stress/disk benchmark."""
+    
+    @pytest.mark.parametrize("pattern", ["sequential", "random"])
+    def test_disk_benchmark(self, test_client, tmp_path, pattern):
+        """Test both phases report every operation and the test file is removed."""
+        response = test_client.get(f"/stress/disk?directory={tmp_path}&size_mib=1&block_size=4096&pattern={pattern}")
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["pattern"] == pattern
+        for phase in ("write", "read"):
+            result = data[phase]
+            assert result["operations"] == 256
+            assert result["bytes"] == 1024 * 1024
+            assert result["iops"] > 0
+            assert result["mb_per_second"] > 0
+            latency = result["latency_ms"]
+            assert latency["min"] <= latency["p50"] <= latency["p90"] <= latency["p99"] <= latency["max"]
+        assert os.listdir(tmp_path) == []
+    
+    def test_disk_benchmark_fsync(self, test_client, tmp_path):
+        """Test the fsync option is accepted and reported."""
+        data = test_client.get(f"/stress/disk?directory={tmp_path}&size_mib=1&block_size=65536&fsync=true").json()
+        
+        assert data["fsync"] is True
+        assert data["write"]["operations"] == 16
+    
+    def test_disk_benchmark_writes_file(self, tmp_path):
+        """Test the benchmark writes the full file before reading it back."""
+        written = []
+        real_pwrite = os.pwrite
+        
+        def spy(fd, data, offset):
+            written.append(offset)
+            return real_pwrite(fd, data, offset)
+        
+        with patch("app.routes.stress.os.pwrite", side_effect=spy):
+            run_disk_benchmark(tmp_path, 8 * 4096, 4096, DiskPattern.random)
+        
+        assert sorted(written) == [i * 4096 for i in range(8)]
+    
+    def test_disk_benchmark_invalid_parameters(self, test_client, tmp_path, monkeypatch):
+        """Test invalid or oversized requests are refused."""
+        monkeypatch.setattr(stress.config, "stress_max_disk_mib", 4)
+        
+        assert test_client.get(f"/stress/disk?directory={tmp_path}&size_mib=5").status_code == 422
+        assert test_client.get(f"/stress/disk?directory={tmp_path}&block_size=1000").status_code == 422
+        assert test_client.get(f"/stress/disk?directory={tmp_path}&pattern=zigzag").status_code == 422
+        assert test_client.get(f"/stress/disk?directory={tmp_path / 'missing'}&size_mib=1").status_code == 404
+    
+    def test_disk_benchmark_os_error(self, test_client, tmp_path):
+        """Test filesystem errors such as unsupported O_DIRECT are reported as 400."""
+        with patch("app.routes.stress.run_disk_benchmark", side_effect=OSError(22, "Invalid argument")):
+            response = test_client.get(f"/stress/disk?directory={tmp_path}&size_mib=1&direct=true")
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "Invalid argument" in response.json()["detail"]
+    
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        values = [float(i) for i in range(1, 101)]
+        
+        assert _percentile(values, 50) == 50
+        assert _percentile(values, 99) == 99
+        assert _percentile(values, 100) == 100
+        assert _percentile([3.0], 90) == 3
@@ -0,0 +1,136 @@
+import time
+import asyncio
+import threading
+import pytest
+from fastapi import status
+from app.routes import synthetic
+from pydantic import ValidationError
+from app.routes.app import registry
+from app.multiprocess import MULTIPROC_DIR_ENV
+from app.routes.synthetic import SyntheticSeriesCollector, SyntheticSettings, SyntheticPattern
+from config import Config
+
+
+@pytest.fixture
+def generator(test_client):
+    """Reset the process-wide generator after each test."""
+    yield synthetic.synthetic_series
+    test_client.delete("/metrics/synthetic")
+
+
+def _series(text):
+    return [line for line in text.splitlines() if line.startswith("app_synthetic{")]
+
+
+class TestSyntheticRoutes:
+    """Test cases for the synthetic series generator."""
+    
+    def test_status_disabled_by_default(self, test_client):
+        """Test the generator is off unless configured."""
+        data = test_client.get("/metrics/synthetic").json()
+        
+        assert data["running"] is False
+        assert data["series"] == 0
+        assert _series(test_client.get("/metrics").text) == []
+    
+    def test_configure_exports_series(self, test_client, generator):
+        """Test K series with M labels are exported through /metrics."""
+        response = test_client.put("/metrics/synthetic", json={"series": 50, "labels": 3, "pattern": "sine"})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["running"] is True
+        lines = _series(test_client.get("/metrics").text)
+        assert len(lines) == 50
+        assert 'label_0="0"' in lines[0]
+        assert "label_2=" in lines[0]
+        assert len({line.split("}")[0] for line in lines}) == 50
+    
+    def test_delete_removes_series(self, test_client, generator):
+        """Test DELETE stops the generator and its series disappear."""
+        test_client.put("/metrics/synthetic", json={"series": 10})
+        
+        data = test_client.delete("/metrics/synthetic").json()
+        
+        assert data["running"] is False
+        assert _series(test_client.get("/metrics").text) == []
+    
+    def test_series_limit(self, test_client, generator, monkeypatch):
+        """Test requests above APP22_SYNTH_MAX_SERIES are refused."""
+        monkeypatch.setattr(synthetic.config, "synth_max_series", 100)
+        
+        assert test_client.put("/metrics/synthetic", json={"series": 101}).status_code == 422
+        assert test_client.put("/metrics/synthetic", json={"series": 10, "pattern": "square"}).status_code == 422
+        assert test_client.put("/metrics/synthetic", json={"series": 10, "labels": 0}).status_code == 422
+    
+    def test_runtime_configuration_rejected_with_workers(self, test_client, generator, monkeypatch, tmp_path):
+        """Test the generator cannot be reconfigured in one worker only."""
+        monkeypatch.setenv(MULTIPROC_DIR_ENV, str(tmp_path))
+        
+        assert test_client.put("/metrics/synthetic", json={"series": 10}).status_code == status.HTTP_501_NOT_IMPLEMENTED
+        assert test_client.delete("/metrics/synthetic").status_code == status.HTTP_501_NOT_IMPLEMENTED
+        assert test_client.get("/metrics/synthetic").json()["series"] == 0
+    
+    def test_values_update_in_background(self, test_client, generator):
+        """Test the background task advances the series."""
+        test_client.put("/metrics/synthetic", json={"series": 5, "interval": 0.05})
+        before = registry.get_sample_value("app_synthetic", {"label_0": "0"})
+        
+        asyncio.run(asyncio.sleep(0.3))
+        
+        assert registry.get_sample_value("app_synthetic", {"label_0": "0"}) != before
+        assert generator.updated_at is not None
+    
+    def test_random_walk_refused_with_workers(self):
+        """Test workers cannot each export their own random walk under the same labels."""
+        with pytest.raises(ValidationError, match="random_walk"):
+            Config(workers=2, synth_series=10, synth_pattern="random_walk")
+        
+        assert Config(workers=2, synth_series=10, synth_pattern="sine").synth_pattern == "sine"
+        assert Config(workers=2, synth_series=0).synth_pattern == "random_walk"
+        assert Config(workers=1, synth_series=10).synth_pattern == "random_walk"
+    
+    @pytest.mark.parametrize("pattern,low,high", [
+        (SyntheticPattern.sine, -1.0, 1.0),
+        (SyntheticPattern.step, 0.0, 1.0),
+    ])
+    def test_bounded_patterns(self, pattern, low, high):
+        """Test sine and step values stay within their range."""
+        collector = SyntheticSeriesCollector()
+        collector.settings = SyntheticSettings(series=100, pattern=pattern, period=10)
+        collector._swap(collector._build(collector.settings, 0.0), 0.0)
+        
+        for now in (0.0, 2.5, 7.1, 1234.5):
+            collector.update(now)
+            assert all(low <= value <= high for value in collector.values)
+    
+    def test_step_pattern_switches(self):
+        """Test a step series flips level every half period."""
+        collector = SyntheticSeriesCollector()
+        collector.settings = SyntheticSettings(series=1, pattern=SyntheticPattern.step, period=10)
+        collector._swap(collector._build(collector.settings, 0.0), 0.0)
+        
+        collector.update(0.5)
+        first = collector.values[0]
+        collector.update(5.5)
+        
+        assert collector.values[0] != first
+    
+    def test_series_built_off_event_loop(self, test_client, generator, monkeypatch):
+        """Test series are built and advanced in worker threads, not on the event loop."""
+        threads = []
+        build, advance = SyntheticSeriesCollector._build, SyntheticSeriesCollector._advance
+        
+        def recording(func):
+            def wrapper(*args):
+                threads.append(threading.current_thread())
+                return func(*args)
+            return wrapper
+        
+        monkeypatch.setattr(SyntheticSeriesCollector, "_build", staticmethod(recording(build)))
+        monkeypatch.setattr(SyntheticSeriesCollector, "_advance", staticmethod(recording(advance)))
+        test_client.put("/metrics/synthetic", json={"series": 5, "interval": 0.05})
+        loop_thread = test_client.portal.call(threading.current_thread)
+        time.sleep(0.3)
+        
+        assert len(threads) >= 3
+        assert loop_thread not in threads
@@ -1,7 +1,9 @@
 import pytest
 import os
+import time
 from unittest.mock import patch, MagicMock
 from fastapi import status
+from app.routes import system
 
 
 class TestSystemRoutes:
@@ -47,6 +49,10 @@ class TestSystemRoutes:
         mock_memory.free = 4294967296  # 4GB
         mock_psutil.virtual_memory.return_value = mock_memory
         
+        # Static info is collected at startup and dynamic values come from the sampler
+        system.load_static_info()
+        system.sampler.sample()
+        
         response = test_client.get("/sys")
         
         assert response.status_code == status.HTTP_200_OK
@@ -59,11 +65,13 @@ class TestSystemRoutes:
         assert "platform" in data
         assert "cpu" in data
         assert "memory" in data
+        assert "averages" in data
         
         # Verify platform data
         platform_data = data["platform"]
         assert platform_data["system"] == "Linux"
         assert platform_data["machine"] == "x86_64"
+        assert data["uptime"] == 1000
         
         # Verify CPU data
         cpu_data = data["cpu"]
@@ -83,6 +91,7 @@ class TestSystemRoutes:
     def test_sys_endpoint_no_cpu_freq(self, mock_cpu_freq, test_client):
         """Test system endpoint when CPU frequency is not available."""
         mock_cpu_freq.return_value = None
+        system.sampler.sample()
         
         response = test_client.get("/sys")
         
@@ -92,6 +101,42 @@ class TestSystemRoutes:
         assert cpu_data["max_frequency"] is None
         assert cpu_data["current_frequency"] is None
     
+    @patch('app.routes.system.psutil.cpu_percent')
+    def test_sys_endpoint_does_not_block_on_cpu_percent(self, mock_cpu_percent, test_client):
+        """Test /sys never requests a blocking CPU measurement."""
+        mock_cpu_percent.return_value = 10.0
+        
+        response = test_client.get("/sys")
+        
+        assert response.status_code == status.HTTP_200_OK
+        for call in mock_cpu_percent.call_args_list:
+            assert call.kwargs.get("interval") is None
+    
+    def test_sampler_averages(self):
+        """Test rolling averages over the configured windows."""
+        sampler = system.SystemSampler(interval=1.0, window=60)
+        now = time.time()
+        for age, cpu in [(30, 10.0), (5, 20.0), (0, 30.0)]:
+            sampler._samples.append({
+                "timestamp": now - age,
+                "cpu_percent": cpu,
+                "max_frequency": None,
+                "current_frequency": None,
+                "memory": {"percent": cpu * 2}
+            })
+        
+        averages = sampler.averages()
+        
+        assert averages["1s"]["cpu_percent"] == 30.0
+        assert averages["10s"]["cpu_percent"] == 25.0
+        assert averages["60s"]["cpu_percent"] == 20.0
+        assert averages["60s"]["memory_percent"] == 40.0
+        assert averages["60s"]["current_frequency"] is None
+    
+    def test_sampler_runs_in_background(self, test_client):
+        """Test the sampler is started with the application."""
+        assert system.sampler.running
+    
     def test_env_endpoint(self, test_client):
         """Test environment variables endpoint."""
         # Set some test environment variables
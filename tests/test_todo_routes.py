@@ -1,6 +1,7 @@
 import pytest
 import uuid
 from fastapi import status
+from sqlalchemy import inspect, text
 from app.routes.database import Tasks
 
 
@@ -279,4 +280,140 @@ class TestTodoRoutes:
         assert update_response.status_code == status.HTTP_404_NOT_FOUND
         
         delete_response = test_client.delete(f"/tasks/{invalid_id}")
-        assert delete_response.status_code == status.HTTP_404_NOT_FOUND 
\ No newline at end of file
+        assert delete_response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_get_tasks_keyset_pagination(self, test_client, sample_task_data):
+        """Test paging through all tasks with the X-Next-Cursor header."""
+        created_ids = set()
+        for i in range(25):
+            task_data = sample_task_data.copy()
+            task_data["title"] = f"Page Task {i+1}"
+            created_ids.add(test_client.post("/tasks", json=task_data).json()["id"])
+        
+        seen = []
+        page_sizes = []
+        cursor = None
+        while True:
+            params = {"limit": 10}
+            if cursor:
+                params["after"] = cursor
+            response = test_client.get("/tasks", params=params)
+            assert response.status_code == status.HTTP_200_OK
+            page = response.json()
+            page_sizes.append(len(page))
+            seen.extend(task["id"] for task in page)
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        
+        assert page_sizes == [10, 10, 5]
+        assert len(seen) == len(set(seen))
+        assert set(seen) == created_ids
+    
+    def test_get_tasks_no_cursor_on_last_page(self, test_client, sample_task_data):
+        """Test X-Next-Cursor is omitted when all tasks fit in one page."""
+        for i in range(3):
+            test_client.post("/tasks", json=sample_task_data)
+        
+        response = test_client.get("/tasks?limit=3")
+        
+        assert len(response.json()) == 3
+        assert "X-Next-Cursor" not in response.headers
+    
+    def test_get_tasks_filter_by_done(self, test_client):
+        """Test filtering tasks by done status."""
+        for i in range(4):
+            test_client.post("/tasks", json={"title": f"Task {i}", "done": i % 2 == 0})
+        
+        done = test_client.get("/tasks?done=true").json()
+        pending = test_client.get("/tasks?done=false").json()
+        
+        assert len(done) == 2 and all(task["done"] for task in done)
+        assert len(pending) == 2 and not any(task["done"] for task in pending)
+    
+    def test_get_tasks_invalid_cursor(self, test_client):
+        """Test malformed cursors are rejected."""
+        response = test_client.get("/tasks?after=not-a-cursor")
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        
+        response = test_client.get("/tasks?after=yesterday,abc")
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    
+    def test_tasks_indexes(self, test_db):
+        """Test pagination queries are served by the updated_at indexes."""
+        TestSessionLocal, test_engine = test_db
+        
+        index_names = {index["name"] for index in inspect(test_engine).get_indexes("Tasks")}
+        assert "ix_tasks_updated_at_id" in index_names
+        assert "ix_tasks_done_updated_at_id" in index_names
+        
+        with test_engine.connect() as conn:
+            plan = conn.execute(text(
+                'EXPLAIN QUERY PLAN SELECT * FROM "Tasks" ORDER BY updated_at DESC, id DESC LIMIT 10'
+            )).fetchall()
+        assert any("ix_tasks_updated_at_id" in str(row) for row in plan)
+
+    def test_bulk_create_tasks(self, test_client, test_db):
+        """Test creating many tasks in one request."""
+        TestSessionLocal, test_engine = test_db
+        tasks = [{"title": f"Bulk Task {i}", "done": i % 2 == 0} for i in range(1200)]
+        
+        response = test_client.post("/tasks/bulk", json={"tasks": tasks})
+        
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.json()
+        assert data["count"] == 1200
+        assert all(result["status"] == "created" for result in data["results"])
+        assert len({result["id"] for result in data["results"]}) == 1200
+        
+        db = TestSessionLocal()
+        try:
+            assert db.query(Tasks).count() == 1200
+        finally:
+            db.close()
+    
+    def test_bulk_update_tasks(self, test_client):
+        """Test updating many tasks with per-item results."""
+        created = test_client.post("/tasks/bulk", json={"tasks": [
+            {"title": "First", "description": "keep"},
+            {"title": "Second", "description": "keep"},
+        ]}).json()["results"]
+        first_id, second_id = created[0]["id"], created[1]["id"]
+        
+        response = test_client.patch("/tasks/bulk", json={"tasks": [
+            {"id": first_id, "title": "First updated"},
+            {"id": second_id, "done": True},
+            {"id": "missing", "done": True},
+        ]})
+        
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()["results"]
+        assert [result["status"] for result in results] == ["updated", "updated", "not_found"]
+        
+        first = test_client.get(f"/tasks/{first_id}").json()
+        second = test_client.get(f"/tasks/{second_id}").json()
+        assert first["title"] == "First updated"
+        assert first["description"] == "keep"
+        assert first["done"] is False
+        assert second["title"] == "Second"
+        assert second["done"] is True
+    
+    def test_bulk_delete_tasks(self, test_client):
+        """Test deleting many tasks with per-item results."""
+        created = test_client.post("/tasks/bulk", json={"tasks": [{"title": f"Task {i}"} for i in range(3)]}).json()["results"]
+        ids = [result["id"] for result in created[:2]]
+        
+        response = test_client.request("DELETE", "/tasks/bulk", json={"ids": ids + ["missing"]})
+        
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()["results"]
+        assert [result["status"] for result in results] == ["deleted", "deleted", "not_found"]
+        remaining = [task["id"] for task in test_client.get("/tasks").json()]
+        assert remaining == [created[2]["id"]]
+    
+    def test_bulk_invalid_requests(self, test_client):
+        """Test bulk endpoints validate their payloads."""
+        assert test_client.post("/tasks/bulk", json={"tasks": []}).status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert test_client.post("/tasks/bulk", json={"tasks": [{"description": "no title"}]}).status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert test_client.patch("/tasks/bulk", json={"tasks": [{"title": "no id"}]}).status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert test_client.request("DELETE", "/tasks/bulk", json={"ids": []}).status_code == status.HTTP_422_UNPROCESSABLE_ENTITY